@@ -1,12 +1,47 @@
+from profiling import profiled
+from taxonomy import get_taxonomy
+
+def skill_id_set(skills, taxonomy, unknown):
+    """
+    Interns skill names as taxonomy IDs; aliases resolve to their canonical skill.
+    Skills outside the taxonomy get negative IDs recorded in `unknown` ({lowercased name: id}).
+    """
+    resolve = taxonomy.skill_id
+    ids = {resolve(skill) for skill in skills}
+    if None in ids:
+        ids.discard(None)
+        for skill in skills:
+            if resolve(skill) is None:
+                ids.add(unknown.setdefault(skill.lower(), -1 - len(unknown)))
+    return ids
+
+def category_fit(required_ids, resume_ids, taxonomy):
+    """Per taxonomy category: JD skills required, matched by the resume, and the percentage."""
+    categories = {}
+    category_of = taxonomy.category_of
+    for skill_id in required_ids:
+        category = category_of(skill_id) if skill_id >= 0 else "other"
+        entry = categories.get(category)
+        if entry is None:
+            entry = categories[category] = {"matched": 0, "required": 0}
+        entry["required"] += 1
+        entry["matched"] += skill_id in resume_ids
+    for entry in categories.values():
+        entry["percent"] = round(entry["matched"] / entry["required"] * 100, 2)
+    return dict(sorted(categories.items()))
+
+@profiled("skill_analysis", input_size=lambda jd_skills, resume_skills, *args, **kwargs: len(jd_skills) + len(resume_skills))
 def analyze_skills(jd_text_skills, resume_skills, mandatory_skills_list):
     """
     Analyzes skills based on mandatory, non-mandatory, and bonus categories.
     Implements the 'Not Fit' rule for mandatory skills.
     """
-    # Normalize all skill lists to sets for efficient operations
-    resume_skills_set = {skill.lower() for skill in resume_skills}
-    jd_skills_set = {skill.lower() for skill in jd_text_skills}
-    mandatory_skills_set = {skill.lower() for skill in mandatory_skills_list}
+    # Normalize all skill lists to sets of taxonomy IDs, so "Postgres" matches "PostgreSQL"
+    taxonomy = get_taxonomy()
+    unknown = {}
+    resume_skills_set = skill_id_set(resume_skills, taxonomy, unknown)
+    jd_skills_set = skill_id_set(jd_text_skills, taxonomy, unknown)
+    mandatory_skills_set = skill_id_set(mandatory_skills_list, taxonomy, unknown)
 
     # --- FIX: Calculate all skill categories upfront for complete reporting ---
 
@@ -38,32 +73,42 @@ def analyze_skills(jd_text_skills, resume_skills, mandatory_skills_list):
         else:
             skill_fit_percent = (len(matched_non_mandatory) / len(non_mandatory_skills_set)) * 100
 
-    # 4. Return a complete dictionary with all calculated data
+    # 4. Return a complete dictionary with all calculated data, IDs turned back into
+    # lowercased skill names for display
+    names = taxonomy.lower_names
+    unknown_names = list(unknown)
+
+    def to_names(skill_ids):
+        return [names[i] if i >= 0 else unknown_names[-1 - i] for i in skill_ids]
+
     return {
         "fit_status": fit_status,
         "skill_fit_percent": round(skill_fit_percent, 2),
         "reason": reason,
-        "matched_mandatory": list(matched_mandatory),
-        "missing_mandatory": list(missing_mandatory),
-        "matched_non_mandatory": list(matched_non_mandatory),
-        "missing_non_mandatory": list(missing_non_mandatory),
-        "bonus_skills": list(bonus_skills) # Add the new data to the result
+        "matched_mandatory": to_names(matched_mandatory),
+        "missing_mandatory": to_names(missing_mandatory),
+        "matched_non_mandatory": to_names(matched_non_mandatory),
+        "missing_non_mandatory": to_names(missing_non_mandatory),
+        "bonus_skills": to_names(bonus_skills), # Add the new data to the result
+        "category_fit": category_fit(jd_skills_set | mandatory_skills_set, resume_skills_set, taxonomy),
     }
 
-# The get_final_fit function does not need any changes, as it just passes the dictionary through.
-def get_final_fit(skill_analysis_result, jd, candidate):
+# Weights used for the final score. Shared with batch_analysis so both scorers stay in sync.
+SKILL_WEIGHT = 0.50
+EXPERIENCE_WEIGHT = 0.30
+CTC_WEIGHT = 0.20
+DEFAULT_WEIGHTS = {"skill": SKILL_WEIGHT, "experience": EXPERIENCE_WEIGHT, "ctc": CTC_WEIGHT}
+
+@profiled("final_scoring")
+def get_final_fit(skill_analysis_result, jd, candidate, weights=None):
     """
     Calculates the final weighted fit score if the candidate is a 'Fit'.
+    `weights` overrides DEFAULT_WEIGHTS ({"skill", "experience", "ctc"}).
     """
     if skill_analysis_result['fit_status'] == "Not Fit":
         # The reason is now more specific, coming directly from the analysis
         return 0, skill_analysis_result['reason'], skill_analysis_result
 
-    # Weights
-    SKILL_WEIGHT = 0.50
-    EXPERIENCE_WEIGHT = 0.30
-    CTC_WEIGHT = 0.20
-    
     skill_fit_percent = skill_analysis_result['skill_fit_percent']
 
     if jd['min_experience'] == 0:
@@ -78,9 +123,10 @@ def get_final_fit(skill_analysis_result, jd, candidate):
     else:
         ctc_fit_percent = (jd['max_ctc'] / candidate['expected_ctc']) * 100
 
-    final_score = (skill_fit_percent * SKILL_WEIGHT) + \
-                  (experience_fit_percent * EXPERIENCE_WEIGHT) + \
-                  (ctc_fit_percent * CTC_WEIGHT)
+    weights = weights or DEFAULT_WEIGHTS
+    final_score = (skill_fit_percent * weights['skill']) + \
+                  (experience_fit_percent * weights['experience']) + \
+                  (ctc_fit_percent * weights['ctc'])
 
     explanation = (
         f"Skill Fit (Non-Mandatory): {skill_fit_percent}%, "
@@ -1,11 +1,27 @@
 import streamlit as st
 import pandas as pd
-from resume_parser import extract_text_from_pdf
-from skill_extractor import extract_skills_from_text
-from analysis import analyze_skills, get_final_fit
-from job_scraper import scrape_job_description
+from analysis import DEFAULT_WEIGHTS
+# Memoized analysis stages: only the stages whose inputs changed are recomputed
+from pipeline import analysis_pipeline
+from resume_parser import PDFTooLargeError
+# Content-hash cached versions of PDF parsing, scraping and skill extraction
+from cache import cached_scrape_job_description, cached_find_skill_spans, default_cache, scrape_cache
 # Import both LLM functions now
-from llm_analyzer import find_mandatory_skills_with_llm, find_experience_with_llm
+from llm_analyzer import find_mandatory_skills_with_llm, find_experience
+import llm_analyzer
+import skill_extractor
+from model_loader import startup_report
+import profiling
+
+# Start loading the tokenizer in the background while the user fills in the JD. The
+# LLM models only warm up with LLM_WARM_UP=1. No-ops once loaded or loading.
+skill_extractor.warm_up()
+if llm_analyzer.LLM_WARM_UP:
+    llm_analyzer.warm_up()
+
+# Resumes above these limits are rejected before any page is parsed
+MAX_RESUME_PAGES = 100
+MAX_RESUME_BYTES = 20 * 1024 * 1024
 
 # --- App Title and Configuration ---
 st.set_page_config(layout="wide")
@@ -21,7 +37,20 @@ if 'llm_details' not in st.session_state:
     st.session_state.llm_details = []
 # --- NEW: Add experience to session state ---
 if 'experience' not in st.session_state:
-    st.session_state.experience = 5 # A reasonable default
+    st.session_state.experience = 5.0 # A reasonable default
+if 'pipeline' not in st.session_state:
+    st.session_state.pipeline = analysis_pipeline(max_pages=MAX_RESUME_PAGES, max_bytes=MAX_RESUME_BYTES)
+
+with st.sidebar.expander("Cache statistics"):
+    st.json(default_cache.stats())
+    st.caption("Scraped JDs")
+    st.json(scrape_cache.stats())
+    st.caption("LLM skill classifications")
+    st.json(llm_analyzer.classification_cache.stats())
+with st.sidebar.expander("Model load times"):
+    st.json(startup_report())
+# The timing panel itself is drawn at the end of the script, after this run's stages
+profiling.enable(st.sidebar.checkbox("Profile pipeline stages", value=profiling.enabled()))
 
 
 # --- UI Layout ---
@@ -35,10 +64,11 @@ with col1:
     if st.button("Fetch & Parse JD"):
         if jd_url:
             with st.spinner(f"Fetching content from {jd_url}..."):
-                scraped_text = scrape_job_description(jd_url)
+                scraped_text = cached_scrape_job_description(jd_url)
                 st.session_state.jd_text = scraped_text
                 st.session_state.llm_details = []
                 st.session_state.mandatory_skills = ""
+                st.session_state.experience_source = None
                 if "Error:" in scraped_text: st.error(scraped_text)
                 else: st.success("Successfully fetched JD!")
                 st.rerun()
@@ -53,15 +83,21 @@ with col1:
         if st.session_state.jd_text and "Paste a job description" not in st.session_state.jd_text:
             with st.spinner("LLM is analyzing the JD... This will take a moment, especially on the first run."):
                 # --- Part 1: Analyze Skills (as before) ---
-                all_skills = extract_skills_from_text(st.session_state.jd_text)
-                mandatory_skills_list, llm_details = find_mandatory_skills_with_llm(st.session_state.jd_text, all_skills)
+                # The match spans give both the skills and, via a line index, their context lines
+                jd_spans = cached_find_skill_spans(st.session_state.jd_text)
+                all_skills = list(dict.fromkeys(skill for skill, _, _ in jd_spans))
+                mandatory_skills_list, llm_details = find_mandatory_skills_with_llm(
+                    st.session_state.jd_text, all_skills, all_mentions=True, spans=jd_spans
+                )
                 st.session_state.mandatory_skills = ", ".join(mandatory_skills_list)
                 st.session_state.llm_details = llm_details
                 
                 # --- Part 2 (NEW): Analyze for Experience ---
-                extracted_exp = find_experience_with_llm(st.session_state.jd_text)
+                # Rules first; the QA model only runs when they find nothing or disagree
+                extracted_exp, experience_path = find_experience(st.session_state.jd_text)
+                st.session_state.experience_source = experience_path
                 if extracted_exp is not None:
-                    st.session_state.experience = extracted_exp # Update state
+                    st.session_state.experience = float(extracted_exp) # Update state; may be fractional ("2.5 years")
                     st.success("LLM analysis complete! Review the skills and experience below.")
                 else:
                     st.warning("LLM found skills, but could not determine years of experience. Please enter it manually.")
@@ -81,10 +117,23 @@ with col1:
     st.text_input("Mandatory Skills (auto-populated by LLM, editable)", key="mandatory_skills")
     
     # --- FIX: This number input is now controlled by session state ---
-    st.number_input("Minimum Years of Experience Required", min_value=0, key="experience")
+    st.number_input("Minimum Years of Experience Required", min_value=0.0, step=0.5, key="experience")
+    if st.session_state.get('experience_source'):
+        st.caption({
+            "rules": "Experience detected by the rule engine (no model call).",
+            "qa": "Experience detected by the QA model (no explicit statement matched the rules).",
+            "qa_conflict": "Experience detected by the QA model (the JD states conflicting values).",
+        }[st.session_state.experience_source])
     
     jd_ctc_input = st.number_input("Budget / Maximum CTC", min_value=0, value=150000, step=10000)
 
+    with st.expander("Score weights"):
+        weights = {
+            "skill": st.number_input("Skill fit weight", min_value=0.0, value=DEFAULT_WEIGHTS["skill"], step=0.05),
+            "experience": st.number_input("Experience fit weight", min_value=0.0, value=DEFAULT_WEIGHTS["experience"], step=0.05),
+            "ctc": st.number_input("CTC fit weight", min_value=0.0, value=DEFAULT_WEIGHTS["ctc"], step=0.05),
+        }
+
 with col2:
     st.header("4. Provide Candidate Details")
     uploaded_resume = st.file_uploader("Upload Candidate's Resume (PDF only)", type=["pdf"])
@@ -96,22 +145,31 @@ with col2:
 if st.button("Analyze Final Fit", type="primary"):
     if uploaded_resume is not None and st.session_state.jd_text:
         with st.spinner('Running final analysis...'):
-            # This logic remains the same and should work correctly
-            resume_bytes = uploaded_resume.read()
-            resume_text = extract_text_from_pdf(resume_bytes)
+            # getvalue() returns the upload's buffer without re-reading it. The pipeline
+            # only re-runs the stages whose inputs changed since the last click.
+            pipeline = st.session_state.pipeline
+            pipeline.set(
+                resume_bytes=uploaded_resume.getvalue(),
+                jd_text=st.session_state.jd_text,
+                mandatory_skills=st.session_state.mandatory_skills,
+                jd={"min_experience": st.session_state.experience, "max_ctc": jd_ctc_input},
+                candidate={"total_experience": candidate_experience_input, "expected_ctc": candidate_ctc_input},
+                weights=weights,
+            )
+            try:
+                resume_text = pipeline.get('resume_text')
+                read_error = "Could not read the PDF file."
+            except PDFTooLargeError as e:
+                resume_text = None
+                read_error = f"The resume is too large: {e}"
+            recomputed = list(pipeline.recomputed)
 
             if resume_text is None:
-                st.error("Could not read the PDF file.")
+                st.error(read_error)
             else:
-                resume_skills = extract_skills_from_text(resume_text)
-                jd_skills = extract_skills_from_text(st.session_state.jd_text)
-                mandatory_skills_list = [skill.strip() for skill in st.session_state.mandatory_skills.split(',') if skill.strip()]
-
-                skill_analysis = analyze_skills(jd_skills, resume_skills, mandatory_skills_list)
-                
-                jd_data = {"min_experience": st.session_state.experience, "max_ctc": jd_ctc_input}
-                candidate_data = {"total_experience": candidate_experience_input, "expected_ctc": candidate_ctc_input}
-                final_score, explanation, details = get_final_fit(skill_analysis, jd_data, candidate_data)
+                final_score, explanation, details = pipeline.get('final_fit')
+                recomputed += pipeline.recomputed
+                st.caption("Recomputed: " + (", ".join(recomputed) or "nothing, inputs unchanged"))
 
                 st.subheader("Analysis Result")
                 if details['fit_status'] == "Not Fit":
@@ -130,6 +188,13 @@ if st.button("Analyze Final Fit", type="primary"):
                     st.markdown(f"✅ **Matched:** {', '.join(details['matched_non_mandatory'])}" if details['matched_non_mandatory'] else "None")
                     st.markdown(f"❌ **Missing:** {', '.join(details['missing_non_mandatory'])}" if details['missing_non_mandatory'] else "None")
 
+                with st.expander("**Skill Fit by Category**"):
+                    if details['category_fit']:
+                        for category, fit in details['category_fit'].items():
+                            st.markdown(f"**{category.replace('_', ' ').title()}:** {fit['matched']}/{fit['required']} ({fit['percent']}%)")
+                    else:
+                        st.markdown("None")
+
                 # --- NEW: Expander for Bonus Skills ---
                 with st.expander("**Bonus Skills (Candidate skills not in JD)**"):
                     if details['bonus_skills']:
@@ -140,4 +205,11 @@ if st.button("Analyze Final Fit", type="primary"):
                         st.markdown("None")
     else:
         st.warning("Please upload a resume and provide a job description.")         # --- Detailed Skill Match ---
-              
\ No newline at end of file
+
+
+# --- Stage timing panel ---
+if profiling.enabled():
+    with st.sidebar.expander("Stage timings", expanded=True):
+        st.dataframe(pd.DataFrame(profiling.profiler.summary()), use_container_width=True)
+        st.download_button("Download trace (JSON)", profiling.profiler.chrome_trace(), file_name="jobfit_trace.json")
+        st.download_button("Download metrics (Prometheus)", profiling.profiler.prometheus_text(), file_name="jobfit_metrics.prom")
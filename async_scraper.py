@@ -0,0 +1,132 @@
+import asyncio
+import random
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from job_scraper import HEADERS, extract_job_description
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AsyncJobScraper:
+    """
+    Bulk JD scraper built on one pooled aiohttp session.
+
+    - Keep-alive connections are reused across requests (TCPConnector pool).
+    - At most `per_host_limit` requests run against one host at a time, and requests
+      to the same host are spaced at least `min_interval` seconds apart.
+    - Connection errors, timeouts, 429 and 5xx responses are retried up to
+      `retries` times with exponential backoff and jitter (Retry-After is honored).
+    - ETag / Last-Modified validators are remembered per URL, so re-fetching an
+      unchanged posting costs a 304 and reuses the previously parsed text.
+    - HTML parsing runs in a thread so it does not block the event loop.
+
+    Use as `async with AsyncJobScraper() as scraper: await scraper.scrape_many(urls)`.
+    """
+
+    def __init__(self, total_limit=50, per_host_limit=4, min_interval=0.0, retries=3,
+                 backoff=0.5, timeout=10, validators=None):
+        self.total_limit = total_limit
+        self.per_host_limit = per_host_limit
+        self.min_interval = min_interval
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        # url -> {"etag", "last_modified", "text"}; pass a persistent dict-like to keep across runs
+        self.validators = {} if validators is None else validators
+        self._host_semaphores = {}
+        self._host_next_slot = {}
+        self._session = None
+        self.stats = {"requests": 0, "retries": 0, "not_modified": 0, "errors": 0}
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.total_limit, limit_per_host=self.per_host_limit)
+        self._session = aiohttp.ClientSession(connector=connector, headers=HEADERS, timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+
+    async def _wait_for_host(self, host):
+        """Reserves the next request slot for `host` and sleeps until it is due."""
+        if self.min_interval <= 0:
+            return
+        now = time.monotonic()
+        slot = max(now, self._host_next_slot.get(host, now))
+        self._host_next_slot[host] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _fetch(self, url):
+        """Returns (status, body bytes or None, response headers)."""
+        headers = {}
+        cached = self.validators.get(url)
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        host = urlsplit(url).netloc
+        semaphore = self._host_semaphores.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+        for attempt in range(self.retries + 1):
+            delay = None
+            async with semaphore:
+                await self._wait_for_host(host)
+                self.stats["requests"] += 1
+                try:
+                    async with self._session.get(url, headers=headers) as response:
+                        if response.status not in RETRY_STATUSES:
+                            body = await response.read() if response.status == 200 else None
+                            return response.status, body, response.headers
+                        retry_after = response.headers.get("Retry-After", "")
+                        if retry_after.isdigit():
+                            delay = int(retry_after)
+                        last_error = f"HTTP {response.status}"
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    last_error = str(e) or type(e).__name__
+            if attempt < self.retries:
+                self.stats["retries"] += 1
+                if delay is None:
+                    delay = self.backoff * (2 ** attempt) * (1 + random.random())
+                await asyncio.sleep(delay)
+        raise aiohttp.ClientError(f"Giving up after {self.retries + 1} attempts: {last_error}")
+
+    async def scrape(self, url):
+        """Scrapes one URL. Returns the JD text, or an "Error: ..." string like scrape_job_description."""
+        try:
+            status, body, headers = await self._fetch(url)
+            if status == 304 and url in self.validators:
+                self.stats["not_modified"] += 1
+                return self.validators[url]["text"]
+            if status != 200:
+                raise aiohttp.ClientError(f"HTTP {status}")
+            text = await asyncio.get_running_loop().run_in_executor(None, extract_job_description, body, url)
+            if headers.get("ETag") or headers.get("Last-Modified"):
+                self.validators[url] = {
+                    "etag": headers.get("ETag"),
+                    "last_modified": headers.get("Last-Modified"),
+                    "text": text,
+                }
+            return text
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"Error fetching URL {url}: {e}")
+            return f"Error: Could not fetch the URL. Please check the link and your connection. Details: {e}"
+
+    async def scrape_many(self, urls):
+        """Scrapes all URLs concurrently. Returns {url: text or "Error: ..."}."""
+        urls = list(dict.fromkeys(urls))
+        results = await asyncio.gather(*(self.scrape(url) for url in urls))
+        return dict(zip(urls, results))
+
+
+def scrape_many(urls, **scraper_options):
+    """Synchronous helper: scrapes all URLs with a fresh AsyncJobScraper."""
+    async def run():
+        async with AsyncJobScraper(**scraper_options) as scraper:
+            return await scraper.scrape_many(urls)
+    return asyncio.run(run())
@@ -0,0 +1,190 @@
+import numpy as np
+from analysis import DEFAULT_WEIGHTS
+from taxonomy import get_taxonomy
+
+
+class SkillVocabulary:
+    """
+    Assigns every skill a column in a candidate x skill boolean matrix. Seeded from the
+    compiled skills taxonomy, whose skill IDs are the first columns and whose aliases
+    share their canonical skill's column; unknown skills (e.g. hand-typed mandatory
+    skills) get appended on demand so the batch scorer sees exactly what analyze_skills would.
+    """
+
+    def __init__(self, skills=(), taxonomy=None):
+        self.skills = [name.lower() for name in taxonomy.names] if taxonomy is not None else []
+        self.index = taxonomy.lookup_table() if taxonomy is not None else {}
+        for skill in skills:
+            self.add(skill)
+
+    @classmethod
+    def from_taxonomy(cls, taxonomy=None):
+        return cls(taxonomy=taxonomy if taxonomy is not None else get_taxonomy())
+
+    def __len__(self):
+        return len(self.skills)
+
+    def add(self, skill):
+        key = skill.lower()
+        if key not in self.index:
+            self.index[key] = len(self.skills)
+            self.skills.append(key)
+        return self.index[key]
+
+    def columns(self, skills):
+        """Returns the sorted, de-duplicated column indices for a list of skills."""
+        return np.array(sorted({self.add(skill) for skill in skills}), dtype=np.intp)
+
+    def encode(self, skill_sets):
+        """
+        Encodes an iterable of skill collections (one per candidate) as an (N, V) boolean
+        matrix. Skills outside the vocabulary are ignored: they can never be JD or
+        mandatory skills, so they do not affect the score.
+        """
+        index = self.index
+        rows, cols = [], []
+        n = 0
+        for n, skills in enumerate(skill_sets, 1):
+            for skill in skills:
+                col = index.get(skill.lower())
+                if col is not None:
+                    rows.append(n - 1)
+                    cols.append(col)
+        matrix = np.zeros((n, len(self.skills)), dtype=bool)
+        matrix[rows, cols] = True
+        return matrix
+
+
+def count_skill_matches(resume_matrix, vocabulary, jd_skills, mandatory_skills):
+    """
+    The skill half of score_candidates: per-candidate missing-mandatory and
+    matched-non-mandatory counts, plus the number of non-mandatory JD skills.
+    Depends only on the skills, so it can be reused when weights or the
+    experience/CTC thresholds change.
+    """
+    mandatory_cols = vocabulary.columns(mandatory_skills)
+    # By column, so a JD skill whose alias is listed as mandatory counts as mandatory
+    non_mandatory_cols = np.setdiff1d(vocabulary.columns(jd_skills), mandatory_cols)
+
+    # Columns added while resolving JD/mandatory skills are absent from every resume.
+    if resume_matrix.shape[1] < len(vocabulary):
+        padding = np.zeros((resume_matrix.shape[0], len(vocabulary) - resume_matrix.shape[1]), dtype=bool)
+        resume_matrix = np.hstack([resume_matrix, padding])
+
+    # 1. Mandatory gate
+    missing_mandatory = (~resume_matrix[:, mandatory_cols]).sum(axis=1)
+
+    # 2. Non-mandatory coverage
+    matched_non_mandatory = resume_matrix[:, non_mandatory_cols].sum(axis=1)
+    return missing_mandatory, matched_non_mandatory, len(non_mandatory_cols)
+
+
+def score_candidates(resume_matrix, vocabulary, jd_skills, mandatory_skills, jd, experiences, expected_ctcs, weights=None):
+    """
+    Vectorized equivalent of analyze_skills + get_final_fit for N candidates at once.
+
+    resume_matrix is the (N, V) output of SkillVocabulary.encode, experiences and
+    expected_ctcs are length-N sequences. Returns a dict of length-N arrays.
+    """
+    missing_mandatory, matched_non_mandatory, non_mandatory_total = count_skill_matches(
+        resume_matrix, vocabulary, jd_skills, mandatory_skills
+    )
+    scores = combine_fit_scores(missing_mandatory, matched_non_mandatory, non_mandatory_total, jd, experiences, expected_ctcs, weights)
+    scores["missing_mandatory_count"] = missing_mandatory
+    return scores
+
+
+def combine_fit_scores(missing_mandatory, matched_non_mandatory, non_mandatory_total, jd, experiences, expected_ctcs, weights=None):
+    """
+    Turns per-candidate skill counts into the get_final_fit scores: mandatory gate,
+    non-mandatory coverage, experience fit and CTC fit, all as length-N arrays.
+    Shared by score_candidates and the candidate index so both rank identically.
+    """
+    is_fit = np.asarray(missing_mandatory) == 0
+
+    if non_mandatory_total:
+        skill_fit = np.round(np.asarray(matched_non_mandatory) / non_mandatory_total * 100, 2)
+    else:
+        skill_fit = np.full(len(is_fit), 100.0)
+    skill_fit = np.where(is_fit, skill_fit, 0.0)
+
+    # 3. Experience fit
+    experiences = np.asarray(experiences, dtype=float)
+    min_experience = jd['min_experience']
+    if min_experience == 0:
+        experience_fit = np.full(len(experiences), 100.0)
+    else:
+        experience_fit = np.where(experiences >= min_experience, 100.0, experiences / min_experience * 100)
+
+    # 4. CTC fit
+    expected_ctcs = np.asarray(expected_ctcs, dtype=float)
+    max_ctc = jd['max_ctc']
+    over_budget = expected_ctcs > max_ctc
+    ctc_fit = np.full(len(expected_ctcs), 100.0)
+    # Same operation order as get_final_fit, so scores round identically
+    ctc_fit[over_budget] = max_ctc / expected_ctcs[over_budget] * 100
+
+    weights = weights or DEFAULT_WEIGHTS
+    final_score = skill_fit * weights['skill'] + experience_fit * weights['experience'] + ctc_fit * weights['ctc']
+    final_score = np.where(is_fit, np.round(final_score, 2), 0.0)
+
+    return {
+        "final_score": final_score,
+        "is_fit": is_fit,
+        "skill_fit_percent": skill_fit,
+        "experience_fit_percent": experience_fit,
+        "ctc_fit_percent": ctc_fit,
+    }
+
+
+def rank_candidates(scores, top_k=10):
+    """
+    Returns the top_k candidates as a list of dicts ordered by final score (highest
+    first, ties broken by input order). Uses argpartition so only k rows are sorted.
+    """
+    final_score = scores['final_score']
+    n = len(final_score)
+    if n == 0 or top_k <= 0:
+        return []
+    top_k = min(top_k, n)
+
+    if top_k < n:
+        candidates = np.argpartition(-final_score, top_k - 1)[:top_k]
+        # argpartition may cut through a run of equal scores; pull in every tie
+        cutoff = final_score[candidates].min()
+        candidates = np.flatnonzero(final_score >= cutoff)
+    else:
+        candidates = np.arange(n)
+    order = candidates[np.lexsort((candidates, -final_score[candidates]))][:top_k]
+
+    return [
+        {
+            "index": int(i),
+            "final_score": float(final_score[i]),
+            "fit_status": "Fit" if scores['is_fit'][i] else "Not Fit",
+            "skill_fit_percent": float(scores['skill_fit_percent'][i]),
+            "experience_fit_percent": round(float(scores['experience_fit_percent'][i]), 2),
+            "ctc_fit_percent": round(float(scores['ctc_fit_percent'][i]), 2),
+        }
+        for i in order
+    ]
+
+
+def rank_resumes(resume_skill_sets, jd_skills, mandatory_skills, jd, candidates, top_k=10, vocabulary=None, weights=None):
+    """
+    Convenience wrapper: scores a list of resume skill sets against one JD and returns
+    the ranked top_k. `candidates` holds one {'total_experience', 'expected_ctc'} dict
+    per resume, in the same shape get_final_fit expects.
+    """
+    if vocabulary is None:
+        vocabulary = SkillVocabulary.from_taxonomy()
+    for skill in list(jd_skills) + list(mandatory_skills):
+        vocabulary.add(skill)
+    resume_matrix = vocabulary.encode(resume_skill_sets)
+    scores = score_candidates(
+        resume_matrix, vocabulary, jd_skills, mandatory_skills, jd,
+        [c['total_experience'] for c in candidates],
+        [c['expected_ctc'] for c in candidates],
+        weights,
+    )
+    return rank_candidates(scores, top_k)
@@ -0,0 +1,118 @@
+"""
+Throughput of batch_analysis vs. looping analyze_skills + get_final_fit.
+
+"speedup" includes encoding the resumes into a skill matrix; "rescore" is the
+speedup for re-ranking an already encoded pool (e.g. against a new requisition).
+It also checks that pipeline.BatchRescorer ranks like rank_resumes as the JD changes,
+and exits 1 if it does not.
+
+Run from the repository root:
+    python -m benchmarks.batch_ranking [--sizes 1000 10000 100000]
+"""
+import argparse
+import random
+import time
+
+from analysis import analyze_skills, get_final_fit
+from batch_analysis import SkillVocabulary, score_candidates, rank_candidates, rank_resumes
+from pipeline import BatchRescorer
+
+
+def make_candidates(vocabulary, n, seed=42):
+    rng = random.Random(seed)
+    skills = vocabulary.skills
+    resumes = [rng.sample(skills, rng.randint(3, 15)) for _ in range(n)]
+    candidates = [
+        {"total_experience": rng.randint(0, 12), "expected_ctc": rng.randrange(50000, 250000, 10000)}
+        for _ in range(n)
+    ]
+    return resumes, candidates
+
+
+def run_loop(resumes, candidates, jd_skills, mandatory, jd):
+    scores = []
+    for resume_skills, candidate in zip(resumes, candidates):
+        skill_analysis = analyze_skills(jd_skills, resume_skills, mandatory)
+        final_score, _, _ = get_final_fit(skill_analysis, jd, candidate)
+        scores.append(final_score)
+    return scores
+
+
+def run_batch(vocabulary, resumes, candidates, jd_skills, mandatory, jd, top_k):
+    matrix = vocabulary.encode(resumes)
+    encoded = time.perf_counter()
+    scores = score_candidates(
+        matrix, vocabulary, jd_skills, mandatory, jd,
+        [c['total_experience'] for c in candidates],
+        [c['expected_ctc'] for c in candidates],
+    )
+    rank_candidates(scores, top_k)
+    return scores, encoded
+
+
+def check_rescorer(vocabulary, n, top_k):
+    """
+    Ranks one pool through a BatchRescorer and through rank_resumes for a series of JD
+    changes, including a skill outside the taxonomy that some resumes already list.
+    Returns the number of changes whose rankings differ.
+    """
+    resumes, candidates = make_candidates(vocabulary, n, seed=7)
+    for resume in resumes[::3]:
+        resume.append("Airflow Operators")
+    jd_skills = ["Python", "Django", "PostgreSQL", "Docker", "AWS"]
+    changes = [
+        (jd_skills, ["Python"], {"min_experience": 4, "max_ctc": 150000}, None),
+        (jd_skills, ["Python"], {"min_experience": 6, "max_ctc": 120000}, None),
+        (jd_skills, ["python", "DOCKER"], {"min_experience": 6, "max_ctc": 120000}, None),
+        (jd_skills, ["Python"], {"min_experience": 6, "max_ctc": 120000}, {"skill": 0.6, "experience": 0.2, "ctc": 0.2}),
+        (jd_skills + ["Airflow Operators"], ["Python"], {"min_experience": 4, "max_ctc": 150000}, None),
+        (jd_skills, ["Airflow Operators"], {"min_experience": 4, "max_ctc": 150000}, None),
+    ]
+    rescorer = BatchRescorer(resumes, candidates)
+    mismatches = 0
+    for jd_skills, mandatory, jd, weights in changes:
+        expected = rank_resumes(resumes, jd_skills, mandatory, jd, candidates, top_k=top_k, weights=weights)
+        mismatches += rescorer.rank(jd_skills, mandatory, jd, weights=weights, top_k=top_k) != expected
+    return len(changes), mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    vocabulary = SkillVocabulary.from_taxonomy()
+    jd_skills = ["Python", "Django", "PostgreSQL", "Docker", "AWS", "Redis", "Git", "React"]
+    mandatory = ["Python", "Docker"]
+    jd = {"min_experience": 4, "max_ctc": 150000}
+
+    print(f"{'N':>8} {'loop (s)':>10} {'loop c/s':>12} {'encode (s)':>11} {'score (s)':>10} {'batch c/s':>12} {'speedup':>8} {'rescore':>8}")
+    for n in args.sizes:
+        resumes, candidates = make_candidates(vocabulary, n)
+
+        start = time.perf_counter()
+        loop_scores = run_loop(resumes, candidates, jd_skills, mandatory, jd)
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch_scores, encoded = run_batch(vocabulary, resumes, candidates, jd_skills, mandatory, jd, args.top_k)
+        end = time.perf_counter()
+        batch_time = end - start
+
+        mismatches = sum(abs(a - b) > 0.011 for a, b in zip(loop_scores, batch_scores['final_score']))
+        print(
+            f"{n:>8} {loop_time:>10.3f} {n / loop_time:>12,.0f} {encoded - start:>11.3f} "
+            f"{end - encoded:>10.4f} {n / batch_time:>12,.0f} {loop_time / batch_time:>7.1f}x "
+            f"{loop_time / (end - encoded):>7.1f}x"
+            + (f"  ({mismatches} score mismatches!)" if mismatches else "")
+        )
+
+    changes, mismatches = check_rescorer(vocabulary, min(args.sizes), args.top_k)
+    if mismatches:
+        raise SystemExit(f"BatchRescorer differs from rank_resumes on {mismatches} of {changes} JD changes")
+    print(f"BatchRescorer matches rank_resumes on {changes} JD changes")
+
+
+if __name__ == "__main__":
+    main()
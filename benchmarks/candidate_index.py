@@ -0,0 +1,90 @@
+"""
+Reverse-search latency of CandidateIndex over a large synthetic candidate pool,
+compared with scoring every stored candidate with batch_analysis.score_candidates.
+
+Run from the repository root:
+    python -m benchmarks.candidate_index [--candidates 1000000] [--queries 50]
+"""
+import argparse
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from batch_analysis import SkillVocabulary, score_candidates, rank_candidates
+from candidate_index import CandidateIndex
+
+
+def make_pool(vocabulary, n, seed=21):
+    """Random skill matrix where each skill has its own popularity (2%-40%)."""
+    rng = np.random.default_rng(seed)
+    popularity = rng.uniform(0.02, 0.4, size=len(vocabulary))
+    matrix = rng.random((n, len(vocabulary)), dtype=np.float32) < popularity.astype(np.float32)
+    experiences = rng.integers(0, 15, size=n)
+    expected_ctcs = rng.integers(5, 25, size=n) * 10000
+    return matrix, experiences, expected_ctcs
+
+
+def make_queries(vocabulary, n, seed=8):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n):
+        jd_skills = rng.sample(vocabulary.skills, rng.randint(5, 12))
+        mandatory = rng.sample(jd_skills, rng.randint(0, 3))
+        jd = {"min_experience": rng.randint(0, 8), "max_ctc": rng.randrange(80000, 200000, 10000)}
+        queries.append((jd_skills, mandatory, jd))
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=20)
+    args = parser.parse_args()
+
+    vocabulary = SkillVocabulary.from_taxonomy()
+    matrix, experiences, expected_ctcs = make_pool(vocabulary, args.candidates)
+    queries = make_queries(vocabulary, args.queries)
+
+    start = time.perf_counter()
+    index = CandidateIndex()
+    index.add_skill_matrix(matrix, vocabulary, experiences, expected_ctcs)
+    index.commit()
+    build_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        index.save(directory)
+        save_time = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = CandidateIndex.load(directory)
+        load_time = time.perf_counter() - start
+
+        index_times, scan_times, mismatches = [], [], 0
+        for jd_skills, mandatory, jd in queries:
+            start = time.perf_counter()
+            results = loaded.query(jd_skills, mandatory, jd, args.top_k)
+            index_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            scores = score_candidates(matrix, vocabulary, jd_skills, mandatory, jd, experiences, expected_ctcs)
+            expected = [r for r in rank_candidates(scores, args.top_k) if r["fit_status"] == "Fit"]
+            scan_times.append(time.perf_counter() - start)
+            mismatches += [r["candidate_id"] for r in results] != [r["index"] for r in expected]
+
+    def ms(values, q):
+        return np.percentile(values, q) * 1000
+
+    print(f"{args.candidates:,} candidates, {len(vocabulary)} skills, {len(index.postings):,} postings")
+    print(f"build {build_time:.2f}s, save {save_time:.2f}s, load (mmap) {load_time * 1000:.1f}ms")
+    print(f"{'mode':<24} {'p50 (ms)':>9} {'p95 (ms)':>9} {'max (ms)':>9}")
+    print(f"{'inverted index':<24} {ms(index_times, 50):>9.1f} {ms(index_times, 95):>9.1f} {max(index_times) * 1000:>9.1f}")
+    print(f"{'full matrix scan':<24} {ms(scan_times, 50):>9.1f} {ms(scan_times, 95):>9.1f} {max(scan_times) * 1000:>9.1f}")
+    if mismatches:
+        print(f"{mismatches} queries ranked differently from the full scan!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Deterministic synthetic resumes and JDs built from the skills_db.json vocabulary.
+
+The same seed and sizes always give byte-identical text and PDFs, so benchmark
+runs on different machines or commits see the same inputs. Each generated document
+records the skills planted in it, so extraction results can be checked as well.
+
+Writes a corpus to disk (resume_NNNN.pdf/.txt, jd_NNNN.txt and manifest.json):
+    python -m benchmarks.corpus --out corpus/ [--resumes 200] [--jds 5] [--resume-words 600]
+"""
+import argparse
+import json
+import os
+import random
+
+from skill_extractor import load_skills_from_db
+
+FILLER = (
+    "designed built and maintained services for customers across teams . led projects "
+    "reviewed code mentored engineers and improved reliability . worked with product "
+    "managers on requirements testing releases and on-call support for production systems ."
+).split()
+# Ways JDs state the experience requirement; {n} is the minimum, {m} a larger bound
+EXPERIENCE_TEMPLATES = [
+    "Requirements: {n}+ years of experience.",
+    "Experience: {n}-{m} yrs in a similar role.",
+    "Minimum of {word} years of professional experience.",
+    "At least {n} years of hands-on experience.",
+    "You bring a solid background in building products.",
+]
+NUMBER_NAMES = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight"]
+JD_FILLER = (
+    "we are looking for an engineer to join our growing team . you will own features end "
+    "to end and collaborate with design and product . we offer flexible hours and learning budget ."
+).split()
+
+
+def _sentence_stream(rng, filler, skills, n_words, skill_rate):
+    """Filler words with the given skills planted at random positions, ~12 words per line."""
+    words = [rng.choice(filler) for _ in range(n_words)]
+    for skill in skills:
+        words.insert(rng.randrange(len(words) + 1), skill if rng.random() < 0.7 else skill.lower())
+    # Sprinkle extra mentions of the same skills so they repeat, as in real documents
+    for _ in range(int(n_words * skill_rate)):
+        if skills:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(skills))
+    lines = [" ".join(words[i:i + 12]) for i in range(0, len(words), 12)]
+    return "\n".join(lines)
+
+
+def make_resume(rng, vocabulary, n_skills=12, n_words=600):
+    """Returns {"text", "skills", "total_experience", "expected_ctc"} for one resume."""
+    skills = rng.sample(vocabulary, min(n_skills, len(vocabulary)))
+    experience = rng.randint(0, 15)
+    header = f"Candidate {rng.randrange(10**6):06d}\n{experience} years of professional experience\n"
+    return {
+        "text": header + _sentence_stream(rng, FILLER, skills, n_words, 0.01),
+        "skills": sorted(skill.lower() for skill in skills),
+        "total_experience": experience,
+        "expected_ctc": rng.randrange(50000, 250000, 10000),
+    }
+
+
+def make_jd(rng, vocabulary, n_skills=10, n_mandatory=3, n_words=250):
+    """
+    Returns {"text", "skills", "mandatory_skills", "min_experience", "max_ctc",
+    "states_experience"} for one JD. Some JDs do not state the experience at all.
+    """
+    skills = rng.sample(vocabulary, min(n_skills, len(vocabulary)))
+    mandatory = skills[:n_mandatory]
+    min_experience = rng.randint(0, 8)
+    template = rng.choice(EXPERIENCE_TEMPLATES)
+    lines = [template.format(n=min_experience, m=min_experience + rng.randint(1, 4), word=NUMBER_NAMES[min_experience])]
+    lines += [f"Must have strong experience with {skill}." for skill in mandatory]
+    lines.append(_sentence_stream(rng, JD_FILLER, skills[n_mandatory:], n_words, 0.0))
+    lines.append("Nice to have: " + ", ".join(skills[n_mandatory:]) + ".")
+    return {
+        "text": "\n".join(lines),
+        "skills": sorted(skill.lower() for skill in skills),
+        "mandatory_skills": sorted(skill.lower() for skill in mandatory),
+        "min_experience": min_experience,
+        "max_ctc": rng.randrange(80000, 220000, 10000),
+        "states_experience": "{" in template,
+    }
+
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def text_to_pdf(text, lines_per_page=55):
+    """
+    Renders plain text as a minimal PDF (Helvetica, one text line per source line).
+    Hand-written rather than via a PDF library so output is byte-identical everywhere.
+    """
+    lines = text.split("\n")
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = []  # object bodies; object number = index + 1
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(None)
+    pages_obj = add(None)
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    page_ids = []
+    for page_lines in pages:
+        stream = "BT /F1 10 Tf 12 TL 50 800 Td\n" + "".join(f"({_pdf_escape(line)}) Tj T*\n" for line in page_lines) + "ET"
+        stream = stream.encode("latin-1", "replace")
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 842] /Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (pages_obj, font, content)
+        ))
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_obj
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[pages_obj - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref_at)
+    return bytes(out)
+
+
+def generate_corpus(n_resumes=200, n_jds=5, resume_words=600, jd_words=250, resume_skills=12, jd_skills=10,
+                    seed=42, with_pdfs=True, skills_db="skills_db.json"):
+    """Returns {"resumes": [...], "jds": [...]}; resumes also carry "pdf" bytes when with_pdfs."""
+    rng = random.Random(seed)
+    vocabulary = sorted(load_skills_from_db(skills_db))
+    resumes = [make_resume(rng, vocabulary, resume_skills, resume_words) for _ in range(n_resumes)]
+    jds = [make_jd(rng, vocabulary, jd_skills, min(3, jd_skills), jd_words) for _ in range(n_jds)]
+    if with_pdfs:
+        for resume in resumes:
+            resume["pdf"] = text_to_pdf(resume["text"])
+    return {"resumes": resumes, "jds": jds}
+
+
+def write_corpus(corpus, directory):
+    os.makedirs(directory, exist_ok=True)
+    manifest = {"resumes": [], "jds": []}
+    for i, resume in enumerate(corpus["resumes"]):
+        stem = os.path.join(directory, f"resume_{i:04d}")
+        with open(stem + ".txt", "w") as f:
+            f.write(resume["text"])
+        if "pdf" in resume:
+            with open(stem + ".pdf", "wb") as f:
+                f.write(resume["pdf"])
+        manifest["resumes"].append({"file": os.path.basename(stem), **{k: v for k, v in resume.items() if k not in ("text", "pdf")}})
+    for i, jd in enumerate(corpus["jds"]):
+        path = os.path.join(directory, f"jd_{i:04d}.txt")
+        with open(path, "w") as f:
+            f.write(jd["text"])
+        manifest["jds"].append({"file": os.path.basename(path), **{k: v for k, v in jd.items() if k != "text"}})
+    with open(os.path.join(directory, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--jds", type=int, default=5)
+    parser.add_argument("--resume-words", type=int, default=600)
+    parser.add_argument("--jd-words", type=int, default=250)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.resumes, args.jds, args.resume_words, args.jd_words, seed=args.seed)
+    write_corpus(corpus, args.out)
+    print(f"Wrote {len(corpus['resumes'])} resumes and {len(corpus['jds'])} JDs to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
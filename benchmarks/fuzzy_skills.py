@@ -0,0 +1,141 @@
+"""
+Fuzzy (embedding) skill matching: recall on aliases and spelling variants, false
+matches on skill-free text, and the latency it adds on top of exact extraction.
+
+Documents mix filler with three kinds of skill mentions: exact names from
+skills_db.json, aliases from skill_aliases.json ("k8s", "Postgres") and generated
+spelling variants ("Node JS", "SpringBoot", "Tensor-Flow"). Recall is reported per
+kind for exact-only and exact+fuzzy extraction. Timings are per document, with
+the phrase cache cleared before each pass ("cold") and kept ("warm").
+
+Run from the repository root:
+    python -m benchmarks.fuzzy_skills [--docs 200] [--words 600] [--budget-ms 20]
+    python -m benchmarks.fuzzy_skills --model sentence-transformers/all-MiniLM-L6-v2
+
+Exits 1 if the cold p95 fuzzy overhead per document exceeds --budget-ms.
+"""
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import skill_embeddings
+import skill_extractor
+from benchmarks.corpus import FILLER, JD_FILLER
+
+# Everyday words that sit close to skill names, to catch false matches
+NEAR_MISSES = "reactive reaction springs oracles rusty swiftly nodes expression flasks panda goal going docking posters".split()
+
+
+def spelling_variants(skill):
+    """Spellings of `skill` that the exact trie does not match."""
+    words = re.split(r"[\s.\-]+", skill)
+    variants = {
+        " ".join(words),
+        "".join(words),
+        "-".join(words),
+        # Split camel case: "TensorFlow" -> "Tensor Flow"
+        re.sub(r"(?<=[a-z])(?=[A-Z])", " ", skill),
+    }
+    lowered = {word.lower() for word in skill.split()}
+    return sorted(v for v in variants if {word.lower() for word in v.split()} != lowered and len(v) > 2)
+
+
+def make_documents(n, n_words, seed=11):
+    """Returns [(text, {kind: set of canonical skills planted})], kinds exact/alias/variant."""
+    rng = random.Random(seed)
+    aliases = [(skill, alias) for skill, names in skill_embeddings.load_skill_aliases().items() for alias in names]
+    variants = [(skill, v) for skill in skill_extractor.SKILLS_DB for v in spelling_variants(skill)]
+    filler = FILLER + JD_FILLER + NEAR_MISSES
+    docs = []
+    for _ in range(n):
+        words = [rng.choice(filler) for _ in range(n_words)]
+        planted = {"exact": set(), "alias": set(), "variant": set()}
+        for kind, pool in (("exact", [(s, s) for s in skill_extractor.SKILLS_DB]), ("alias", aliases), ("variant", variants)):
+            for skill, mention in rng.sample(pool, 4):
+                words.insert(rng.randrange(len(words) + 1), mention)
+                planted[kind].add(skill)
+        lines = [" ".join(words[i:i + 12]) for i in range(0, len(words), 12)]
+        docs.append(("\n".join(lines), planted))
+    return docs
+
+
+def recall(found, docs, kind):
+    planted = sum(len(p[kind]) for _, p in docs)
+    hits = sum(len(p[kind] & f) for (_, p), f in zip(docs, found))
+    return hits / planted if planted else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--words", type=int, default=600, help="Filler words per document")
+    parser.add_argument("--model", default=skill_embeddings.SKILL_EMBEDDING_MODEL, help="char-ngrams or a Hugging Face model name")
+    parser.add_argument("--threshold", type=float, help="Similarity threshold (default: the encoder's)")
+    parser.add_argument("--budget-ms", type=float, default=20.0, help="Allowed cold p95 fuzzy overhead per document")
+    args = parser.parse_args()
+
+    nlp = skill_extractor.get_nlp()
+    docs = make_documents(args.docs, args.words)
+    parsed = [nlp.make_doc(text) for text, _ in docs]
+    encoder = skill_embeddings.get_encoder(args.model)
+    aliases = skill_embeddings.load_skill_aliases()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        index = skill_embeddings.SkillEmbeddingIndex.build(skill_extractor.SKILLS_DB, aliases, encoder, cache_dir, args.threshold)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        index = skill_embeddings.SkillEmbeddingIndex.build(skill_extractor.SKILLS_DB, aliases, encoder, cache_dir, args.threshold)
+        mapped = time.perf_counter() - start
+    print(f"index: {len(index.labels)} rows x {index.matrix.shape[1]} dims, model={encoder.id}, threshold={index.threshold}")
+    print(f"build (embed + write): {build * 1000:.1f} ms, load from disk (mmap): {mapped * 1000:.1f} ms")
+
+    exact_spans = [list(skill_extractor.match_skills_in_doc(doc)) for doc in parsed]
+    start = time.perf_counter()
+    for doc in parsed:
+        list(skill_extractor.match_skills_in_doc(doc))
+    exact_ms = (time.perf_counter() - start) / len(parsed) * 1000
+
+    timings = {}
+    for mode in ("cold", "warm"):
+        per_doc = []
+        fuzzy = []
+        for doc, spans in zip(parsed, exact_spans):
+            if mode == "cold":
+                index.clear_cache()
+            start = time.perf_counter()
+            fuzzy.append(index.match_doc(doc, spans))
+            per_doc.append((time.perf_counter() - start) * 1000)
+        timings[mode] = np.percentile(per_doc, [50, 95, 99])
+
+    exact_found = [{skill for skill, _, _ in spans} for spans in exact_spans]
+    fuzzy_found = [
+        {skill for skill, _, _ in skill_embeddings.merge_matches(spans, matches)} for spans, matches in zip(exact_spans, fuzzy)
+    ]
+    planted_all = [set().union(*p.values()) for _, p in docs]
+    false_matches = sum(len(found - planted) for found, planted in zip(fuzzy_found, planted_all))
+    exact_false = sum(len(found - planted) for found, planted in zip(exact_found, planted_all))
+
+    print(f"\n{len(docs)} documents, ~{args.words} words each; exact trie: {exact_ms:.2f} ms/doc")
+    print(f"{'fuzzy overhead':<16} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+    for mode, (p50, p95, p99) in timings.items():
+        print(f"{mode:<16} {p50:>9.2f} {p95:>9.2f} {p99:>9.2f}")
+    print(f"\n{'recall':<16} {'exact':>8} {'alias':>8} {'variant':>8}")
+    for name, found in (("exact only", exact_found), ("exact + fuzzy", fuzzy_found)):
+        print(f"{name:<16} {recall(found, docs, 'exact'):>8.1%} {recall(found, docs, 'alias'):>8.1%} {recall(found, docs, 'variant'):>8.1%}")
+    print(f"skills not planted: {exact_false} exact only, {false_matches} exact + fuzzy")
+
+    if timings["cold"][1] > args.budget_ms:
+        print(f"OVER BUDGET: cold p95 {timings['cold'][1]:.2f} ms > {args.budget_ms:.2f} ms")
+        return 1
+    print(f"Within budget: cold p95 {timings['cold'][1]:.2f} ms <= {args.budget_ms:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Analysis write throughput: one save_analysis_data call per analysis vs. BulkWriter.
+
+Uses a local mongod when --uri is given (e.g. mongodb://localhost:27017), otherwise
+an in-process mongomock stand-in. mongomock has no network round trips and no real
+indexes, so --rtt-ms adds a simulated round trip per write call; use a real mongod
+for absolute numbers. The workload reuses a small set of JDs, as a batch screening
+run does, so the upserts de-duplicate them.
+
+Run from the repository root:
+    python -m benchmarks.mongo_writes [--analyses 20000] [--uri mongodb://localhost:27017]
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+
+import database
+
+
+def make_workload(n, jds=20, seed=4):
+    rng = random.Random(seed)
+    job_descriptions = [{"text": f"JD {i}: Python, Docker, AWS ...", "min_experience": rng.randint(0, 8)} for i in range(jds)]
+    workload = []
+    for i in range(n):
+        candidate = {"name": f"candidate-{i}", "experience": rng.randint(0, 12), "expected_ctc": rng.randrange(50000, 250000, 10000)}
+        result = {"fit_status": rng.choice(["Fit", "Not Fit"]), "skill_fit_percent": rng.random() * 100,
+                  "matched_mandatory": ["python"], "missing_mandatory": [], "bonus_skills": ["go"]}
+        workload.append((rng.choice(job_descriptions), candidate, result, round(rng.random() * 100, 2)))
+    return workload
+
+
+def fresh_db(uri, name, rtt):
+    if uri:
+        import pymongo
+        client = pymongo.MongoClient(uri)
+    else:
+        import mongomock
+        client = mongomock.MongoClient()
+        if rtt and not getattr(mongomock.Collection.bulk_write, "simulated_rtt", False):
+            bulk_write = mongomock.Collection.bulk_write
+
+            def bulk_write_with_rtt(self, *args, **kwargs):
+                time.sleep(rtt)
+                return bulk_write(self, *args, **kwargs)
+
+            bulk_write_with_rtt.simulated_rtt = True
+            mongomock.Collection.bulk_write = bulk_write_with_rtt
+    client.drop_database(name)
+    db = client[name]
+    database.ensure_indexes(db)
+    return db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--analyses", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--uri", help="MongoDB URI of a local mongod; defaults to mongomock")
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="Simulated round trip per write call (mongomock only)")
+    args = parser.parse_args()
+
+    workload = make_workload(args.analyses)
+    print(f"{args.analyses} analyses against " + (args.uri if args.uri else f"mongomock (+{args.rtt_ms} ms simulated RTT)"))
+    print(f"{'mode':<28} {'time (s)':>9} {'analyses/s':>11} {'JD docs':>8} {'candidates':>11} {'analyses':>9}")
+
+    db = fresh_db(args.uri, "jobfit_bench_single", args.rtt_ms / 1000)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for jd, candidate, result, score in workload:
+            database.save_analysis_data(db, jd, candidate, result, score)
+    elapsed = time.perf_counter() - start
+    print(f"{'save_analysis_data':<28} {elapsed:>9.2f} {args.analyses / elapsed:>11,.0f} "
+          f"{db['job_descriptions'].count_documents({}):>8} {db['candidate_profiles'].count_documents({}):>11} "
+          f"{db['analyses'].count_documents({}):>9}")
+
+    db = fresh_db(args.uri, "jobfit_bench_bulk", args.rtt_ms / 1000)
+    start = time.perf_counter()
+    with database.BulkWriter(db, batch_size=args.batch_size) as writer:
+        for jd, candidate, result, score in workload:
+            writer.save_analysis(jd, candidate, result, score)
+    elapsed = time.perf_counter() - start
+    print(f"{'BulkWriter':<28} {elapsed:>9.2f} {args.analyses / elapsed:>11,.0f} "
+          f"{db['job_descriptions'].count_documents({}):>8} {db['candidate_profiles'].count_documents({}):>11} "
+          f"{db['analyses'].count_documents({}):>9}")
+
+
+if __name__ == "__main__":
+    main()
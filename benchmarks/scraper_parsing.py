@@ -0,0 +1,103 @@
+"""
+JD container extraction over a corpus of HTML pages: the original BeautifulSoup tree
+with html.parser, the same tree with lxml, and the single-pass lxml extractor.
+Checks that every mode returns the same text.
+
+Pass --corpus with a directory of saved career-site pages (*.html); without it a
+synthetic corpus of large pages is generated.
+
+Run from the repository root:
+    python -m benchmarks.scraper_parsing [--corpus saved_pages/] [--pages 50]
+"""
+import argparse
+import contextlib
+import glob
+import io
+import os
+import random
+import time
+
+import job_scraper
+
+
+def make_corpus(n, seed=5):
+    rng = random.Random(seed)
+    words = "python docker kubernetes aws design build maintain services team experience".split()
+    layouts = [
+        "<div class='job-description'>{jd}</div>",
+        "<div id='jobDetailsSection'>{jd}</div>",
+        "<div class='job-post-content'>{jd}</div>",
+        "<article>{jd}</article>",
+        "<main>{jd}</main>",
+        "<section>{jd}</section>",
+    ]
+    pages = []
+    for i in range(n):
+        nav = "".join(f"<li class='nav-item'><a href='/p{k}'>Link {k}</a></li>" for k in range(rng.randint(200, 800)))
+        cards = "".join(
+            f"<div class='card related-{k}'><h3>Role {k}</h3><p>{' '.join(rng.choice(words) for _ in range(30))}</p></div>"
+            for k in range(rng.randint(50, 200))
+        )
+        jd = "".join(f"<p>{' '.join(rng.choice(words) for _ in range(60))}</p>" for _ in range(rng.randint(10, 40)))
+        body = layouts[i % len(layouts)].format(jd=jd)
+        # Put the JD container at varying depths in the page
+        before, after = (cards, "") if i % 2 else ("", cards)
+        pages.append(
+            f"<html><head><title>Job {i}</title><script>var x = {i};</script></head>"
+            f"<body><nav><ul>{nav}</ul></nav>{before}{body}{after}<footer>{nav}</footer></body></html>"
+        )
+    return pages
+
+
+def time_mode(pages, extract):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        texts = [extract(page) for page in pages]
+    return texts, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory of saved *.html pages")
+    parser.add_argument("--pages", type=int, default=50, help="Synthetic pages to generate without --corpus")
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(args.corpus, "*.html"))):
+            with open(path, "rb") as f:
+                pages.append(f.read())
+    else:
+        pages = make_corpus(args.pages)
+    total_mb = sum(len(page) for page in pages) / 1e6
+
+    def soup_with(parser_name):
+        def extract(page):
+            previous, job_scraper.HTML_PARSER = job_scraper.HTML_PARSER, parser_name
+            try:
+                return job_scraper.extract_job_description_with_soup(page)
+            finally:
+                job_scraper.HTML_PARSER = previous
+        return extract
+
+    modes = [
+        ("soup + html.parser (original)", soup_with("html.parser")),
+        ("soup + lxml", soup_with("lxml")),
+        ("single-pass lxml", job_scraper.extract_job_description_single_pass),
+    ]
+    print(f"{len(pages)} pages, {total_mb:.1f} MB")
+    print(f"{'mode':<32} {'time (s)':>9} {'pages/s':>9} {'MB/s':>7} {'speedup':>8}")
+    baseline_texts, baseline_time = None, None
+    for name, extract in modes:
+        texts, elapsed = time_mode(pages, extract)
+        if baseline_texts is None:
+            baseline_texts, baseline_time = texts, elapsed
+        mismatches = sum(a != b for a, b in zip(baseline_texts, texts))
+        print(
+            f"{name:<32} {elapsed:>9.3f} {len(pages) / elapsed:>9.1f} {total_mb / elapsed:>7.1f} {baseline_time / elapsed:>7.1f}x"
+            + (f"  ({mismatches} pages differ!)" if mismatches else "")
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+JD scraping throughput against a local stand-in job board: sequential
+scrape_job_description vs. AsyncJobScraper, plus a conditional re-fetch pass.
+
+The stand-in server adds --latency seconds per response, answers with ETag and
+Last-Modified headers, honors If-None-Match, and fails the first request for
+every 10th posting with a 503 in each phase to exercise retries.
+
+Run from the repository root:
+    python -m benchmarks.scraping [--pages 200] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import io
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from async_scraper import AsyncJobScraper
+from job_scraper import scrape_job_description
+
+
+def make_page(n, rng):
+    words = "python docker kubernetes aws design build maintain services team experience".split()
+    paragraphs = "".join(f"<p>{' '.join(rng.choice(words) for _ in range(60))}</p>" for _ in range(20))
+    nav = "".join(f"<li><a href='/l{i}'>Link {i}</a></li>" for i in range(200))
+    return (
+        f"<html><head><title>Job {n}</title></head><body><nav><ul>{nav}</ul></nav>"
+        f"<div class='job-description'><h1>Backend Engineer {n}</h1>{paragraphs}</div>"
+        f"<footer>{nav}</footer></body></html>"
+    ).encode()
+
+
+def make_handler(pages, latency):
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        failed_once = set()
+
+        def do_GET(self):
+            time.sleep(latency)
+            n = int(self.path.rsplit("/", 1)[-1])
+            with lock:
+                fail = n % 10 == 0 and n not in self.failed_once
+                self.failed_once.add(n)
+            if fail:
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = pages[n]
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", "Mon, 01 Jan 2024 00:00:00 GMT")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--per-host", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    pages = [make_page(n, rng) for n in range(args.pages)]
+    handler = make_handler(pages, args.latency)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/job/"
+    urls = [f"{base}{n}" for n in range(args.pages)]
+
+    # The scrapers print which selector matched; keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        sequential = [scrape_job_description(url) for url in urls]
+        sequential_time = time.perf_counter() - start
+
+        async def run_async():
+            async with AsyncJobScraper(per_host_limit=args.per_host, backoff=0.05) as scraper:
+                start = time.perf_counter()
+                texts = await scraper.scrape_many(urls)
+                first_time = time.perf_counter() - start
+                first_stats = dict(scraper.stats)
+                start = time.perf_counter()
+                refetched = await scraper.scrape_many(urls)
+                refetch_time = time.perf_counter() - start
+                refetch_stats = {key: scraper.stats[key] - first_stats[key] for key in first_stats}
+                return texts, first_time, first_stats, refetched, refetch_time, refetch_stats
+
+        handler.failed_once.clear()
+        concurrent, async_time, async_stats, refetched, refetch_time, refetch_stats = asyncio.run(run_async())
+    server.shutdown()
+
+    sequential_errors = sum(text.startswith("Error:") for text in sequential)
+    mismatches = sum(concurrent[url] != text for url, text in zip(urls, sequential) if not text.startswith("Error:"))
+    print(f"{'mode':<28} {'time (s)':>9} {'pages/s':>9} {'errors':>7}")
+    print(f"{'sequential (requests)':<28} {sequential_time:>9.2f} {args.pages / sequential_time:>9.1f} {sequential_errors:>7}")
+    print(f"{'async (aiohttp, retries)':<28} {async_time:>9.2f} {args.pages / async_time:>9.1f} "
+          f"{sum(t.startswith('Error:') for t in concurrent.values()):>7}")
+    print(f"{'async conditional re-fetch':<28} {refetch_time:>9.2f} {args.pages / refetch_time:>9.1f} "
+          f"{sum(t.startswith('Error:') for t in refetched.values()):>7}")
+    print(f"async stats: {async_stats}")
+    print(f"re-fetch stats: {refetch_stats}")
+    if mismatches:
+        print(f"{mismatches} pages differ between sequential and async scraping!")
+
+
+if __name__ == "__main__":
+    main()
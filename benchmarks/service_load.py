@@ -0,0 +1,142 @@
+"""
+Load generator for service.py: concurrent clients against a running server, or one it
+starts locally. Each client loops over a mix of requests on the synthetic corpus:
+JD analysis, resume upload and batch scoring of --batch-size stored resumes.
+Reports requests/sec and p50/p95/p99 latency per endpoint.
+
+Run from the repository root:
+    python -m benchmarks.service_load [--concurrency 16] [--duration 20] [--llm]
+    python -m benchmarks.service_load --url http://127.0.0.1:8080
+
+Without --url the server is started with --no-models unless --llm is given.
+"""
+import argparse
+import asyncio
+import random
+import subprocess
+import sys
+import time
+
+import aiohttp
+import numpy as np
+
+from benchmarks.corpus import generate_corpus
+
+
+async def wait_until_up(session, url, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(f"{url}/health") as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.5)
+    raise RuntimeError(f"Service at {url} did not come up within {timeout}s")
+
+
+async def client(session, url, corpus, resume_ids, batch_size, deadline, latencies, errors, seed):
+    rng = random.Random(seed)
+    resumes, jds = corpus["resumes"], corpus["jds"]
+    while time.monotonic() < deadline:
+        kind = rng.choices(["jd", "upload", "score"], weights=[1, 3, 2])[0]
+        start = time.perf_counter()
+        try:
+            if kind == "jd":
+                response = await session.post(f"{url}/jd/analyze", json={"text": rng.choice(jds)["text"]})
+            elif kind == "upload":
+                # A trailing comment makes each upload a new PDF, so it is parsed rather than
+                # answered from the resume store
+                data = rng.choice(resumes)["pdf"] + b"%% load %d\n" % rng.randrange(1 << 60)
+                response = await session.post(f"{url}/resumes", data=data, headers={"Content-Type": "application/pdf"})
+            else:
+                jd = rng.choice(jds)
+                picked = rng.sample(range(len(resume_ids)), min(batch_size, len(resume_ids)))
+                response = await session.post(f"{url}/score", json={
+                    "jd": {"skills": jd["skills"], "mandatory_skills": jd["mandatory_skills"],
+                           "min_experience": jd["min_experience"], "max_ctc": jd["max_ctc"]},
+                    "candidates": [{"resume_id": resume_ids[i], "total_experience": resumes[i]["total_experience"],
+                                    "expected_ctc": resumes[i]["expected_ctc"]} for i in picked],
+                    "top_k": 10,
+                })
+            async with response:
+                await response.read()
+                if response.status != 200:
+                    errors[kind] = errors.get(kind, 0) + 1
+                    continue
+        except aiohttp.ClientError:
+            errors[kind] = errors.get(kind, 0) + 1
+            continue
+        latencies.setdefault(kind, []).append(time.perf_counter() - start)
+
+
+async def run(args):
+    corpus = generate_corpus(n_resumes=args.resumes, n_jds=10, seed=args.seed)
+    server = None
+    url = args.url
+    if url is None:
+        url = f"http://127.0.0.1:{args.port}"
+        command = [sys.executable, "service.py", "--port", str(args.port)]
+        if args.workers:
+            command += ["--workers", str(args.workers)]
+        if not args.llm:
+            command.append("--no-models")
+        server = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    try:
+        async with aiohttp.ClientSession(connector=connector) as session:
+            await wait_until_up(session, url)
+            # Upload every resume once so scoring requests can reference them
+            resume_ids = []
+            for resume in corpus["resumes"]:
+                async with session.post(f"{url}/resumes", data=resume["pdf"], headers={"Content-Type": "application/pdf"}) as response:
+                    resume_ids.append((await response.json())["resume_id"])
+
+            latencies, errors = {}, {}
+            started = time.monotonic()
+            deadline = started + args.duration
+            await asyncio.gather(*(
+                client(session, url, corpus, resume_ids, args.batch_size, deadline, latencies, errors, args.seed + i)
+                for i in range(args.concurrency)
+            ))
+            elapsed = time.monotonic() - started
+            async with session.get(f"{url}/metrics") as response:
+                metrics = await response.text()
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"concurrency={args.concurrency} duration={elapsed:.1f}s total={total / elapsed:.1f} req/s")
+    print(f"{'endpoint':<10} {'requests':>9} {'req/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'errors':>7}")
+    for kind in ("jd", "upload", "score"):
+        values = np.array(latencies.get(kind, [])) * 1000
+        if not len(values):
+            continue
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        print(f"{kind:<10} {len(values):>9} {len(values) / elapsed:>8.1f} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f} {errors.get(kind, 0):>7}")
+    batcher = [line for line in metrics.splitlines() if line.startswith("jobfit_zero_shot_batcher")]
+    if args.llm and batcher:
+        print("\n".join(batcher))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running service")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the locally started service")
+    parser.add_argument("--workers", type=int, help="Parsing processes for the locally started service")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20, help="Seconds of load")
+    parser.add_argument("--resumes", type=int, default=200, help="Distinct resumes in the corpus")
+    parser.add_argument("--batch-size", type=int, default=100, help="Candidates per /score request")
+    parser.add_argument("--llm", action="store_true", help="Start the service with the zero-shot/QA models")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
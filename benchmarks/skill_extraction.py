@@ -0,0 +1,135 @@
+"""
+Skill extraction: the old full-pipeline spaCy Matcher vs. the tokenizer + skill trie
+vs. the compiled taxonomy matcher (taxonomy.py).
+
+Checks that all engines return identical skill sets on every document, then
+reports docs/sec for each, plus the compiled artifact's size and how long it takes
+to map. --extra-skills pads the vocabulary with synthetic skills to show how each
+engine scales with the size of the skills DB.
+
+Run from the repository root:
+    python -m benchmarks.skill_extraction [--docs 200] [--extra-skills 0 10000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import spacy
+from spacy.matcher import Matcher
+
+import skill_extractor
+import taxonomy
+
+FILLER = (
+    "We are looking for an engineer to join our team . You will design , build and "
+    "maintain services , work with product managers , review code and mentor others . "
+    "Experience with distributed systems , testing , and CI/CD pipelines is a plus ."
+).split()
+
+
+def make_documents(skills, n, seed=7):
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(n):
+        words = []
+        for _ in range(rng.randint(150, 600)):
+            if rng.random() < 0.06:
+                skill = rng.choice(skills)
+                words.append(skill.lower() if rng.random() < 0.3 else skill)
+            else:
+                words.append(rng.choice(FILLER))
+        docs.append(" ".join(words))
+    return docs
+
+
+def build_matcher(nlp, skills):
+    matcher = Matcher(nlp.vocab)
+    for skill in skills:
+        matcher.add(skill, [[{"LOWER": word.lower()} for word in skill.split()]])
+    return matcher
+
+
+def matcher_extract(nlp, matcher, text):
+    doc = nlp(text)
+    return {nlp.vocab.strings[match_id] for match_id, _, _ in matcher(doc)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--extra-skills", type=int, nargs="+", default=[0, 10000])
+    args = parser.parse_args()
+
+    full_nlp = spacy.load("en_core_web_sm")
+    docs = make_documents(skill_extractor.SKILLS_DB, args.docs)
+
+    print(
+        f"{'skills':>8} {'matcher build (s)':>18} {'trie build (s)':>15} {'compile (s)':>12} {'artifact (KB)':>14} {'map (ms)':>9} "
+        f"{'matcher docs/s':>15} {'trie docs/s':>12} {'batch docs/s':>13} {'compiled docs/s':>16}"
+    )
+    for extra in args.extra_skills:
+        skills = skill_extractor.SKILLS_DB + [f"synthskill{i} lib{i % 97}" for i in range(extra)]
+
+        start = time.perf_counter()
+        matcher = build_matcher(full_nlp, skills)
+        matcher_build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        trie = skill_extractor.build_skill_trie(skills)
+        trie_build = time.perf_counter() - start
+
+        # Aliases off: the Matcher and the trie only know the skill names
+        start = time.perf_counter()
+        data = taxonomy.compile_taxonomy({"skills": skills})
+        compile_time = time.perf_counter() - start
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "skills_taxonomy.bin")
+            with open(path, "wb") as f:
+                f.write(data)
+            start = time.perf_counter()
+            compiled = taxonomy.SkillTaxonomy.open(path)
+            map_time = time.perf_counter() - start
+            names = compiled.names
+            compiled.match_doc(skill_extractor.get_nlp().make_doc(docs[0]))
+
+            start = time.perf_counter()
+            compiled_found = [
+                {names[skill_id] for skill_id, _, _ in compiled.match_doc(doc)}
+                for doc in skill_extractor.get_nlp().tokenizer.pipe(docs, batch_size=64)
+            ]
+            compiled_time = time.perf_counter() - start
+            del compiled
+
+        start = time.perf_counter()
+        expected = [matcher_extract(full_nlp, matcher, text) for text in docs]
+        matcher_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = [
+            {skill for skill, _, _ in skill_extractor.match_skills_in_doc(skill_extractor.get_nlp().make_doc(text), trie)}
+            for text in docs
+        ]
+        trie_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batched = [
+            {skill for skill, _, _ in skill_extractor.match_skills_in_doc(doc, trie)}
+            for doc in skill_extractor.get_nlp().tokenizer.pipe(docs, batch_size=64)
+        ]
+        batch_time = time.perf_counter() - start
+
+        mismatches = sum(
+            sum(a != b for a, b in zip(expected, found)) for found in (actual, batched, compiled_found)
+        )
+        print(
+            f"{len(skills):>8} {matcher_build:>18.3f} {trie_build:>15.3f} {compile_time:>12.3f} {len(data) / 1024:>14,.1f} "
+            f"{map_time * 1000:>9.2f} {len(docs) / matcher_time:>15,.0f} {len(docs) / trie_time:>12,.0f} "
+            f"{len(docs) / batch_time:>13,.0f} {len(docs) / compiled_time:>16,.0f}"
+            + (f"  ({mismatches} mismatched documents!)" if mismatches else "")
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Cold-start report: import time of each module in a fresh interpreter, then the
+latency of the first request (which pays for lazily loading the models).
+
+Run from the repository root:
+    python -m benchmarks.startup [--llm]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+MODULES = ["analysis", "resume_parser", "skill_extractor", "llm_analyzer", "cache"]
+
+FIRST_REQUEST = """
+import json, time
+import skill_extractor
+import model_loader
+start = time.perf_counter()
+skill_extractor.extract_skills_from_text("Python, Docker and Kubernetes")
+skills_first = time.perf_counter() - start
+start = time.perf_counter()
+skill_extractor.extract_skills_from_text("Java and Go")
+skills_second = time.perf_counter() - start
+result = {"skills_first_request": skills_first, "skills_second_request": skills_second}
+if LLM:
+    import llm_analyzer
+    jd = "Must have 3+ years of Python.\\nDocker is a plus."
+    start = time.perf_counter()
+    llm_analyzer.find_mandatory_skills_with_llm(jd, ["Python", "Docker"])
+    result["zero_shot_first_request"] = time.perf_counter() - start
+    start = time.perf_counter()
+    llm_analyzer.find_experience_with_llm(jd)
+    result["qa_first_request"] = time.perf_counter() - start
+result["report"] = model_loader.startup_report()
+print(json.dumps(result))
+"""
+
+
+def time_import(module):
+    code = f"import time; s = time.perf_counter(); import {module}; print(time.perf_counter() - s)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm", action="store_true", help="Also time the first zero-shot and QA requests")
+    args = parser.parse_args()
+
+    print("Import time (fresh interpreter):")
+    for module in MODULES:
+        print(f"  {module:<16} {time_import(module):>8.3f}s")
+
+    out = subprocess.run(
+        [sys.executable, "-c", f"LLM = {args.llm}\n" + FIRST_REQUEST], capture_output=True, text=True, check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    report = result.pop("report")
+    print("First-request latency:")
+    for name, seconds in result.items():
+        print(f"  {name:<24} {seconds:>8.3f}s")
+    print("Resource load times:")
+    for name, resource in report["resources"].items():
+        if resource["loaded"]:
+            print(f"  {name:<24} {resource['load_seconds']:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Benchmark suite: per-stage micro-benchmarks and end-to-end throughput over a
+deterministic synthetic corpus (benchmarks/corpus.py), written as JSON and
+optionally compared against a stored baseline.
+
+Stages: pdf_parsing, skill_extraction, skill_extraction_batched,
+skill_extraction_fuzzy (exact + embedding matching, cold phrase cache), skill_analysis,
+final_scoring, batch_ranking, experience_rules, end_to_end, plus zero_shot,
+experience_qa and experience_hybrid (rules with QA fallback) with --llm.
+Each benchmark runs --repeats times after one warm-up run. The median is reported;
+the best (minimum) time per item is what gets compared, as it is the least noisy.
+
+Run from the repository root:
+    python -m benchmarks.suite --size small --output results.json
+    python -m benchmarks.suite --size small --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --size small --baseline benchmarks/baseline.json [--tolerance 0.25]
+
+With --baseline, any benchmark whose best time per item is more than
+--tolerance slower than the baseline is reported and the exit code is 1.
+Baselines are only comparable on the same machine and --size.
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.corpus import generate_corpus
+
+SIZES = {
+    # resumes, JDs, words per resume, words per JD
+    "small": dict(n_resumes=50, n_jds=3, resume_words=400, jd_words=200),
+    "medium": dict(n_resumes=300, n_jds=5, resume_words=800, jd_words=300),
+    "large": dict(n_resumes=1000, n_jds=10, resume_words=2000, jd_words=500),
+}
+
+
+def measure(func, items, repeats, cycles=1):
+    """
+    Runs func() once to warm up, then times `repeats` samples of `cycles` calls each.
+    func processes `items` items; cheap stages use cycles > 1 so a sample is not
+    dominated by timer resolution.
+    """
+    items *= cycles
+    with contextlib.redirect_stdout(io.StringIO()):
+        func()
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(cycles):
+                func()
+            times.append(time.perf_counter() - start)
+    median = statistics.median(times)
+    return {
+        "items": items,
+        "repeats": repeats,
+        "median_s": median,
+        "min_s": min(times),
+        "max_s": max(times),
+        "per_item_ms": median / items * 1000,
+        "best_per_item_ms": min(times) / items * 1000,
+        "items_per_s": items / median if median else None,
+    }
+
+
+def run_suite(corpus, repeats, llm=False):
+    from analysis import analyze_skills, get_final_fit
+    from batch_analysis import rank_resumes
+    from experience_extractor import extract_experience
+    from resume_parser import extract_text_from_pdf
+    from skill_extractor import extract_skills_from_text, extract_skills_from_texts
+    import profiling
+    import skill_embeddings
+    import skill_extractor
+
+    resumes, jds = corpus["resumes"], corpus["jds"]
+    texts = [resume["text"] for resume in resumes]
+    jd = jds[0]
+    jd_fit = {"min_experience": jd["min_experience"], "max_ctc": jd["max_ctc"]}
+    jd_skills = extract_skills_from_text(jd["text"])
+    resume_skills = [extract_skills_from_text(text) for text in texts]
+    analyses = [analyze_skills(jd_skills, skills, jd["mandatory_skills"]) for skills in resume_skills]
+    candidates = [{"total_experience": r["total_experience"], "expected_ctc": r["expected_ctc"]} for r in resumes]
+
+    results = {}
+    results["pdf_parsing"] = measure(lambda: [extract_text_from_pdf(r["pdf"]) for r in resumes], len(resumes), repeats)
+    results["skill_extraction"] = measure(lambda: [extract_skills_from_text(t) for t in texts], len(texts), repeats)
+    results["skill_extraction_batched"] = measure(lambda: list(extract_skills_from_texts(texts)), len(texts), repeats)
+
+    def fuzzy_extraction():
+        skill_embeddings.get_index().clear_cache()
+        return list(extract_skills_from_texts(texts))
+
+    was_fuzzy = skill_extractor.fuzzy_matching_enabled()
+    skill_extractor.enable_fuzzy_matching(True)
+    try:
+        results["skill_extraction_fuzzy"] = measure(fuzzy_extraction, len(texts), repeats)
+        fuzzy_skills = fuzzy_extraction()
+    finally:
+        skill_extractor.enable_fuzzy_matching(was_fuzzy)
+    results["skill_analysis"] = measure(
+        lambda: [analyze_skills(jd_skills, skills, jd["mandatory_skills"]) for skills in resume_skills], len(texts), repeats, cycles=50
+    )
+    results["final_scoring"] = measure(
+        lambda: [get_final_fit(a, jd_fit, c) for a, c in zip(analyses, candidates)], len(analyses), repeats, cycles=50
+    )
+    results["batch_ranking"] = measure(
+        lambda: rank_resumes(resume_skills, jd_skills, jd["mandatory_skills"], jd_fit, candidates, top_k=10),
+        len(resume_skills), repeats, cycles=20,
+    )
+
+    jd_texts = [j["text"] for j in jds]
+    results["experience_rules"] = measure(lambda: [extract_experience(t) for t in jd_texts], len(jds), repeats, cycles=50)
+    rule_answers = [extract_experience(t)[0] for t in jd_texts]
+    stated = [j for j in jds if j["states_experience"]]
+    results["experience_rules"]["answered_by_rules"] = sum(years is not None for years in rule_answers) / len(jds)
+    results["experience_rules"]["accuracy_when_stated"] = (
+        sum(years == j["min_experience"] for years, j in zip(rule_answers, jds) if j["states_experience"]) / len(stated)
+        if stated else None
+    )
+
+    def end_to_end():
+        for resume, candidate in zip(resumes, candidates):
+            text = extract_text_from_pdf(resume["pdf"])
+            analysis = analyze_skills(jd_skills, extract_skills_from_text(text), jd["mandatory_skills"])
+            get_final_fit(analysis, jd_fit, candidate)
+
+    results["end_to_end"] = measure(end_to_end, len(resumes), repeats)
+
+    # One profiled pass for the per-stage breakdown of the end-to-end run
+    was_enabled = profiling.enabled()
+    profiling.profiler.reset()
+    profiling.enable(True)
+    try:
+        end_to_end()
+    finally:
+        profiling.enable(was_enabled)
+    results["end_to_end"]["stages"] = {row["stage"]: row["total_s"] for row in profiling.profiler.summary()}
+
+    # Extraction quality on the planted skills, so a faster but lossy change shows up
+    planted = sum(len(r["skills"]) for r in resumes)
+    recalled = sum(len(set(r["skills"]) & {s.lower() for s in found}) for r, found in zip(resumes, resume_skills))
+    results["skill_extraction"]["planted_skill_recall"] = recalled / planted if planted else None
+    recalled = sum(len(set(r["skills"]) & {s.lower() for s in found}) for r, found in zip(resumes, fuzzy_skills))
+    results["skill_extraction_fuzzy"]["planted_skill_recall"] = recalled / planted if planted else None
+
+    if llm:
+        from llm_analyzer import find_mandatory_skills_with_llm, find_experience_with_llm, find_experience
+        jd_skill_lists = [extract_skills_from_text(j["text"]) for j in jds]
+        results["zero_shot"] = measure(
+            lambda: [find_mandatory_skills_with_llm(j["text"], skills) for j, skills in zip(jds, jd_skill_lists)],
+            len(jds), repeats,
+        )
+        results["experience_qa"] = measure(lambda: [find_experience_with_llm(t) for t in jd_texts], len(jds), repeats)
+        results["experience_hybrid"] = measure(lambda: [find_experience(t) for t in jd_texts], len(jds), repeats)
+    return results
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """Returns (name, baseline ms/item, current ms/item, ratio) for every regression (best times)."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        ratio = current["best_per_item_ms"] / previous["best_per_item_ms"]
+        if ratio > 1 + tolerance:
+            regressions.append((name, previous["best_per_item_ms"], current["best_per_item_ms"], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(SIZES), default="small")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--llm", action="store_true", help="Also benchmark the zero-shot and QA models")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against this results file")
+    parser.add_argument("--save-baseline", help="Write results to this path as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs. baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(seed=args.seed, **SIZES[args.size])
+    results = run_suite(corpus, args.repeats, args.llm)
+    report = {
+        "meta": {
+            "size": args.size,
+            "seed": args.seed,
+            "repeats": args.repeats,
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+    print(f"size={args.size} resumes={len(corpus['resumes'])} repeats={args.repeats}")
+    print(f"{'benchmark':<26} {'items':>6} {'median (s)':>11} {'ms/item':>9} {'items/s':>9}")
+    for name, result in results.items():
+        print(f"{name:<26} {result['items']:>6} {result['median_s']:>11.4f} {result['per_item_ms']:>9.3f} {result['items_per_s']:>9.1f}")
+    recall = results["skill_extraction"]["planted_skill_recall"]
+    if recall is not None:
+        print(f"planted skill recall: {recall:.1%} exact, {results['skill_extraction_fuzzy']['planted_skill_recall']:.1%} with fuzzy matching")
+    experience = results["experience_rules"]
+    print(f"experience answered by rules: {experience['answered_by_rules']:.1%} of JDs"
+          + (f", {experience['accuracy_when_stated']:.1%} correct where stated" if experience["accuracy_when_stated"] is not None else ""))
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("size") != args.size:
+            print(f"Baseline was recorded with --size {baseline.get('meta', {}).get('size')}; not comparing.")
+            return 2
+        regressions = compare(results, baseline, args.tolerance)
+        for name, before, after, ratio in regressions:
+            print(f"REGRESSION {name}: {before:.4f} -> {after:.4f} ms/item ({ratio - 1:+.0%})")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Mandatory-skill classification throughput (JD/sec) on CPU: the default zero-shot
+pipeline vs. classify_zero_shot_batched, with and without int8 dynamic quantization.
+Also reports how many NLI forward passes each mode needs and the largest score
+difference from the pipeline.
+
+Run from the repository root:
+    python -m benchmarks.zero_shot [--jds 5] [--model valhalla/distilbart-mnli-12-3]
+"""
+import argparse
+import random
+import time
+
+import llm_analyzer
+from skill_extractor import SKILLS_DB, extract_skills_from_text
+
+LABELS = ["this is a required skill", "this is an optional skill"]
+TEMPLATES = [
+    "Must have {n}+ years of experience with {a} and {b}.",
+    "Strong hands-on knowledge of {a}, {b} and {c} is required.",
+    "Nice to have: exposure to {a} or {b}.",
+    "Familiarity with {a} is a plus.",
+    "You will build services using {a}, {b}, {c} and {d}.",
+]
+
+
+def make_jd(rng):
+    lines = ["About the role", "We are hiring a backend engineer to join our platform team."]
+    for _ in range(rng.randint(6, 12)):
+        a, b, c, d = rng.sample(SKILLS_DB, 4)
+        lines.append(rng.choice(TEMPLATES).format(n=rng.randint(2, 8), a=a, b=b, c=c, d=d))
+    return "\n".join(lines)
+
+
+def contexts_for(jd_text):
+    skills = extract_skills_from_text(jd_text)
+    contexts = llm_analyzer.skill_contexts(jd_text, skills)
+    return [lines[0] for lines in contexts.values()]
+
+
+def run(jds, classify):
+    start = time.perf_counter()
+    results = [classify(contexts_for(jd)) for jd in jds]
+    return results, time.perf_counter() - start
+
+
+def max_score_diff(expected, actual):
+    diff = 0.0
+    for exp_jd, act_jd in zip(expected, actual):
+        for exp, act in zip(exp_jd, act_jd):
+            exp_scores = dict(zip(exp['labels'], exp['scores']))
+            act_scores = dict(zip(act['labels'], act['scores']))
+            diff = max(diff, max(abs(exp_scores[label] - act_scores[label]) for label in LABELS))
+    return diff
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jds", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=llm_analyzer.ZERO_SHOT_BATCH_SIZE)
+    parser.add_argument("--model", default=llm_analyzer.ZERO_SHOT_MODEL, help="NLI model for the batched modes")
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    jds = [make_jd(rng) for _ in range(args.jds)]
+    pairs = sum(len(contexts_for(jd)) for jd in jds) * len(LABELS)
+    unique_pairs = sum(len(set(contexts_for(jd))) for jd in jds) * len(LABELS)
+
+    # Warm up model loading so it is not counted
+    llm_analyzer.get_classifier()
+    llm_analyzer.get_nli_model(args.model, False)
+    llm_analyzer.get_nli_model(args.model, True)
+
+    baseline, baseline_time = run(jds, lambda ctx: llm_analyzer.get_classifier()(ctx, LABELS, multi_label=False) if ctx else [])
+    print(f"{'mode':<28} {'JD/s':>8} {'NLI pairs':>10} {'max |dscore|':>13}")
+    print(f"{'pipeline (bart-large-mnli)':<28} {len(jds) / baseline_time:>8.3f} {pairs:>10}")
+
+    for quantize in (False, True):
+        results, elapsed = run(jds, lambda ctx: llm_analyzer.classify_zero_shot_batched(
+            ctx, LABELS, batch_size=args.batch_size, model_name=args.model, quantize=quantize) if ctx else [])
+        name = "batched" + (" + int8" if quantize else "")
+        print(f"{name:<28} {len(jds) / elapsed:>8.3f} {unique_pairs:>10} {max_score_diff(baseline, results):>13.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Headless bulk screening: score a directory or zip of PDF resumes against one JD.
+
+Example:
+    python bulk_screen.py --jd jd.txt --resumes resumes/ --mandatory "Python, Docker" \\
+        --min-experience 3 --max-ctc 150000 --output results.csv
+
+Results are appended to the output file (CSV or JSONL, picked by extension) as
+each resume finishes. Re-running with --resume skips resumes already present in
+the output, so an interrupted run can be continued. Resumes whose row is an error
+are processed again, and that row is removed from the output first.
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+import zipfile
+
+from analysis import analyze_skills, get_final_fit
+from resume_worker import init_worker, process_resume
+
+
+def list_resumes(path):
+    """Returns (name, source) pairs for every PDF in a directory tree or zip archive."""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            return [(member, (path, member)) for member in sorted(zf.namelist()) if member.lower().endswith('.pdf')]
+    resumes = []
+    for root, _, files in os.walk(path):
+        for filename in sorted(files):
+            if filename.lower().endswith('.pdf'):
+                full_path = os.path.join(root, filename)
+                resumes.append((os.path.relpath(full_path, path), full_path))
+    return sorted(resumes)
+
+
+def load_jd_text(jd):
+    if jd.startswith(("http://", "https://")):
+        from job_scraper import scrape_job_description
+        text = scrape_job_description(jd)
+        if text.startswith("Error:"):
+            raise SystemExit(text)
+        return text
+    with open(jd, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def load_candidate_details(path):
+    """Reads a CSV with columns file, total_experience, expected_ctc."""
+    details = {}
+    if path:
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                details[row['file']] = {
+                    "total_experience": float(row['total_experience']),
+                    "expected_ctc": float(row['expected_ctc']),
+                }
+    return details
+
+
+class ResultWriter:
+    """Appends result rows to a CSV or JSONL file and remembers which files are done."""
+
+    FIELDS = [
+        "file", "fit_status", "final_score", "explanation", "skill_fit_percent",
+        "matched_mandatory", "missing_mandatory", "matched_non_mandatory", "missing_non_mandatory",
+        "bonus_skills", "error",
+    ]
+
+    def __init__(self, path, resume):
+        self.path = path
+        self.is_jsonl = path.lower().endswith(('.jsonl', '.json'))
+        self.done = set()
+        exists = resume and os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            truncated = not self._ends_with_newline(path)
+            with open(path, newline='', encoding='utf-8') as f:
+                rows = list(self._read_jsonl(f) if self.is_jsonl else csv.DictReader(f))
+            if truncated and not self.is_jsonl:
+                # A cut-off CSV row still parses, with a partial fit_status
+                rows = rows[:-1]
+            # Errors may be transient, so those files are tried again; their old rows are
+            # dropped so a file keeps a single row however many runs it takes
+            kept = [row for row in rows if row.get('fit_status') not in (None, '', 'Error')]
+            self.done = {row['file'] for row in kept}
+            if truncated or len(kept) != len(rows):
+                self._rewrite(kept)
+        mode = 'a' if resume else 'w'
+        self._file = open(path, mode, newline='', encoding='utf-8')
+        if not self.is_jsonl:
+            self._csv = csv.DictWriter(self._file, fieldnames=self.FIELDS)
+            if not exists:
+                self._csv.writeheader()
+
+    def _rewrite(self, rows):
+        """Replaces the output with `rows` through a temp file, so a crash keeps the old one."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+            if self.is_jsonl:
+                f.writelines(json.dumps(row) + "\n" for row in rows)
+            else:
+                writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+                writer.writeheader()
+                writer.writerows(rows)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _read_jsonl(f):
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # The partial last line of an interrupted run (or a blank one)
+                continue
+
+    @staticmethod
+    def _ends_with_newline(path):
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def write(self, row):
+        if self.is_jsonl:
+            self._file.write(json.dumps(row) + "\n")
+        else:
+            self._csv.writerow({k: "; ".join(v) if isinstance(v, list) else v for k, v in row.items()})
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def score_resume(name, resume_skills, error, jd_skills, mandatory_skills, jd_data, candidate_data):
+    if error is not None:
+        return {"file": name, "fit_status": "Error", "final_score": 0, "error": error}
+    skill_analysis = analyze_skills(jd_skills, resume_skills, mandatory_skills)
+    final_score, explanation, details = get_final_fit(skill_analysis, jd_data, candidate_data)
+    return {
+        "file": name,
+        "fit_status": details['fit_status'],
+        "final_score": final_score,
+        "explanation": explanation,
+        "skill_fit_percent": details['skill_fit_percent'],
+        "matched_mandatory": sorted(details['matched_mandatory']),
+        "missing_mandatory": sorted(details['missing_mandatory']),
+        "matched_non_mandatory": sorted(details['matched_non_mandatory']),
+        "missing_non_mandatory": sorted(details['missing_non_mandatory']),
+        "bonus_skills": sorted(details['bonus_skills']),
+        "error": None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jd", required=True, help="Path to a JD text file, or a job posting URL")
+    parser.add_argument("--resumes", required=True, help="Directory or .zip of PDF resumes")
+    parser.add_argument("--output", required=True, help="Results file (.csv or .jsonl)")
+    parser.add_argument("--mandatory", default="", help="Comma-separated mandatory skills")
+    parser.add_argument("--min-experience", type=float, default=0)
+    parser.add_argument("--max-ctc", type=float, default=0)
+    parser.add_argument("--candidates", help="CSV with file, total_experience, expected_ctc per resume")
+    parser.add_argument("--default-experience", type=float, default=0)
+    parser.add_argument("--default-ctc", type=float, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-pages", type=int, default=100)
+    parser.add_argument("--max-mb", type=float, default=20)
+    parser.add_argument("--resume", action="store_true", help="Skip resumes already in the output file")
+    args = parser.parse_args(argv)
+
+    from skill_extractor import extract_skills_from_text
+
+    jd_skills = extract_skills_from_text(load_jd_text(args.jd))
+    mandatory_skills = [skill.strip() for skill in args.mandatory.split(',') if skill.strip()]
+    jd_data = {"min_experience": args.min_experience, "max_ctc": args.max_ctc}
+    candidate_details = load_candidate_details(args.candidates)
+    default_candidate = {"total_experience": args.default_experience, "expected_ctc": args.default_ctc}
+
+    writer = ResultWriter(args.output, args.resume)
+    resumes = [(name, source) for name, source in list_resumes(args.resumes) if name not in writer.done]
+    max_bytes = int(args.max_mb * 1024 * 1024)
+    tasks = [(name, source, args.max_pages, max_bytes) for name, source in resumes]
+    print(f"JD skills: {', '.join(sorted(jd_skills))}", file=sys.stderr)
+    print(f"{len(tasks)} resumes to process ({len(writer.done)} already done)", file=sys.stderr)
+
+    start = time.perf_counter()
+    processed = 0
+    try:
+        with multiprocessing.Pool(args.workers, initializer=init_worker) as pool:
+            for name, resume_skills, error in pool.imap_unordered(process_resume, tasks, chunksize=4):
+                candidate = candidate_details.get(name, default_candidate)
+                writer.write(score_resume(name, resume_skills, error, jd_skills, mandatory_skills, jd_data, candidate))
+                processed += 1
+                if processed % 100 == 0:
+                    elapsed = time.perf_counter() - start
+                    print(f"{processed}/{len(tasks)} resumes, {processed / elapsed:.1f} docs/sec", file=sys.stderr)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    rate = processed / elapsed if elapsed else 0.0
+    print(f"Done: {processed} resumes in {elapsed:.1f}s ({rate:.1f} docs/sec) -> {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+import os
+import mmap
+import time
+import pickle
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+from resume_parser import extract_text_from_pdf
+from job_scraper import scrape_job_description
+from skill_extractor import extract_skills_from_text, find_skill_spans, extraction_version
+
+
+def content_hash(data):
+    """SHA-256 hex digest of bytes or text."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+# One connection and lock per SQLite file, shared by every ContentCache stored in it
+_disk_connections = {}
+_disk_connections_lock = threading.Lock()
+
+
+def _open_disk(path):
+    """Returns the (connection, lock) pair for a SQLite cache file, opening it once per process."""
+    path = os.path.abspath(path)
+    with _disk_connections_lock:
+        if path not in _disk_connections:
+            _disk_connections[path] = (sqlite3.connect(path, check_same_thread=False), threading.RLock())
+        return _disk_connections[path]
+
+
+class ContentCache:
+    """
+    Two-tier cache keyed by (namespace, content hash).
+
+    The memory tier is an LRU holding at most `max_entries` values. The optional disk
+    tier is a SQLite file capped at `max_disk_bytes`; when it grows past the cap the
+    least recently used rows are evicted. With `ttl_seconds`, entries older than that
+    are treated as misses in both tiers. Values must be picklable.
+
+    Caches sharing a SQLite file share its connection and lock, and each keeps its
+    rows in its own `table`, so clear(), stats() and eviction only see that cache.
+    """
+
+    def __init__(self, max_entries=256, disk_path=None, max_disk_bytes=256 * 1024 * 1024, ttl_seconds=None,
+                 table="cache"):
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self._memory = OrderedDict()
+        self._created = {}
+        self._lock = threading.Lock()
+        self._disk = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table!r}")
+        self._table = table
+        if disk_path:
+            self._disk, self._lock = _open_disk(disk_path)
+            with self._lock:
+                self._disk.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL, "
+                    "created REAL NOT NULL DEFAULT 0)"
+                )
+                columns = {row[1] for row in self._disk.execute(f"PRAGMA table_info({table})")}
+                if "created" not in columns:
+                    # Cache files written before TTL support
+                    self._disk.execute(f"ALTER TABLE {table} ADD COLUMN created REAL NOT NULL DEFAULT 0")
+                self._disk.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed)")
+                self._disk.commit()
+
+    @staticmethod
+    def make_key(namespace, content, version=""):
+        return f"{namespace}:{version}:{content_hash(content)}"
+
+    def _expired(self, created, now):
+        return self.ttl_seconds is not None and now - created > self.ttl_seconds
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            if key in self._memory and not self._expired(self._created[key], now):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+            if self._disk is not None:
+                row = self._disk.execute(f"SELECT value, created FROM {self._table} WHERE key = ?", (key,)).fetchone()
+                if row is not None and self._expired(row[1], now):
+                    self._disk.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+                    self._disk.commit()
+                elif row is not None:
+                    self._disk.execute(f"UPDATE {self._table} SET accessed = ? WHERE key = ?", (now, key))
+                    self._disk.commit()
+                    value = pickle.loads(row[0])
+                    self._remember(key, value, row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._disk is not None:
+                blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                self._disk.execute(
+                    f"INSERT OR REPLACE INTO {self._table} (key, value, size, accessed, created) VALUES (?, ?, ?, ?, ?)",
+                    (key, blob, len(blob), now, now),
+                )
+                self._evict_disk()
+                self._disk.commit()
+
+    def get_or_compute(self, namespace, content, compute, version="", should_cache=None):
+        """
+        Returns the cached value for `content`, calling `compute()` on a miss.
+        `should_cache(value)` can veto caching of e.g. error results.
+        """
+        key = self.make_key(namespace, content, version)
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            if should_cache is None or should_cache(value):
+                self.set(key, value)
+        return value
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+        if self._disk is not None:
+            with self._lock:
+                count, size = self._disk.execute(f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self._table}").fetchone()
+            stats.update({"disk_entries": count, "disk_bytes": size})
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._created.clear()
+            if self._disk is not None:
+                self._disk.execute(f"DELETE FROM {self._table}")
+                self._disk.commit()
+
+    def _remember(self, key, value, created):
+        self._memory[key] = value
+        self._created[key] = created
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            evicted, _ = self._memory.popitem(last=False)
+            del self._created[evicted]
+
+    def _evict_disk(self):
+        total = self._disk.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self._table}").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        for key, size in self._disk.execute(f"SELECT key, size FROM {self._table} ORDER BY accessed").fetchall():
+            self._disk.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_disk_bytes:
+                break
+
+
+# Process-wide cache. Set CACHE_DB_PATH to also persist entries to a SQLite file.
+default_cache = ContentCache(
+    max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "256")),
+    disk_path=os.getenv("CACHE_DB_PATH"),
+    max_disk_bytes=int(os.getenv("CACHE_MAX_DISK_MB", "256")) * 1024 * 1024,
+)
+
+# Scraped JDs are keyed by URL, not content, so they expire: an edited posting is
+# fetched again after JD_CACHE_TTL_MINUTES. Stored in its own table of the same SQLite file.
+scrape_cache = ContentCache(
+    max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "256")),
+    disk_path=os.getenv("CACHE_DB_PATH"),
+    max_disk_bytes=int(os.getenv("CACHE_MAX_DISK_MB", "256")) * 1024 * 1024,
+    ttl_seconds=float(os.getenv("JD_CACHE_TTL_MINUTES", "60")) * 60,
+    table="jd_scrape_cache",
+)
+
+
+def cached_extract_text_from_pdf(file_bytes, max_pages=None, max_bytes=None, cache=default_cache):
+    """
+    extract_text_from_pdf, keyed by the hash of the PDF bytes. A file path is keyed by
+    the file's contents, so a file edited in place is read again. Failed reads are not cached.
+    """
+    extract = lambda: extract_text_from_pdf(file_bytes, max_pages=max_pages, max_bytes=max_bytes)
+    get_or_compute = lambda content: cache.get_or_compute(
+        "pdf_text", content, extract, version=f"{max_pages}:{max_bytes}",
+        should_cache=lambda text: text is not None,
+    )
+    if isinstance(file_bytes, (bytes, bytearray, memoryview)):
+        return get_or_compute(file_bytes)
+    if os.path.getsize(file_bytes) == 0:
+        # Empty files cannot be memory-mapped; extract_text_from_pdf reports them
+        return extract()
+    with open(file_bytes, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as contents:
+        return get_or_compute(contents)
+
+
+def cached_scrape_job_description(url, cache=scrape_cache):
+    """scrape_job_description, keyed by the URL, for up to JD_CACHE_TTL_MINUTES. Error messages are not cached."""
+    return cache.get_or_compute(
+        "jd_scrape", url, lambda: scrape_job_description(url),
+        should_cache=lambda text: not text.startswith("Error:"),
+    )
+
+
+def cached_extract_skills_from_text(text, cache=default_cache):
+    """extract_skills_from_text, keyed by the text, the skills DB version and the fuzzy matching setup."""
+    return cache.get_or_compute(
+        "skills", text, lambda: extract_skills_from_text(text), version=extraction_version(),
+    )
+
+
+def cached_find_skill_spans(text, cache=default_cache):
+    """find_skill_spans, keyed by the text and the skills DB version. The skills are {s for s, _, _ in spans}."""
+    return cache.get_or_compute(
+        "skill_spans", text, lambda: find_skill_spans(text), version=extraction_version(),
+    )
@@ -0,0 +1,216 @@
+import json
+import os
+import numpy as np
+
+from batch_analysis import combine_fit_scores, rank_candidates
+from taxonomy import get_taxonomy
+
+
+def _contains_sorted(haystack, needles):
+    """Boolean mask of which `needles` occur in the sorted array `haystack`."""
+    if len(haystack) == 0 or len(needles) == 0:
+        return np.zeros(len(needles), dtype=bool)
+    positions = np.searchsorted(haystack, needles)
+    np.minimum(positions, len(haystack) - 1, out=positions)
+    return haystack[positions] == needles
+
+
+class CandidateIndex:
+    """
+    Persistent store of candidate profiles with an inverted index from skill to the
+    sorted array of candidate IDs that have it (a CSR layout: one `postings` array
+    plus per-skill `offsets`).
+
+    A query answers "who fits this JD?" without touching non-matching candidates:
+    mandatory-skill gating is an intersection of posting lists, and non-mandatory
+    coverage is a count over the surviving IDs. Scores and ranking come from
+    batch_analysis, so results match analyze_skills + get_final_fit.
+
+    New candidates are buffered and merged into the postings on commit() (called
+    automatically by query and save). Candidate IDs are assigned sequentially.
+    Skill IDs start out as the skills taxonomy's IDs, and aliases resolve to their
+    canonical skill; skills outside the taxonomy are appended.
+    """
+
+    def __init__(self, taxonomy=None):
+        taxonomy = taxonomy if taxonomy is not None else get_taxonomy()
+        self.skills = [name.lower() for name in taxonomy.names]
+        self.skill_ids = taxonomy.lookup_table()
+        self.names = []
+        self.experience = np.empty(0, dtype=np.float64)
+        self.expected_ctc = np.empty(0, dtype=np.float64)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.postings = np.empty(0, dtype=np.uint32)
+        self._pending = {}
+        self._pending_experience = []
+        self._pending_ctc = []
+
+    def __len__(self):
+        return len(self.names)
+
+    def _skill_id(self, skill):
+        key = skill.lower()
+        if key not in self.skill_ids:
+            self.skill_ids[key] = len(self.skills)
+            self.skills.append(key)
+        return self.skill_ids[key]
+
+    def add_candidate(self, name, skills, total_experience, expected_ctc):
+        """Adds one candidate profile and returns its ID."""
+        candidate_id = len(self.names)
+        self.names.append(name)
+        self._pending_experience.append(total_experience)
+        self._pending_ctc.append(expected_ctc)
+        for skill_id in {self._skill_id(skill) for skill in skills}:
+            self._pending.setdefault(skill_id, []).append(candidate_id)
+        return candidate_id
+
+    def add_skill_matrix(self, matrix, vocabulary, experiences, expected_ctcs, names=None):
+        """
+        Bulk-adds candidates from a batch_analysis.SkillVocabulary-encoded matrix,
+        building each posting list with one column scan instead of per-candidate work.
+        """
+        first_id = len(self.names)
+        count = matrix.shape[0]
+        self.names.extend(names if names is not None else [str(first_id + i) for i in range(count)])
+        self._pending_experience.extend(np.asarray(experiences, dtype=float).tolist())
+        self._pending_ctc.extend(np.asarray(expected_ctcs, dtype=float).tolist())
+        for col, skill in enumerate(vocabulary.skills[:matrix.shape[1]]):
+            ids = np.flatnonzero(matrix[:, col])
+            if len(ids):
+                self._pending.setdefault(self._skill_id(skill), []).extend((ids + first_id).tolist())
+
+    def commit(self):
+        """Merges buffered candidates into the posting lists."""
+        if not self._pending_experience:
+            return
+        pieces, offsets = [], [0]
+        for skill_id in range(len(self.skills)):
+            committed = self._committed_postings(skill_id)
+            # Pending IDs are all larger than committed ones, so appending keeps lists sorted
+            pending = np.asarray(self._pending.get(skill_id, ()), dtype=np.uint32)
+            pieces.extend([committed, pending])
+            offsets.append(offsets[-1] + len(committed) + len(pending))
+        self.postings = np.concatenate(pieces) if pieces else np.empty(0, dtype=np.uint32)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.experience = np.concatenate([self.experience, np.asarray(self._pending_experience, dtype=np.float64)])
+        self.expected_ctc = np.concatenate([self.expected_ctc, np.asarray(self._pending_ctc, dtype=np.float64)])
+        self._pending = {}
+        self._pending_experience = []
+        self._pending_ctc = []
+
+    def _committed_postings(self, skill_id):
+        if skill_id + 1 >= len(self.offsets):
+            return np.empty(0, dtype=np.uint32)
+        return self.postings[self.offsets[skill_id]:self.offsets[skill_id + 1]]
+
+    def posting_list(self, skill):
+        """Sorted candidate IDs that have `skill` (empty if the skill is unknown)."""
+        return self._posting(self.skill_ids.get(skill.lower()))
+
+    def _posting(self, key):
+        if not isinstance(key, int):
+            return np.empty(0, dtype=np.uint32)
+        return self._committed_postings(key)
+
+    def _query_keys(self, skills):
+        """Skill IDs of a query's skills; unknown skills stay as distinct lowercased names."""
+        return {self.skill_ids.get(skill.lower(), skill.lower()) for skill in skills}
+
+    def _bitmap(self, posting):
+        bitmap = np.zeros(len(self), dtype=bool)
+        bitmap[posting] = True
+        return bitmap
+
+    def query(self, jd_skills, mandatory_skills, jd, top_k=10, weights=None):
+        """
+        Ranks stored candidates against a JD. Returns the top_k candidates that have
+        every mandatory skill, as rank_candidates dicts plus "candidate_id" and "name".
+        """
+        self.commit()
+        mandatory_keys = self._query_keys(mandatory_skills)
+        non_mandatory_keys = self._query_keys(jd_skills) - mandatory_keys
+
+        n = len(self)
+
+        # Mandatory gate: intersect posting lists, smallest first. Large lists are
+        # intersected as bitmaps, small ones by binary search.
+        if mandatory_keys:
+            lists = sorted((self._posting(key) for key in mandatory_keys), key=len)
+            if len(lists[0]) * 16 > n:
+                mask = self._bitmap(lists[0])
+                for posting in lists[1:]:
+                    mask &= self._bitmap(posting)
+                survivors = np.flatnonzero(mask)
+            else:
+                survivors = lists[0]
+                for posting in lists[1:]:
+                    if not len(survivors):
+                        break
+                    survivors = survivors[_contains_sorted(posting, survivors)]
+            everyone = False
+        else:
+            survivors = np.arange(n)
+            everyone = True
+
+        # Non-mandatory coverage over the survivors only
+        if len(survivors) * 16 > n:
+            # Many survivors: count into a dense array, then gather
+            counts = np.zeros(n, dtype=np.int32)
+            for key in non_mandatory_keys:
+                counts[self._posting(key)] += 1
+            matched = counts if everyone else counts[survivors]
+        else:
+            matched = np.zeros(len(survivors), dtype=np.int32)
+            for key in non_mandatory_keys:
+                matched += _contains_sorted(self._posting(key), survivors)
+
+        if everyone:
+            experience, expected_ctc = self.experience, self.expected_ctc
+        else:
+            experience, expected_ctc = self.experience[survivors], self.expected_ctc[survivors]
+        scores = combine_fit_scores(
+            np.zeros(len(survivors), dtype=np.int32), matched, len(non_mandatory_keys), jd,
+            experience, expected_ctc, weights,
+        )
+        results = rank_candidates(scores, top_k)
+        for result in results:
+            candidate_id = int(survivors[result.pop("index")])
+            result["candidate_id"] = candidate_id
+            result["name"] = self.names[candidate_id]
+        return results
+
+    def save(self, directory):
+        """Writes the index as .npy arrays plus JSON skill and name tables."""
+        self.commit()
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "postings.npy"), self.postings)
+        np.save(os.path.join(directory, "offsets.npy"), self.offsets)
+        np.save(os.path.join(directory, "experience.npy"), self.experience)
+        np.save(os.path.join(directory, "expected_ctc.npy"), self.expected_ctc)
+        with open(os.path.join(directory, "skills.json"), 'w') as f:
+            json.dump(self.skills, f)
+        with open(os.path.join(directory, "names.json"), 'w') as f:
+            json.dump(self.names, f)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Loads a saved index. With mmap=True the arrays are memory-mapped, not read."""
+        index = cls()
+        mmap_mode = 'r' if mmap else None
+        index.postings = np.load(os.path.join(directory, "postings.npy"), mmap_mode=mmap_mode)
+        index.offsets = np.load(os.path.join(directory, "offsets.npy"), mmap_mode=mmap_mode)
+        index.experience = np.load(os.path.join(directory, "experience.npy"), mmap_mode=mmap_mode)
+        index.expected_ctc = np.load(os.path.join(directory, "expected_ctc.npy"), mmap_mode=mmap_mode)
+        with open(os.path.join(directory, "skills.json"), 'r') as f:
+            index.skills = json.load(f)
+        index.skill_ids = {skill: i for i, skill in enumerate(index.skills)}
+        # Aliases map to their canonical skill's ID in this index, whatever order it was built in
+        names = get_taxonomy().names
+        for key, skill_id in get_taxonomy().lookup_table().items():
+            canonical = index.skill_ids.get(names[skill_id].lower())
+            if canonical is not None:
+                index.skill_ids.setdefault(key, canonical)
+        with open(os.path.join(directory, "names.json"), 'r') as f:
+            index.names = json.load(f)
+        return index
@@ -1,31 +1,46 @@
 import os
+import json
+import hashlib
+import datetime
+import threading
 import pymongo
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
 from dotenv import load_dotenv
+from model_loader import lazy_resource
 
 # Load environment variables from .env file
 load_dotenv()
 
-def connect_to_mongo():
+DATABASE_NAME = 'JobFitPoC'
+
+def _create_client():
     """
-    Establishes a connection to the MongoDB Atlas cluster.
-    Returns the database object if successful, None otherwise.
+    Creates the process-wide MongoClient. The client owns a connection pool and is
+    thread-safe, so it is created (and pinged) once and shared by every caller. The
+    indexes are ensured here too: if that fails the client is not kept, and the next
+    connect_to_mongo() tries again.
     """
     mongo_uri = os.getenv("MONGO_URI")
-    
     if not mongo_uri:
-        print("MONGO_URI not found in environment variables.")
-        return None
-        
+        raise pymongo.errors.ConfigurationError("MONGO_URI not found in environment variables.")
+    client = pymongo.MongoClient(mongo_uri, maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "50")))
+    # Ping the server to confirm a successful connection
+    client.admin.command('ping')
+    print("Successfully connected to MongoDB Atlas!")
+    ensure_indexes(client[DATABASE_NAME])
+    return client
+
+_client = lazy_resource("mongo_client", _create_client)
+
+def connect_to_mongo():
+    """
+    Returns the database object backed by the shared, pooled client if the
+    connection succeeds, None otherwise. Indexes are created on first connection.
+    """
     try:
-        client = pymongo.MongoClient(mongo_uri)
-        # Ping the server to confirm a successful connection
-        client.admin.command('ping')
-        print("Successfully connected to MongoDB Atlas!")
-        
-        # Select your database (it will be created if it doesn't exist)
-        db = client['JobFitPoC']
-        return db
-        
+        return _client.get()[DATABASE_NAME]
+
     except pymongo.errors.ConfigurationError as e:
         print(f"Configuration Error: Could not connect to MongoDB. Check your connection string. Details: {e}")
         return None
@@ -36,26 +51,151 @@ def connect_to_mongo():
         print(f"An unexpected error occurred: {e}")
         return None
 
-def save_analysis_data(db, job_description, candidate_profile, analysis_result):
+def ensure_indexes(db):
     """
-    Saves the JD, candidate profile, and analysis result to MongoDB.
+    Declares the indexes used for de-duplication and candidate/JD lookups. The unique
+    content_hash indexes are sparse: documents saved before content hashing have no
+    content_hash and would otherwise collide on null.
+    """
+    db['job_descriptions'].create_index('content_hash', unique=True, sparse=True)
+    db['candidate_profiles'].create_index('content_hash', unique=True, sparse=True)
+    db['analyses'].create_index([('jd_hash', pymongo.ASCENDING), ('final_score', pymongo.DESCENDING)])
+    db['analyses'].create_index([('candidate_hash', pymongo.ASCENDING), ('created_at', pymongo.DESCENDING)])
+
+def document_hash(document):
+    """Content hash of a document, independent of key order."""
+    canonical = json.dumps(document, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def _analysis_operations(job_description, candidate_profile, analysis_result, final_score=None):
+    """Builds the upserts for the JD and candidate plus the insert for the analysis."""
+    now = datetime.datetime.now(datetime.timezone.utc)
+    jd_hash = document_hash(job_description)
+    candidate_hash = document_hash(candidate_profile)
+    upsert = lambda doc, content_hash: UpdateOne(
+        {'content_hash': content_hash},
+        {'$setOnInsert': {**doc, 'created_at': now}, '$set': {'last_seen': now}},
+        upsert=True,
+    )
+    analysis = {
+        'jd_hash': jd_hash,
+        'candidate_hash': candidate_hash,
+        'fit_status': analysis_result.get('fit_status'),
+        'final_score': final_score,
+        'result': analysis_result,
+        'created_at': now,
+    }
+    return {
+        'job_descriptions': (jd_hash, upsert(job_description, jd_hash)),
+        'candidate_profiles': (candidate_hash, upsert(candidate_profile, candidate_hash)),
+        'analyses': (None, InsertOne(analysis)),
+    }
+
+def _bulk_write(db, collection, operations):
+    try:
+        db[collection].bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        # Concurrent upserts of the same new hash can race on the unique index; the
+        # document exists either way, so duplicate-key errors are safe to ignore.
+        errors = [err for err in e.details.get('writeErrors', []) if err.get('code') != 11000]
+        if errors:
+            raise
+
+def save_analysis_data(db, job_description, candidate_profile, analysis_result, final_score=None):
+    """
+    Saves the JD, candidate profile, and analysis result to MongoDB. The JD and
+    candidate are upserted by content hash, so repeated analyses do not duplicate them.
     """
     if db is None:
         print("Database connection is not available. Cannot save data.")
         return False
-        
+
     try:
-        # Get collections (they will be created if they don't exist)
-        jd_collection = db['job_descriptions']
-        candidate_collection = db['candidate_profiles']
-        
-        # Insert the documents
-        jd_collection.insert_one(job_description)
-        candidate_collection.insert_one(candidate_profile)
-        
-        print("Job Description and Candidate Profile saved successfully.")
+        for collection, (_, operation) in _analysis_operations(job_description, candidate_profile, analysis_result, final_score).items():
+            _bulk_write(db, collection, [operation])
+
+        print("Job Description, Candidate Profile and Analysis saved successfully.")
         return True
-        
+
     except Exception as e:
         print(f"An error occurred while saving data to MongoDB: {e}")
-        return False
\ No newline at end of file
+        return False
+
+class BulkWriter:
+    """
+    Buffers analysis writes and sends them as unordered bulk_write batches, one per
+    collection. A batch is flushed when `batch_size` analyses are buffered, every
+    `flush_interval` seconds from a background thread, and on close(). JDs and
+    candidates already queued in the current batch are not queued again. A failed
+    flush keeps the batch buffered, so the next flush retries it.
+
+    Use as a context manager: `with BulkWriter(db) as writer: writer.save_analysis(...)`.
+    """
+
+    def __init__(self, db, batch_size=1000, flush_interval=1.0):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._reset()
+        self.written = 0
+        self._closed = threading.Event()
+        self._flusher = None
+        if flush_interval:
+            self._flusher = threading.Thread(target=self._flush_periodically, name="mongo-bulk-writer", daemon=True)
+            self._flusher.start()
+
+    def _reset(self):
+        self._operations = {'job_descriptions': [], 'candidate_profiles': [], 'analyses': []}
+        self._queued_hashes = set()
+        self._pending = 0
+
+    def save_analysis(self, job_description, candidate_profile, analysis_result, final_score=None):
+        operations = _analysis_operations(job_description, candidate_profile, analysis_result, final_score)
+        with self._lock:
+            for collection, (content_hash, operation) in operations.items():
+                if content_hash is not None:
+                    if content_hash in self._queued_hashes:
+                        continue
+                    self._queued_hashes.add(content_hash)
+                self._operations[collection].append(operation)
+            self._pending += 1
+            if self._pending >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        # Parents first, so an analysis is never visible before its JD and candidate.
+        # A collection's operations are dropped only once written; after a failure the
+        # rest stay buffered for the next flush (upserts and unordered inserts whose
+        # duplicates are ignored are safe to repeat).
+        for collection in ('job_descriptions', 'candidate_profiles', 'analyses'):
+            if self._operations[collection]:
+                _bulk_write(self.db, collection, self._operations[collection])
+                self._operations[collection] = []
+        self.written += self._pending
+        self._reset()
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"An error occurred while flushing data to MongoDB: {e}")
+
+    def close(self):
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,106 @@
+import re
+from collections import namedtuple
+
+# Spelled-out numbers accepted wherever a digit count is
+NUMBER_WORDS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+    "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+    "nineteen": 19, "twenty": 20,
+}
+_NUMBER = r"(?:\d{1,2}(?:\.\d+)?|" + "|".join(sorted(NUMBER_WORDS, key=len, reverse=True)) + r")"
+
+# One pattern for every supported form, compiled once:
+#   "3+ years", "3 + yrs", "5-7 years", "two to three years", "between 3 and 5 years",
+#   "minimum of four years", "at least 5 yrs", "over 10 years", "5 or more years",
+#   "5 years or more", "a 5-year track record"
+EXPERIENCE_PATTERN = re.compile(
+    rf"""
+    (?:\b(?:at\s+least|minimum(?:\s+of)?|min\.?|over|more\s+than|between)\s+)?
+    (?<![\w.])(?P<low>{_NUMBER})
+    (?:\s*(?:-|–|—|to|and)\s*(?P<high>{_NUMBER}))?
+    \s*\+?\s*(?:or\s+more\s+)?-?\s*
+    (?:years?|yrs?)\b
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+# A match only counts when the same line mentions experience near it ("3+ years of
+# relevant experience", "Experience: 5-7 yrs")...
+# "work"/"working" alone is not enough: "we have been working in fintech for 10 years"
+# describes the company, not the requirement.
+EXPERIENCE_CONTEXT = re.compile(r"\b(?:experience[ds]?|exp)\b", re.IGNORECASE)
+# ...and it is not some other duration ("4-year degree", "2 years ago", "3 year contract")
+NOT_EXPERIENCE = re.compile(
+    r"\s*(?:'s\s+)?(?:degree|program|programme|course|college|university|bachelor|contract|ago|old|warranty)\b",
+    re.IGNORECASE,
+)
+CONTEXT_WINDOW = 80
+# The context also stops at sentence ends, so a requirement in the next sentence does not
+# vouch for a duration in this one. Needs whitespace after, so "2.5" and "Node.js" do not split.
+SENTENCE_END = re.compile(r"[.!?;](?=\s)")
+
+ExperienceMatch = namedtuple("ExperienceMatch", ["min_years", "max_years", "text", "start", "line"])
+
+
+def _to_years(token):
+    """A count as a number: int for whole years, float for e.g. "2.5 years"."""
+    if token is None:
+        return None
+    value = NUMBER_WORDS.get(token.lower())
+    if value is not None:
+        return value
+    value = float(token)
+    return int(value) if value.is_integer() else value
+
+
+def find_experience_mentions(text):
+    """
+    Returns every years-of-experience statement in the text as ExperienceMatch tuples,
+    in one left-to-right pass of the compiled pattern.
+    """
+    raw = list(EXPERIENCE_PATTERN.finditer(text))
+    mentions = []
+    for i, match in enumerate(raw):
+        line_start = text.rfind("\n", 0, match.start()) + 1
+        line_end = text.find("\n", match.end())
+        if line_end == -1:
+            line_end = len(text)
+        if NOT_EXPERIENCE.match(text, match.end()):
+            continue
+        # The context after a match stops at the next match, so "4 years ... 3 years of
+        # experience" credits only the second one
+        window_end = min(line_end, match.end() + CONTEXT_WINDOW)
+        if i + 1 < len(raw):
+            window_end = min(window_end, raw[i + 1].start())
+        sentence_end = SENTENCE_END.search(text, match.end(), window_end)
+        if sentence_end:
+            window_end = sentence_end.start()
+        before = text[max(line_start, match.start() - CONTEXT_WINDOW):match.start()]
+        before = SENTENCE_END.split(before)[-1]
+        after = text[match.end():window_end]
+        if not (EXPERIENCE_CONTEXT.search(after) or EXPERIENCE_CONTEXT.search(before)):
+            continue
+        mentions.append(ExperienceMatch(
+            min_years=_to_years(match.group("low")),
+            max_years=_to_years(match.group("high")),
+            text=match.group(0).strip(),
+            start=match.start(),
+            line=text[line_start:line_end].strip(),
+        ))
+    return mentions
+
+
+def extract_experience(text):
+    """
+    Rule-based minimum years of experience. Returns (years, mentions, status) where
+    status is "found" (all mentions agree on the minimum), "none" (no mention) or
+    "conflict" (mentions disagree, e.g. "5+ years overall, 3 years of Go"); years is
+    None unless status is "found".
+    """
+    mentions = find_experience_mentions(text)
+    minimums = {mention.min_years for mention in mentions}
+    if not minimums:
+        return None, mentions, "none"
+    if len(minimums) > 1:
+        return None, mentions, "conflict"
+    return minimums.pop(), mentions, "found"
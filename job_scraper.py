@@ -1,6 +1,10 @@
+import os
+import json
 import requests
 from bs4 import BeautifulSoup
 import re
+from urllib.parse import urlsplit
+from profiling import profiled
 
 def clean_text(text):
     """
@@ -11,69 +15,246 @@ def clean_text(text):
     # Rejoin the lines with a single newline, creating a cleaner text block
     return '\n'.join(line for line in lines if line)
 
-def scrape_job_description(url):
+# lxml is several times faster than the pure-Python html.parser; use it when installed.
+# It also enables the single-pass extractor below.
+try:
+    from lxml import etree
+    HTML_PARSER = 'lxml'
+except ImportError:
+    etree = None
+    HTML_PARSER = 'html.parser'
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Shared session so repeated scrapes reuse pooled keep-alive connections
+_session = requests.Session()
+_session.headers.update(HEADERS)
+
+# --- TIER 1: Highly Specific and Common Selectors ---
+# This list contains selectors that are very likely to be the main job description.
+# We search for these first. The list is ordered by likely relevance.
+SPECIFIC_SELECTORS = [
+    {'tag': 'div', 'attrs': {'class': re.compile(r'job-description|jobDetailsSection|job-details|description', re.I)}},
+    {'tag': 'div', 'attrs': {'id': re.compile(r'job-description|jobDetailsSection|job-details|description', re.I)}},
+    {'tag': 'div', 'attrs': {'class': 'job-post-content'}},
+]
+
+# --- TIER 2: Semantic HTML Tags ---
+# If specific selectors fail, we fall back to semantic tags which often
+# wrap the main content of a page.
+GENERIC_SELECTORS = [
+    {'tag': 'article', 'attrs': {}},
+    {'tag': 'main', 'attrs': {}},
+]
+
+def load_site_selectors(filepath=None):
     """
-    Attempts to scrape the main text content from a job posting URL using a tiered
-    search strategy for better accuracy and broader compatibility.
+    Loads per-site selector overrides from a JSON file mapping a hostname to a list
+    of selectors, e.g. {"jobs.example.com": [{"tag": "div", "id": "posting-body"}]}.
+    Each selector has a "tag" and optional "class"/"id" regular expressions (matched
+    case-insensitively). Site selectors are tried before the generic tiers.
     """
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # --- TIER 1: Highly Specific and Common Selectors ---
-        # This list contains selectors that are very likely to be the main job description.
-        # We search for these first. The list is ordered by likely relevance.
-        specific_selectors = [
-            {'tag': 'div', 'attrs': {'class': re.compile(r'job-description|jobDetailsSection|job-details|description', re.I)}},
-            {'tag': 'div', 'attrs': {'id': re.compile(r'job-description|jobDetailsSection|job-details|description', re.I)}},
-            {'tag': 'div', 'attrs': {'class': 'job-post-content'}},
-        ]
-        
-        # --- TIER 2: Semantic HTML Tags ---
-        # If specific selectors fail, we fall back to semantic tags which often
-        # wrap the main content of a page.
-        generic_selectors = [
-            {'tag': 'article', 'attrs': {}},
-            {'tag': 'main', 'attrs': {}},
+    filepath = filepath or os.getenv("SCRAPER_SELECTORS_PATH", "scraper_selectors.json")
+    if not os.path.exists(filepath):
+        return {}
+    with open(filepath, 'r') as f:
+        config = json.load(f)
+    site_selectors = {}
+    for host, selectors in config.items():
+        site_selectors[host.lower()] = [
+            {'tag': selector['tag'],
+             'attrs': {attr: re.compile(selector[attr], re.I) for attr in ('class', 'id') if attr in selector}}
+            for selector in selectors
         ]
+    return site_selectors
+
+SITE_SELECTORS = load_site_selectors()
+
+def _tier1_selectors(url):
+    """Site-specific overrides for the URL's host (if any), then SPECIFIC_SELECTORS."""
+    host = (urlsplit(url).hostname or '') if url else ''
+    site = SITE_SELECTORS.get(host) or SITE_SELECTORS.get(host.removeprefix('www.'), [])
+    return site + SPECIFIC_SELECTORS
+
+def _attr_matches(value, pattern, multi_valued):
+    """Mirrors BeautifulSoup's attribute matching for a string or compiled regex."""
+    if value is None:
+        return False
+    candidates = value.split() + [value] if multi_valued else [value]
+    if isinstance(pattern, str):
+        return pattern in candidates
+    return any(pattern.search(candidate) for candidate in candidates)
+
+def _selector_matches(selector, tag, attrib):
+    if selector['tag'] != tag:
+        return False
+    return all(
+        _attr_matches(attrib.get(attr), pattern, attr == 'class')
+        for attr, pattern in selector['attrs'].items()
+    )
+
+# Tags whose text BeautifulSoup leaves out of get_text()
+_NON_TEXT_TAGS = {'script', 'style', 'template'}
+
+class _SinglePassTarget:
+    """
+    lxml parser target that walks the document once. Every text node is appended to
+    one list, and for each selector (in priority order) the chunk range of the first
+    matching element is recorded. The container's text is then a slice of that list.
+    """
+
+    def __init__(self, selectors):
+        self.selectors = selectors
+        self.chunks = []
+        self._buffer = []
+        self._stack = []
+        self._skip_depth = 0
+        self.found = {}
+        self._body_start = None
+        self.body = None
+        self.done = False
+
+    def _flush(self):
+        if self._buffer:
+            self.chunks.append(''.join(self._buffer))
+            self._buffer = []
+
+    def start(self, tag, attrib):
+        self._flush()
+        if tag in _NON_TEXT_TAGS or self._skip_depth:
+            self._skip_depth += 1
+        if tag == 'body' and self._body_start is None:
+            self._body_start = len(self.chunks)
+        # Only selectors ranked above the best match so far can still win
+        rank = None
+        for i in range(min(self.found, default=len(self.selectors))):
+            if _selector_matches(self.selectors[i], tag, attrib):
+                rank = i
+                break
+        if rank is not None:
+            self.found[rank] = [len(self.chunks), None]
+        self._stack.append((tag, rank))
+
+    def end(self, tag):
+        self._flush()
+        if self._skip_depth:
+            self._skip_depth -= 1
+        open_tag, rank = self._stack.pop()
+        if rank is not None:
+            self.found[rank][1] = len(self.chunks)
+            # The top-priority selector matched and its element is complete: nothing
+            # later in the document can beat it, so parsing can stop.
+            if rank == 0:
+                self.done = True
+        if open_tag == 'body' and self.body is None:
+            self.body = (self._body_start, len(self.chunks))
+
+    def data(self, data):
+        if not self._skip_depth:
+            self._buffer.append(data)
 
-        job_description_container = None
+    def comment(self, text):
+        self._flush()
 
-        # --- Execute Tier 1 Search ---
-        for selector in specific_selectors:
+    def close(self):
+        self._flush()
+
+def extract_job_description_single_pass(html, url=None, chunk_size=65536):
+    """
+    Same result as extract_job_description, but the document is parsed with a
+    streaming lxml target instead of building a BeautifulSoup tree and running one
+    full-tree search per selector. The best-ranked container is picked in a single
+    walk, and parsing stops early once the top-priority selector's element closes.
+    """
+    tier1 = _tier1_selectors(url)
+    selectors = tier1 + GENERIC_SELECTORS
+    target = _SinglePassTarget(selectors)
+    parser = etree.HTMLParser(target=target)
+    if isinstance(html, str):
+        html = html.encode('utf-8')
+    for start in range(0, len(html), chunk_size):
+        parser.feed(html[start:start + chunk_size])
+        if target.done:
+            break
+    else:
+        parser.close()
+    target.close()
+
+    if target.found:
+        rank = min(target.found)
+        start, end = target.found[rank]
+        tier = "specific" if rank < len(tier1) else "generic"
+        print(f"Found content with {tier} selector: {selectors[rank]}")
+    else:
+        print("Warning: No specific container found. Falling back to the entire page body.")
+        if target.body is None:
+            raise ValueError("The page has no <body> element.")
+        start, end = target.body
+    if end is None:
+        end = len(target.chunks)
+    return clean_text('\n'.join(target.chunks[start:end]))
+
+def extract_job_description(html, url=None):
+    """
+    Runs the tiered selector search over an HTML document and returns the cleaned
+    job description text. Uses the single-pass extractor when lxml is installed.
+    """
+    if etree is not None:
+        return extract_job_description_single_pass(html, url)
+    return extract_job_description_with_soup(html, url)
+
+def extract_job_description_with_soup(html, url=None):
+    """
+    Tree-based version of the tiered search: builds the full BeautifulSoup tree and
+    runs one soup.find per selector.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    job_description_container = None
+
+    # --- Execute Tier 1 Search ---
+    for selector in _tier1_selectors(url):
+        job_description_container = soup.find(selector['tag'], **selector['attrs'])
+        if job_description_container:
+            print(f"Found content with specific selector: {selector}")
+            break
+
+    # --- Execute Tier 2 Search if Tier 1 Failed ---
+    if not job_description_container:
+        for selector in GENERIC_SELECTORS:
             job_description_container = soup.find(selector['tag'], **selector['attrs'])
             if job_description_container:
-                print(f"Found content with specific selector: {selector}")
+                print(f"Found content with generic selector: {selector}")
                 break
-        
-        # --- Execute Tier 2 Search if Tier 1 Failed ---
-        if not job_description_container:
-            for selector in generic_selectors:
-                job_description_container = soup.find(selector['tag'], **selector['attrs'])
-                if job_description_container:
-                    print(f"Found content with generic selector: {selector}")
-                    break
-        
-        # --- Process and Return Text ---
-        if job_description_container:
-            # If a container was found, extract and clean its text
-            return clean_text(job_description_container.get_text(separator='\n'))
-        else:
-            # --- TIER 3: Last Resort Fallback ---
-            # If no specific or generic container is found, fall back to the whole body,
-            # but still clean the text to remove as much noise as possible.
-            print("Warning: No specific container found. Falling back to the entire page body.")
-            return clean_text(soup.body.get_text(separator='\n'))
+
+    # --- Process and Return Text ---
+    if job_description_container:
+        # If a container was found, extract and clean its text
+        return clean_text(job_description_container.get_text(separator='\n'))
+    else:
+        # --- TIER 3: Last Resort Fallback ---
+        # If no specific or generic container is found, fall back to the whole body,
+        # but still clean the text to remove as much noise as possible.
+        print("Warning: No specific container found. Falling back to the entire page body.")
+        return clean_text(soup.body.get_text(separator='\n'))
+
+@profiled("scraping")
+def scrape_job_description(url):
+    """
+    Attempts to scrape the main text content from a job posting URL using a tiered
+    search strategy for better accuracy and broader compatibility.
+    """
+    try:
+        response = _session.get(url, timeout=10)
+        response.raise_for_status()
+
+        return extract_job_description(response.content, url)
 
     except requests.exceptions.RequestException as e:
         print(f"Error fetching URL: {e}")
         return f"Error: Could not fetch the URL. Please check the link and your connection. Details: {e}"
     except Exception as e:
         print(f"An unexpected error occurred during scraping: {e}")
-        return f"Error: An unexpected error occurred. The site may be blocking scrapers. Details: {e}"
\ No newline at end of file
+        return f"Error: An unexpected error occurred. The site may be blocking scrapers. Details: {e}"
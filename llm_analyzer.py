@@ -1,34 +1,97 @@
-import streamlit as st
-from transformers import pipeline
+import os
 import re
+import bisect
+from collections import Counter
+from model_loader import lazy_resource
+from cache import ContentCache
+from profiling import profiled, size_of_first_arg
+from experience_extractor import extract_experience
+from skill_extractor import find_skill_spans
+
+# torch and transformers are imported inside the loaders below, so importing this
+# module is cheap and nothing is loaded until an LLM feature is actually used.
+
+# Device for all models. CPU by default; set LLM_DEVICE=cuda:0 or mps explicitly
+# instead of probing for a GPU and catching the failure.
+LLM_DEVICE = os.getenv("LLM_DEVICE", "cpu")
+# Set LLM_WARM_UP=1 to have the app load the zero-shot and QA models in the background
+# at startup; by default they load on the first request that needs them.
+LLM_WARM_UP = os.getenv("LLM_WARM_UP", "0") == "1"
+
+# Zero-shot model used by the batched classification mode. A smaller NLI model such as
+# "valhalla/distilbart-mnli-12-3" trades a little accuracy for a large CPU speedup.
+ZERO_SHOT_MODEL = os.getenv("ZERO_SHOT_MODEL", "facebook/bart-large-mnli")
+ZERO_SHOT_QUANTIZE = os.getenv("ZERO_SHOT_QUANTIZE", "0") == "1"
+ZERO_SHOT_BATCH_SIZE = int(os.getenv("ZERO_SHOT_BATCH_SIZE", "16"))
+
+# Memoized zero-shot results keyed by (normalized context line, labels, model). JDs from
+# the same employer repeat boilerplate lines, so most lines are answered from here.
+# Set CLASSIFICATION_CACHE_PATH to persist the cache to a SQLite file across runs.
+classification_cache = ContentCache(
+    max_entries=int(os.getenv("CLASSIFICATION_CACHE_MAX_ENTRIES", "10000")),
+    disk_path=os.getenv("CLASSIFICATION_CACHE_PATH"),
+    max_disk_bytes=int(os.getenv("CLASSIFICATION_CACHE_MAX_DISK_MB", "64")) * 1024 * 1024,
+    ttl_seconds=float(os.getenv("CLASSIFICATION_CACHE_TTL_DAYS", "30")) * 86400,
+)
+
+def _load_classifier():
+    from transformers import pipeline
+    print(f"Loading zero-shot classification model on {LLM_DEVICE}...")
+    return pipeline("zero-shot-classification", model="facebook/bart-large-mnli", device=LLM_DEVICE)
+
+def _load_qa_pipeline():
+    from transformers import pipeline
+    print(f"Loading Question Answering model on {LLM_DEVICE}...")
+    # This model is smaller and optimized for extracting answers from text.
+    return pipeline("question-answering", model="distilbert-base-cased-distilled-squad", device=LLM_DEVICE)
+
+def _load_nli_model(model_name, quantize):
+    """Tokenizer + model for the batched zero-shot mode."""
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    print(f"Loading NLI model {model_name} on {LLM_DEVICE} (int8 quantized: {quantize})...")
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+    if quantize:
+        # Dynamic quantization only runs on CPU
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    else:
+        model.to(LLM_DEVICE)
+    # Same lookup the zero-shot pipeline uses to find the entailment logit
+    entailment_id = next((i for label, i in model.config.label2id.items() if label.lower().startswith("entail")), -1)
+    return tokenizer, model, entailment_id
+
+# --- Lazily loaded, thread-safe model singletons ---
+_classifier = lazy_resource("zero_shot_pipeline", _load_classifier)
+_qa_pipeline = lazy_resource("qa_pipeline", _load_qa_pipeline)
 
-# --- Caching the Zero-Shot Classifier for Skills ---
-@st.cache_resource
 def get_classifier():
-    print("Loading zero-shot classification model...")
-    try:
-        return pipeline("zero-shot-classification", model="facebook/bart-large-mnli", device=0)
-    except Exception:
-        print("GPU not available for classifier, falling back to CPU.")
-        return pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
+    return _classifier.get()
 
-# --- NEW: Caching the Question Answering model for Experience ---
-@st.cache_resource
 def get_qa_pipeline():
-    print("Loading Question Answering model...")
-    # This model is smaller and optimized for extracting answers from text.
-    try:
-        return pipeline("question-answering", model="distilbert-base-cased-distilled-squad", device=0)
-    except Exception:
-        print("GPU not available for QA, falling back to CPU.")
-        return pipeline("question-answering", model="distilbert-base-cased-distilled-squad")
+    return _qa_pipeline.get()
 
-classifier = get_classifier()
-qa_pipeline = get_qa_pipeline()
+def _nli_resource(model_name=ZERO_SHOT_MODEL, quantize=ZERO_SHOT_QUANTIZE):
+    return lazy_resource(f"nli:{model_name}:{'int8' if quantize else 'fp32'}", lambda: _load_nli_model(model_name, quantize))
+
+def get_nli_model(model_name=ZERO_SHOT_MODEL, quantize=ZERO_SHOT_QUANTIZE):
+    return _nli_resource(model_name, quantize).get()
+
+def warm_up(batched=True):
+    """
+    Starts loading the models used by find_mandatory_skills_with_llm and
+    find_experience_with_llm in background threads, so the first request does not
+    pay for the load. Safe to call repeatedly (e.g. on every Streamlit rerun).
+    """
+    (_nli_resource() if batched else _classifier).warm_up()
+    _qa_pipeline.warm_up()
 
-# (The get_context_line and find_mandatory_skills_with_llm functions remain unchanged)
 def get_context_line(text, entity):
-    # ... (no changes to this function)
+    """
+    The line of the first case-insensitive whole-word match of `entity`. Scans the
+    text per call; use skill_contexts to look up many skills in one pass.
+    """
     pattern = re.compile(r'\b' + re.escape(entity) + r'\b', re.IGNORECASE)
     match = pattern.search(text)
     if not match: return ""
@@ -37,32 +100,172 @@ def get_context_line(text, entity):
     if end == -1: end = len(text)
     return text[start:end].strip()
 
-def find_mandatory_skills_with_llm(jd_text, all_skills_from_jd):
-    # ... (no changes to this function)
+class LineIndex:
+    """Line start offsets of a text, found once, for offset -> line lookups by bisection."""
+
+    def __init__(self, text):
+        self.text = text
+        self.starts = [0]
+        newline = text.find('\n')
+        while newline != -1:
+            self.starts.append(newline + 1)
+            newline = text.find('\n', newline + 1)
+
+    def line_number(self, offset):
+        return bisect.bisect_right(self.starts, offset) - 1
+
+    def line(self, number):
+        end = self.starts[number + 1] - 1 if number + 1 < len(self.starts) else len(self.text)
+        return self.text[self.starts[number]:end].strip()
+
+def skill_contexts(text, skills, spans=None, all_occurrences=False):
+    """
+    Context lines for many skills in one pass over the skill extractor's match spans
+    (skill_extractor.find_skill_spans; pass them in if already computed). Returns
+    {skill: [line, ...]} keyed by the caller's spelling: the first occurrence's line,
+    or with all_occurrences every distinct line mentioning the skill, in text order.
+    Skills the extractor did not match fall back to get_context_line.
+    """
+    if spans is None:
+        spans = find_skill_spans(text)
+    index = LineIndex(text)
+    wanted = {skill.lower(): skill for skill in skills}
+    contexts = {}
+    for matched, start, _ in spans:
+        skill = wanted.get(matched.lower())
+        if skill is None:
+            continue
+        lines = contexts.setdefault(skill, {})
+        if lines and not all_occurrences:
+            continue
+        line = index.line(index.line_number(start))
+        if line:
+            lines[line] = None
+    result = {skill: list(lines) for skill, lines in contexts.items() if lines}
+    for skill in skills:
+        if skill not in result:
+            line = get_context_line(text, skill)
+            if line:
+                result[skill] = [line]
+    return result
+
+def classify_zero_shot_batched(sequences, candidate_labels, hypothesis_template="This example is {}.",
+                               batch_size=ZERO_SHOT_BATCH_SIZE, model_name=ZERO_SHOT_MODEL, quantize=ZERO_SHOT_QUANTIZE):
+    """
+    Single-label zero-shot classification with the same scoring as the transformers
+    pipeline, but built for CPU throughput:
+    - identical sequences are encoded only once per label,
+    - (sequence, hypothesis) pairs are sorted by token length and batched so each
+      batch is padded only to its own longest pair,
+    - forward passes run under torch.inference_mode.
+    Returns one {"sequence", "labels", "scores"} dict per input, like the pipeline.
+    """
+    import torch
+
+    tokenizer, model, entailment_id = get_nli_model(model_name, quantize)
+    unique_sequences = list(dict.fromkeys(sequences))
+    hypotheses = [hypothesis_template.format(label) for label in candidate_labels]
+    firsts = [seq for seq in unique_sequences for _ in hypotheses]
+    seconds = [hyp for _ in unique_sequences for hyp in hypotheses]
+
+    encodings = tokenizer(firsts, seconds, truncation="only_first")
+    order = sorted(range(len(firsts)), key=lambda i: len(encodings['input_ids'][i]), reverse=True)
+    entail_logits = torch.empty(len(firsts))
+
+    with torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            features = tokenizer.pad(
+                {key: [encodings[key][i] for i in batch] for key in encodings.keys()},
+                return_tensors="pt",
+            ).to(model.device)
+            logits = model(**features).logits
+            entail_logits[batch] = logits[:, entailment_id].float().cpu()
+
+    scores = entail_logits.view(len(unique_sequences), len(hypotheses)).softmax(dim=-1).tolist()
+    by_sequence = {}
+    for seq, seq_scores in zip(unique_sequences, scores):
+        ranked = sorted(zip(candidate_labels, seq_scores), key=lambda item: item[1], reverse=True)
+        by_sequence[seq] = {"labels": [label for label, _ in ranked], "scores": [score for _, score in ranked]}
+    return [{"sequence": seq, **by_sequence[seq]} for seq in sequences]
+
+def _normalize_context(line):
+    return " ".join(line.split()).casefold()
+
+def classify_with_cache(sequences, candidate_labels, batched=True, cache=classification_cache):
+    """
+    Zero-shot classification that only sends cache misses to the model. Cached
+    entries hold the label scores for a normalized context line, keyed together
+    with the candidate labels and the model configuration.
+    """
+    if batched:
+        model_key = f"batched:{ZERO_SHOT_MODEL}:{'int8' if ZERO_SHOT_QUANTIZE else 'fp32'}"
+    else:
+        model_key = "pipeline:facebook/bart-large-mnli"
+    label_key = "\x1e".join(candidate_labels)
+    keys = {seq: cache.make_key("zero_shot", f"{_normalize_context(seq)}\x1f{label_key}", model_key) for seq in sequences}
+
+    cached = {}
+    misses = []
+    for seq in dict.fromkeys(sequences):
+        value = cache.get(keys[seq])
+        if value is None:
+            misses.append(seq)
+        else:
+            cached[seq] = value
+
+    if misses:
+        if batched:
+            results = classify_zero_shot_batched(misses, candidate_labels)
+        else:
+            results = get_classifier()(misses, candidate_labels, multi_label=False)
+            if isinstance(results, dict):
+                results = [results]
+        for seq, result in zip(misses, results):
+            cached[seq] = {"labels": result['labels'], "scores": result['scores']}
+            cache.set(keys[seq], cached[seq])
+
+    return [{"sequence": seq, **cached[seq]} for seq in sequences]
+
+@profiled("zero_shot_classification", input_size=lambda jd_text, skills, *args, **kwargs: len(skills))
+def find_mandatory_skills_with_llm(jd_text, all_skills_from_jd, batched=True, all_mentions=False, spans=None, classify=None):
+    """
+    Classifies each JD skill as required/optional from the line it appears on.
+    batched=True uses classify_zero_shot_batched; batched=False uses the plain pipeline.
+    Lines already in classification_cache are not sent to the model.
+
+    With all_mentions=True every distinct line mentioning a skill is classified, and
+    the skill is mandatory if any mention is confidently "required" (e.g. it is listed
+    under "Nice to have" but also in "Must have"). `spans` are the skill extractor's
+    match spans for jd_text, if the caller already has them. `classify(sequences, labels)`
+    replaces classify_with_cache, e.g. to route lines through a request batcher.
+    """
     if not all_skills_from_jd: return [], []
     mandatory_skills = []
     analysis_details = []
     candidate_labels = ["this is a required skill", "this is an optional skill"]
     CONFIDENCE_THRESHOLD = 0.70
-    sequences_to_classify = []
-    skills_in_sequence = []
-    for skill in all_skills_from_jd:
-        context = get_context_line(jd_text, skill)
-        if context:
-            sequences_to_classify.append(context)
-            skills_in_sequence.append(skill)
+    contexts = skill_contexts(jd_text, all_skills_from_jd, spans, all_occurrences=all_mentions)
+    skills_with_context = [skill for skill in all_skills_from_jd if skill in contexts]
+    sequences_to_classify = [line for skill in skills_with_context for line in contexts[skill]]
     if not sequences_to_classify: return [], []
-    results = classifier(sequences_to_classify, candidate_labels, multi_label=False)
-    for skill, result in zip(skills_in_sequence, results):
-        top_label = result['labels'][0]
-        top_score = result['scores'][0]
-        analysis_details.append({"skill": skill, "classification": top_label, "confidence": f"{top_score:.2f}", "context": result['sequence']})
-        if top_label == "this is a required skill" and top_score > CONFIDENCE_THRESHOLD:
+    if classify is None:
+        classify = lambda sequences, labels: classify_with_cache(sequences, labels, batched=batched)
+    results = iter(classify(sequences_to_classify, candidate_labels))
+    for skill in skills_with_context:
+        mentions = [next(results) for _ in contexts[skill]]
+        required = [r for r in mentions if r['labels'][0] == "this is a required skill" and r['scores'][0] > CONFIDENCE_THRESHOLD]
+        # Report the strongest "required" evidence if there is any, else the most confident mention
+        result = max(required or mentions, key=lambda r: r['scores'][0])
+        analysis_details.append({"skill": skill, "classification": result['labels'][0], "confidence": f"{result['scores'][0]:.2f}",
+                                 "context": result['sequence'], "mentions": len(mentions)})
+        if required:
             mandatory_skills.append(skill)
     return mandatory_skills, analysis_details
 
 
 # --- NEW: Function to extract experience using the QA model ---
+@profiled("experience_qa", input_size=size_of_first_arg)
 def find_experience_with_llm(jd_text):
     """
     Uses a Question Answering LLM to find the required years of experience.
@@ -70,7 +273,7 @@ def find_experience_with_llm(jd_text):
     question = "How many years of experience are required?"
     
     try:
-        result = qa_pipeline(question=question, context=jd_text)
+        result = get_qa_pipeline()(question=question, context=jd_text)
         answer = result['answer']
         print(f"LLM found experience answer: '{answer}' with score {result['score']:.2f}")
 
@@ -90,4 +293,29 @@ def find_experience_with_llm(jd_text):
             return None
     except Exception as e:
         print(f"Error during experience extraction: {e}")
-        return None
\ No newline at end of file
+        return None
+
+# How often each find_experience path was taken, to measure how many QA calls the rules save
+experience_paths = Counter()
+
+@profiled("experience_extraction", input_size=size_of_first_arg)
+def find_experience(jd_text):
+    """
+    Required years of experience, from the rule engine in experience_extractor when it
+    finds one unambiguous minimum, else from the QA model. Returns (years, path):
+      "rules"        the rules found the value; no model call
+      "qa"           the rules found nothing; the QA model read the whole JD
+      "qa_conflict"  the rules found conflicting values; the QA model read only the
+                     lines that mention them, which is far shorter than the full JD
+    """
+    years, mentions, status = extract_experience(jd_text)
+    if status == "found":
+        path = "rules"
+    elif status == "conflict":
+        path = "qa_conflict"
+        years = find_experience_with_llm("\n".join(dict.fromkeys(mention.line for mention in mentions)))
+    else:
+        path = "qa"
+        years = find_experience_with_llm(jd_text)
+    experience_paths[path] += 1
+    return years, path
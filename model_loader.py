@@ -0,0 +1,86 @@
+import threading
+import time
+
+# Every LazyResource created, by name
+_resources = {}
+_registry_lock = threading.Lock()
+
+
+class LazyResource:
+    """
+    Thread-safe lazily constructed singleton (a model, a tokenizer, ...).
+
+    The factory runs at most once, on the first get() or in a background warm-up
+    thread. Concurrent callers block until that single load finishes. The load time
+    and the latency seen by the first caller are recorded for startup_report().
+    """
+
+    def __init__(self, name, factory):
+        self.name = name
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._value = None
+        self._loaded = False
+        self._warmup_thread = None
+        self.load_seconds = None
+        self.first_request_seconds = None
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def get(self):
+        requested_at = time.perf_counter()
+        if not self._loaded:
+            self._load_once()
+        if self.first_request_seconds is None:
+            self.first_request_seconds = time.perf_counter() - requested_at
+        return self._value
+
+    def warm_up(self):
+        """Starts loading in a daemon thread. No-op if already loaded or loading."""
+        with _registry_lock:
+            if self._loaded or self._warmup_thread is not None:
+                return self._warmup_thread
+            self._warmup_thread = threading.Thread(target=self._warm_up, name=f"warmup-{self.name}", daemon=True)
+        self._warmup_thread.start()
+        return self._warmup_thread
+
+    def _load_once(self):
+        with self._lock:
+            if not self._loaded:
+                started_at = time.perf_counter()
+                self._value = self._factory()
+                self.load_seconds = time.perf_counter() - started_at
+                self._loaded = True
+
+    def _warm_up(self):
+        try:
+            self._load_once()
+        except Exception as e:
+            print(f"Background warm-up of {self.name} failed: {e}")
+
+
+def lazy_resource(name, factory):
+    """Returns the LazyResource registered under `name`, creating it on first use."""
+    with _registry_lock:
+        if name not in _resources:
+            _resources[name] = LazyResource(name, factory)
+        return _resources[name]
+
+
+def startup_report():
+    """
+    Load and first-request latency per resource, in seconds. Import times are measured
+    in a fresh interpreter by benchmarks/startup.py.
+    """
+    return {
+        "resources": {
+            name: {
+                "loaded": resource.loaded,
+                "load_seconds": None if resource.load_seconds is None else round(resource.load_seconds, 4),
+                "first_request_seconds": None if resource.first_request_seconds is None else round(resource.first_request_seconds, 4),
+            }
+            for name, resource in _resources.items()
+        },
+    }
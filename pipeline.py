@@ -0,0 +1,173 @@
+from analysis import analyze_skills, get_final_fit, DEFAULT_WEIGHTS
+from batch_analysis import SkillVocabulary, count_skill_matches, combine_fit_scores, rank_candidates
+from cache import cached_extract_text_from_pdf, cached_extract_skills_from_text
+from taxonomy import get_taxonomy
+
+
+class Stage:
+    """One memoized step of an IncrementalPipeline: `func` called with the values of `inputs`."""
+
+    def __init__(self, name, inputs, func):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.func = func
+
+
+class IncrementalPipeline:
+    """
+    A small dependency graph of memoized stages. Each input and stage output carries a
+    version number; a stage is recomputed only when the version of one of its inputs
+    changed since it last ran, so changing a downstream input (mandatory skills, CTC
+    budget, weights) never re-runs upstream work (PDF parsing, skill extraction).
+
+    A stage whose recomputed output equals its previous output keeps its version, so
+    its dependents are not recomputed either (e.g. re-typing "Python, Docker" as
+    "python,docker" gives the same skill analysis and no new final score).
+
+    `recomputed` lists the stages that ran during the last get().
+    """
+
+    def __init__(self, stages, **inputs):
+        self.stages = {stage.name: stage for stage in stages}
+        self._values = {}
+        self._versions = {}
+        self._seen = {}
+        self._clock = 0
+        self.recomputed = []
+        self.set(**inputs)
+
+    def set(self, **inputs):
+        """Updates inputs. Values equal to the current ones do not invalidate anything."""
+        for name, value in inputs.items():
+            if name in self.stages:
+                raise ValueError(f"'{name}' is a stage, not an input.")
+            if name not in self._versions or not _same(self._values[name], value):
+                self._bump(name, value)
+
+    def get(self, name):
+        """Returns a stage or input value, recomputing whatever is out of date."""
+        self.recomputed = []
+        self._refresh(name)
+        return self._values[name]
+
+    def _bump(self, name, value):
+        self._clock += 1
+        self._values[name] = value
+        self._versions[name] = self._clock
+
+    def _refresh(self, name):
+        stage = self.stages.get(name)
+        if stage is None:
+            if name not in self._versions:
+                raise KeyError(f"Pipeline input '{name}' has not been set.")
+            return self._versions[name]
+
+        seen = tuple(self._refresh(dependency) for dependency in stage.inputs)
+        if self._seen.get(name) != seen:
+            value = stage.func(*(self._values[dependency] for dependency in stage.inputs))
+            self.recomputed.append(name)
+            if name not in self._versions or not _same(self._values[name], value):
+                self._bump(name, value)
+            self._seen[name] = seen
+        return self._versions[name]
+
+
+def _same(a, b):
+    try:
+        return bool(a is b or a == b)
+    except (TypeError, ValueError):
+        # e.g. NumPy arrays, whose == is element-wise
+        return False
+
+
+def parse_skill_list(text):
+    """
+    Splits the comma-separated mandatory skills box into a de-duplicated, lowercased
+    list. Aliases become their canonical skill, so "Postgres" and "PostgreSQL" are the same input.
+    """
+    taxonomy = get_taxonomy()
+    skills = set()
+    for skill in text.split(','):
+        skill = skill.strip()
+        if skill:
+            skill_id = taxonomy.skill_id(skill)
+            skills.add(taxonomy.lower_names[skill_id] if skill_id is not None else skill.lower())
+    return sorted(skills)
+
+
+def _resume_skills(resume_text):
+    return cached_extract_skills_from_text(resume_text) if resume_text is not None else None
+
+
+def analysis_pipeline(max_pages=None, max_bytes=None, **inputs):
+    """
+    The single-resume flow of the app as an IncrementalPipeline:
+
+        resume_bytes -> resume_text -> resume_skills --\\
+        jd_text -> jd_skills --------------------------+-> skill_analysis -> final_fit
+        mandatory_skills -> mandatory_list ------------/        jd, candidate, weights --/
+
+    Inputs: resume_bytes, jd_text, mandatory_skills (comma-separated text), jd
+    ({min_experience, max_ctc}), candidate ({total_experience, expected_ctc}) and
+    weights (None for DEFAULT_WEIGHTS). `final_fit` is get_final_fit's return value.
+    """
+    inputs.setdefault('weights', None)
+    return IncrementalPipeline([
+        Stage('resume_text', ['resume_bytes'],
+              lambda data: cached_extract_text_from_pdf(data, max_pages=max_pages, max_bytes=max_bytes)),
+        Stage('resume_skills', ['resume_text'], _resume_skills),
+        Stage('jd_skills', ['jd_text'], cached_extract_skills_from_text),
+        Stage('mandatory_list', ['mandatory_skills'], parse_skill_list),
+        Stage('skill_analysis', ['jd_skills', 'resume_skills', 'mandatory_list'], analyze_skills),
+        Stage('final_fit', ['skill_analysis', 'jd', 'candidate', 'weights'], get_final_fit),
+    ], **inputs)
+
+
+class BatchRescorer:
+    """
+    Re-ranks a fixed batch of candidates as the JD settings change. The resumes' skills
+    are encoded once, and again only when a JD or mandatory skill adds a vocabulary
+    column; the per-candidate skill counts are recomputed only when the JD or
+    mandatory skills change, and weight or experience/CTC threshold changes only redo
+    the arithmetic in combine_fit_scores.
+
+        rescorer = BatchRescorer(resume_skill_sets, candidates)
+        rescorer.rank(jd_skills, mandatory_skills, jd, weights=None, top_k=10)
+    """
+
+    def __init__(self, resume_skill_sets, candidates, vocabulary=None):
+        vocabulary = vocabulary if vocabulary is not None else SkillVocabulary.from_taxonomy()
+        self.vocabulary = vocabulary
+        # Kept to re-encode when a JD adds a column: a resume may already have that skill
+        self.resume_skill_sets = [list(skills) for skills in resume_skill_sets]
+        self._encoded_columns = len(vocabulary)
+        self.pipeline = IncrementalPipeline([
+            Stage('skill_counts', ['resume_matrix', 'jd_skills', 'mandatory_skills'],
+                  lambda matrix, jd_skills, mandatory: count_skill_matches(matrix, vocabulary, jd_skills, mandatory)),
+            Stage('scores', ['skill_counts', 'jd', 'experiences', 'expected_ctcs', 'weights'],
+                  lambda counts, jd, experiences, expected_ctcs, weights:
+                  combine_fit_scores(*counts, jd, experiences, expected_ctcs, weights)),
+        ],
+            resume_matrix=vocabulary.encode(self.resume_skill_sets),
+            experiences=[c['total_experience'] for c in candidates],
+            expected_ctcs=[c['expected_ctc'] for c in candidates],
+        )
+
+    @property
+    def recomputed(self):
+        return self.pipeline.recomputed
+
+    def rank(self, jd_skills, mandatory_skills, jd, weights=None, top_k=10):
+        """Same result as batch_analysis.rank_resumes for the stored candidates."""
+        for skill in list(jd_skills) + list(mandatory_skills):
+            self.vocabulary.add(skill)
+        if len(self.vocabulary) > self._encoded_columns:
+            self._encoded_columns = len(self.vocabulary)
+            self.pipeline.set(resume_matrix=self.vocabulary.encode(self.resume_skill_sets))
+        self.pipeline.set(
+            jd_skills=sorted({skill.lower() for skill in jd_skills}),
+            mandatory_skills=sorted({skill.lower() for skill in mandatory_skills}),
+            jd={'min_experience': jd['min_experience'], 'max_ctc': jd['max_ctc']},
+            weights=dict(weights) if weights else DEFAULT_WEIGHTS,
+        )
+        return rank_candidates(self.pipeline.get('scores'), top_k)
@@ -0,0 +1,231 @@
+import bisect
+import collections
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# Off unless PROFILING=1 (or enable() is called). When off, a profiled function costs
+# one global lookup and a branch on top of the call.
+_enabled = os.getenv("PROFILING", "0") == "1"
+_track_memory = os.getenv("PROFILING_MEMORY", "0") == "1"
+
+# Prometheus-style latency buckets (seconds)
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+MAX_TRACE_EVENTS = int(os.getenv("PROFILING_MAX_EVENTS", "10000"))
+
+
+class StageStats:
+    """Aggregates for one stage: a duration histogram plus CPU, memory and input-size totals."""
+
+    def __init__(self):
+        self.count = 0
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.input_size = 0
+        self.peak_memory_bytes = 0
+        self.bucket_counts = [0] * len(DURATION_BUCKETS)
+
+    def observe(self, wall, cpu, input_size, peak_memory):
+        self.count += 1
+        self.wall_seconds += wall
+        self.cpu_seconds += cpu
+        self.input_size += input_size or 0
+        if peak_memory is not None:
+            self.peak_memory_bytes = max(self.peak_memory_bytes, peak_memory)
+        position = bisect.bisect_left(DURATION_BUCKETS, wall)
+        if position < len(self.bucket_counts):
+            self.bucket_counts[position] += 1
+
+
+class Profiler:
+    """
+    Records one event per profiled call (wall time, thread CPU time, input size and,
+    with memory tracking on, the tracemalloc peak above the memory in use at entry)
+    and keeps per-stage aggregates. Stages may nest: an inner stage's peak also counts
+    towards the outer one. tracemalloc is process-wide, so peaks of stages running
+    concurrently in several threads overlap.
+    """
+
+    def __init__(self, max_events=MAX_TRACE_EVENTS):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stats = {}
+        self.events = collections.deque(maxlen=max_events)
+        self._origin = time.perf_counter()
+
+    def record(self, stage, wall, cpu, input_size=None, peak_memory=None, started_at=None):
+        with self._lock:
+            stats = self.stats.get(stage)
+            if stats is None:
+                stats = self.stats[stage] = StageStats()
+            stats.observe(wall, cpu, input_size, peak_memory)
+            self.events.append({
+                "stage": stage,
+                "start": (started_at if started_at is not None else time.perf_counter() - wall) - self._origin,
+                "wall_seconds": wall,
+                "cpu_seconds": cpu,
+                "input_size": input_size,
+                "peak_memory_bytes": peak_memory,
+                "thread": threading.get_ident(),
+            })
+
+    def _memory_stack(self):
+        stack = getattr(self._local, "memory_stack", None)
+        if stack is None:
+            stack = self._local.memory_stack = []
+        return stack
+
+    def call(self, stage, func, args, kwargs, input_size=None):
+        """Runs func(*args, **kwargs) and records it under `stage`."""
+        memory_frame = None
+        if _track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            memory_frame = [current, current]
+            self._memory_stack().append(memory_frame)
+        started_at = time.perf_counter()
+        cpu_started_at = time.thread_time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            wall = time.perf_counter() - started_at
+            cpu = time.thread_time() - cpu_started_at
+            peak_memory = None
+            if memory_frame is not None:
+                _, peak = tracemalloc.get_traced_memory()
+                stack = self._memory_stack()
+                stack.pop()
+                memory_frame[1] = max(memory_frame[1], peak)
+                if stack:
+                    stack[-1][1] = max(stack[-1][1], memory_frame[1])
+                peak_memory = memory_frame[1] - memory_frame[0]
+            size = None
+            if input_size is not None:
+                try:
+                    size = input_size(*args, **kwargs)
+                except Exception:
+                    size = None
+            self.record(stage, wall, cpu, size, peak_memory, started_at)
+
+    def summary(self):
+        """Per-stage rows (count, total/mean/p50/p95 wall time, CPU, peak memory, input size)."""
+        with self._lock:
+            walls = collections.defaultdict(list)
+            for event in self.events:
+                walls[event["stage"]].append(event["wall_seconds"])
+            rows = []
+            for stage, stats in sorted(self.stats.items()):
+                recent = sorted(walls.get(stage, ()))
+                percentile = lambda q: recent[min(len(recent) - 1, int(q * len(recent)))] if recent else None
+                rows.append({
+                    "stage": stage,
+                    "calls": stats.count,
+                    "total_s": round(stats.wall_seconds, 4),
+                    "mean_ms": round(stats.wall_seconds / stats.count * 1000, 2),
+                    "p50_ms": round(percentile(0.5) * 1000, 2) if recent else None,
+                    "p95_ms": round(percentile(0.95) * 1000, 2) if recent else None,
+                    "cpu_s": round(stats.cpu_seconds, 4),
+                    "peak_memory_mb": round(stats.peak_memory_bytes / 1e6, 2) if _track_memory else None,
+                    "mean_input_size": round(stats.input_size / stats.count, 1),
+                })
+            return rows
+
+    def prometheus_text(self, prefix="jobfit"):
+        """Prometheus text exposition format: a duration histogram and counters per stage."""
+        lines = [
+            f"# HELP {prefix}_stage_duration_seconds Wall time per pipeline stage call.",
+            f"# TYPE {prefix}_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            stats = sorted(self.stats.items())
+            for stage, s in stats:
+                cumulative = 0
+                for bound, count in zip(DURATION_BUCKETS, s.bucket_counts):
+                    cumulative += count
+                    lines.append(f'{prefix}_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {s.count}')
+                lines.append(f'{prefix}_stage_duration_seconds_sum{{stage="{stage}"}} {s.wall_seconds}')
+                lines.append(f'{prefix}_stage_duration_seconds_count{{stage="{stage}"}} {s.count}')
+            counters = [
+                ("stage_cpu_seconds_total", "counter", "Thread CPU time per pipeline stage.", lambda s: s.cpu_seconds),
+                ("stage_input_size_total", "counter", "Summed input size (bytes, characters or items) per stage.", lambda s: s.input_size),
+            ]
+            if _track_memory:
+                counters.append(("stage_peak_memory_bytes", "gauge", "Largest traced allocation peak of a single call.", lambda s: s.peak_memory_bytes))
+            for name, kind, help_text, value in counters:
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} {kind}")
+                for stage, s in stats:
+                    lines.append(f'{prefix}_{name}{{stage="{stage}"}} {value(s)}')
+        return "\n".join(lines) + "\n"
+
+    def chrome_trace(self):
+        """The recorded events in Chrome trace-event JSON (open in chrome://tracing or Perfetto)."""
+        with self._lock:
+            events = [
+                {
+                    "name": event["stage"],
+                    "ph": "X",
+                    "ts": event["start"] * 1e6,
+                    "dur": event["wall_seconds"] * 1e6,
+                    "pid": os.getpid(),
+                    "tid": event["thread"],
+                    "args": {k: event[k] for k in ("cpu_seconds", "input_size", "peak_memory_bytes")},
+                }
+                for event in self.events
+            ]
+        return json.dumps({"traceEvents": events})
+
+    def write_trace(self, path):
+        with open(path, "w") as f:
+            f.write(self.chrome_trace())
+
+    def reset(self):
+        with self._lock:
+            self.stats = {}
+            self.events.clear()
+
+
+profiler = Profiler()
+
+
+def enabled():
+    return _enabled
+
+
+def enable(on=True, track_memory=None):
+    """Turns profiling on or off at runtime. track_memory toggles tracemalloc peaks."""
+    global _enabled, _track_memory
+    _enabled = on
+    if track_memory is not None:
+        _track_memory = track_memory
+        if not track_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def profiled(stage, input_size=None):
+    """
+    Decorator recording calls to the wrapped function as `stage` while profiling is on.
+    `input_size`, if given, is called with the same arguments and returns the size to
+    record (e.g. the length of the text or PDF bytes).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            return profiler.call(stage, func, args, kwargs, input_size)
+        return wrapper
+    return decorator
+
+
+def size_of_first_arg(*args, **kwargs):
+    """input_size helper: len() of the first positional argument, if it has one."""
+    if args and hasattr(args[0], "__len__"):
+        return len(args[0])
+    return None
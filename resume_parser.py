@@ -1,18 +1,68 @@
 import PyPDF2
 import io
+import os
+import mmap
+from profiling import profiled
 
-def extract_text_from_pdf(file_bytes):
+
+class PDFTooLargeError(Exception):
+    """Raised when a PDF exceeds the configured page or size cap."""
+
+
+def _open_source(source, max_bytes=None):
+    """
+    Returns a seekable stream for a PDF given as bytes or as a file path. Paths are
+    memory-mapped, so the file is paged in by the OS instead of copied into memory.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        size = len(source)
+        stream = io.BytesIO(source)
+    else:
+        size = os.path.getsize(source)
+        if size == 0:
+            raise ValueError(f"{source} is empty")
+        with open(source, 'rb') as f:
+            stream = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if max_bytes is not None and size > max_bytes:
+        stream.close()
+        raise PDFTooLargeError(f"PDF is {size} bytes, larger than the {max_bytes} byte limit.")
+    return stream
+
+
+def _check_page_count(reader, max_pages):
+    if max_pages is not None and len(reader.pages) > max_pages:
+        raise PDFTooLargeError(f"PDF has {len(reader.pages)} pages, more than the {max_pages} page limit.")
+
+
+def iter_pdf_pages(source, max_pages=None, max_bytes=None):
+    """
+    Yields the text of each page of a PDF given as bytes or a file path, one page at
+    a time. Raises PDFTooLargeError before any page is parsed if the file is bigger
+    than max_bytes or has more than max_pages pages.
+    """
+    stream = _open_source(source, max_bytes)
+    try:
+        reader = PyPDF2.PdfReader(stream)
+        _check_page_count(reader, max_pages)
+        for page in reader.pages:
+            yield page.extract_text() or ""
+    finally:
+        stream.close()
+
+
+def _pdf_size(source, *args, **kwargs):
+    return os.path.getsize(source) if isinstance(source, (str, os.PathLike)) else len(source)
+
+@profiled("pdf_parsing", input_size=_pdf_size)
+def extract_text_from_pdf(file_bytes, max_pages=None, max_bytes=None):
     """
-    Extracts text from a PDF file provided as bytes.
+    Extracts text from a PDF file provided as bytes (or a file path). Returns None if
+    the PDF cannot be read; raises PDFTooLargeError if it exceeds max_pages or max_bytes.
     """
     try:
-        pdf_file = io.BytesIO(file_bytes)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
-        return text
+        return "".join(iter_pdf_pages(file_bytes, max_pages=max_pages, max_bytes=max_bytes))
+    except PDFTooLargeError:
+        raise
     except Exception as e:
         print(f"Error reading PDF file: {e}")
         return None
-
@@ -0,0 +1,51 @@
+"""
+Process-pool tasks shared by bulk_screen.py and service.py: a PDF resume in, its
+skills out. Pass init_worker as the pool's initializer so each worker loads the
+spaCy model and maps the skills taxonomy once.
+"""
+import zipfile
+
+from resume_parser import extract_text_from_pdf
+
+# Per-worker state: zip archives opened by process_resume
+_zip_files = {}
+
+
+def init_worker():
+    """Runs once per worker process: loads the spaCy model so each task reuses it."""
+    import skill_extractor
+    import taxonomy
+    skill_extractor.get_nlp()
+    # Memory-maps the compiled taxonomy (and the embedding matrix when fuzzy matching
+    # is on); every worker shares the same pages
+    taxonomy.get_taxonomy()
+    if skill_extractor.fuzzy_matching_enabled():
+        import skill_embeddings
+        skill_embeddings.get_index()
+
+
+def _read_resume(source):
+    if isinstance(source, tuple):
+        zip_path, member = source
+        if zip_path not in _zip_files:
+            _zip_files[zip_path] = zipfile.ZipFile(zip_path)
+        return _zip_files[zip_path].read(member)
+    return source
+
+
+def process_resume(task):
+    """
+    Worker: PDF -> text -> skills. `task` is (name, source, max_pages, max_bytes), the
+    source being PDF bytes, a file path or a (zip path, member) pair.
+    Returns (name, skills or None, error or None).
+    """
+    from skill_extractor import extract_skills_from_text
+
+    name, source, max_pages, max_bytes = task
+    try:
+        text = extract_text_from_pdf(_read_resume(source), max_pages=max_pages, max_bytes=max_bytes)
+        if text is None:
+            return name, None, "Could not read the PDF file."
+        return name, sorted(extract_skills_from_text(text)), None
+    except Exception as e:
+        return name, None, str(e)
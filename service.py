@@ -0,0 +1,310 @@
+"""
+Headless fit-scoring HTTP API (aiohttp), for calling the pipeline without the UI.
+
+    python service.py [--port 8080] [--workers 4] [--batch-window-ms 10] [--no-models]
+
+Endpoints (JSON in and out):
+    POST /jd/analyze   {"text": ... | "url": ..., "all_mentions": true}
+                       -> skills, mandatory skills (zero-shot), minimum experience
+    POST /resumes      raw application/pdf body, or multipart with a "file" field
+                       -> {"resume_id", "skills"}; the id is the PDF's content hash
+    POST /score        {"jd": {"skills": [...] | "text": ..., "mandatory_skills": [...],
+                               "min_experience": 3, "max_ctc": 150000},
+                        "candidates": [{"id", "resume_id" | "skills", "total_experience",
+                                        "expected_ctc"}, ...],
+                        "weights": {...}, "top_k": 10}
+                       -> candidates ranked by final score (batch_analysis.rank_resumes)
+    GET  /health, GET /metrics (Prometheus text: stage timings and batcher counters)
+
+PDF parsing and skill extraction run in a process pool whose workers load the spaCy
+model once. The zero-shot and QA models are loaded once in the server process.
+Zero-shot lines from concurrent requests are collected for --batch-window-ms and
+sent to the model as one batch.
+"""
+import argparse
+import asyncio
+import functools
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from aiohttp import web
+
+import llm_analyzer
+import profiling
+from batch_analysis import rank_resumes
+from cache import cached_scrape_job_description, content_hash
+from experience_extractor import extract_experience
+from resume_worker import init_worker, process_resume
+
+MAX_RESUME_PAGES = int(os.getenv("SERVICE_MAX_RESUME_PAGES", "100"))
+MAX_RESUME_BYTES = int(os.getenv("SERVICE_MAX_RESUME_MB", "20")) * 1024 * 1024
+MAX_STORED_RESUMES = int(os.getenv("SERVICE_MAX_STORED_RESUMES", "100000"))
+# Threads that run find_mandatory_skills_with_llm / find_experience. They mostly wait on
+# the batcher, so there are many more of them than cores; this bounds the batch fill.
+MODEL_REQUEST_THREADS = int(os.getenv("SERVICE_MODEL_REQUEST_THREADS", "64"))
+
+
+class MicroBatcher:
+    """
+    Collects zero-shot classification requests into shared model calls. A batch waits
+    up to `window` seconds for concurrent requests to join (less once `max_batch` lines
+    are queued), then runs as one classify_with_cache call on a single model thread.
+    Requests arriving while the model is busy queue up for the next batch. Each caller
+    gets its own slice of the results.
+    """
+
+    def __init__(self, window=0.01, max_batch=64, classify=llm_analyzer.classify_with_cache):
+        self.window = window
+        self.max_batch = max_batch
+        self._classify = classify
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="zero-shot")
+        self._loop = None
+        self._worker = None
+        self._pending = []
+        self._pending_lines = 0
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self.stats = {"requests": 0, "batches": 0, "lines": 0}
+
+    def attach(self, loop):
+        """Binds the batcher to the server's event loop, for classify_blocking."""
+        self._loop = loop
+
+    async def classify(self, sequences, labels):
+        self._loop = asyncio.get_running_loop()
+        if self._worker is None:
+            self._worker = self._loop.create_task(self._run_batches())
+        future = self._loop.create_future()
+        self._pending.append((list(sequences), tuple(labels), future))
+        self._pending_lines += len(sequences)
+        self.stats["requests"] += 1
+        self._wakeup.set()
+        if self._pending_lines >= self.max_batch:
+            self._full.set()
+        return await future
+
+    def classify_blocking(self, sequences, labels):
+        """classify() for code running in a worker thread (find_mandatory_skills_with_llm)."""
+        return asyncio.run_coroutine_threadsafe(self.classify(sequences, labels), self._loop).result()
+
+    async def _run_batches(self):
+        while True:
+            await self._wakeup.wait()
+            try:
+                await asyncio.wait_for(self._full.wait(), self.window)
+            except asyncio.TimeoutError:
+                pass
+            pending, self._pending, self._pending_lines = self._pending, [], 0
+            self._wakeup.clear()
+            self._full.clear()
+            by_labels = {}
+            for request in pending:
+                by_labels.setdefault(request[1], []).append(request)
+            for labels, requests in by_labels.items():
+                await self._run(labels, requests)
+
+    async def _run(self, labels, requests):
+        lines = [line for sequences, _, _ in requests for line in sequences]
+        self.stats["batches"] += 1
+        self.stats["lines"] += len(lines)
+        try:
+            results = await self._loop.run_in_executor(self._executor, self._classify, lines, list(labels))
+        except Exception as e:
+            for _, _, future in requests:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        offset = 0
+        for sequences, _, future in requests:
+            if not future.done():
+                future.set_result(results[offset:offset + len(sequences)])
+            offset += len(sequences)
+
+
+async def _read_part(part, max_bytes):
+    """
+    Reads a multipart part chunk by chunk. client_max_size does not apply to multipart
+    bodies, so the size is checked here, before the whole part is held in memory.
+    """
+    chunks, size = [], 0
+    while chunk := await part.read_chunk():
+        size += len(chunk)
+        if size > max_bytes:
+            raise web.HTTPRequestEntityTooLarge(max_size=max_bytes, actual_size=size)
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _jd_spans(text):
+    """Process-pool task: skill match spans of a JD."""
+    from skill_extractor import find_skill_spans
+    return find_skill_spans(text)
+
+
+class ScoringService:
+    def __init__(self, workers=None, batch_window=0.01, max_batch=64, use_models=True):
+        self.use_models = use_models
+        self.workers = workers or os.cpu_count()
+        # spawn, not fork: the server process may already run model-loading threads
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"), initializer=init_worker)
+        self.batcher = MicroBatcher(batch_window, max_batch)
+        self.model_requests = ThreadPoolExecutor(MODEL_REQUEST_THREADS, thread_name_prefix="model-request")
+        self.resumes = OrderedDict()
+
+    async def _in_pool(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+
+    async def _in_model_thread(self, func, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self.model_requests, functools.partial(func, *args, **kwargs))
+
+    async def _jd_skills(self, text):
+        spans = await self._in_pool(_jd_spans, text)
+        return list(dict.fromkeys(skill for skill, _, _ in spans)), spans
+
+    async def analyze_jd(self, request):
+        body = await _json_body(request)
+        text = body.get("text")
+        if not text and body.get("url"):
+            text = await asyncio.to_thread(cached_scrape_job_description, body["url"])
+            if text.startswith("Error:"):
+                raise web.HTTPBadGateway(text=text)
+        if not text:
+            raise web.HTTPBadRequest(text="Provide the JD as 'text' or 'url'.")
+
+        skills, spans = await self._jd_skills(text)
+        if self.use_models:
+            mandatory, details = await self._in_model_thread(
+                llm_analyzer.find_mandatory_skills_with_llm, text, skills,
+                all_mentions=body.get("all_mentions", True), spans=spans, classify=self.batcher.classify_blocking,
+            )
+            min_experience, experience_path = await self._in_model_thread(llm_analyzer.find_experience, text)
+        else:
+            mandatory, details = [], []
+            min_experience, _, status = extract_experience(text)
+            experience_path = "rules" if status == "found" else None
+        return web.json_response({
+            "skills": skills,
+            "mandatory_skills": mandatory,
+            "details": details,
+            "min_experience": min_experience,
+            "experience_path": experience_path,
+        })
+
+    async def upload_resume(self, request):
+        if request.content_type.startswith("multipart/"):
+            data = None
+            async for part in await request.multipart():
+                if part.name == "file":
+                    data = await _read_part(part, MAX_RESUME_BYTES)
+            if data is None:
+                raise web.HTTPBadRequest(text="Multipart upload needs a 'file' field.")
+        else:
+            data = await request.read()
+        if len(data) > MAX_RESUME_BYTES:
+            raise web.HTTPRequestEntityTooLarge(max_size=MAX_RESUME_BYTES, actual_size=len(data))
+
+        resume_id = content_hash(data)
+        skills = self.resumes.get(resume_id)
+        if skills is None:
+            _, skills, error = await self._in_pool(process_resume, (resume_id, data, MAX_RESUME_PAGES, MAX_RESUME_BYTES))
+            if error is not None:
+                raise web.HTTPUnprocessableEntity(text=error)
+            self.resumes[resume_id] = skills
+            if len(self.resumes) > MAX_STORED_RESUMES:
+                self.resumes.popitem(last=False)
+        else:
+            self.resumes.move_to_end(resume_id)
+        return web.json_response({"resume_id": resume_id, "skills": skills})
+
+    async def score(self, request):
+        body = await _json_body(request)
+        jd = body.get("jd") or {}
+        candidates = body.get("candidates") or []
+        try:
+            jd_skills = jd.get("skills")
+            if jd_skills is None:
+                if not jd.get("text"):
+                    raise web.HTTPBadRequest(text="The JD needs 'skills' or 'text'.")
+                jd_skills, _ = await self._jd_skills(jd["text"])
+            skill_sets = []
+            for candidate in candidates:
+                if "skills" in candidate:
+                    skill_sets.append(candidate["skills"])
+                elif candidate.get("resume_id") in self.resumes:
+                    skill_sets.append(self.resumes[candidate["resume_id"]])
+                else:
+                    raise web.HTTPNotFound(text=f"Unknown resume_id: {candidate.get('resume_id')}")
+            jd_fit = {"min_experience": jd.get("min_experience", 0), "max_ctc": jd["max_ctc"]}
+            details = [{"total_experience": c["total_experience"], "expected_ctc": c["expected_ctc"]} for c in candidates]
+        except KeyError as e:
+            raise web.HTTPBadRequest(text=f"Missing field: {e}")
+
+        ranked = await asyncio.to_thread(
+            rank_resumes, skill_sets, jd_skills, jd.get("mandatory_skills", []), jd_fit, details,
+            body.get("top_k", len(candidates)), None, body.get("weights"),
+        )
+        for result in ranked:
+            candidate = candidates[result.pop("index")]
+            result["id"] = candidate.get("id", candidate.get("resume_id"))
+        return web.json_response({"results": ranked})
+
+    async def health(self, request):
+        return web.json_response({"status": "ok", "stored_resumes": len(self.resumes)})
+
+    async def metrics(self, request):
+        lines = [profiling.profiler.prometheus_text().rstrip("\n")]
+        for name, value in self.batcher.stats.items():
+            lines.append(f"# TYPE jobfit_zero_shot_batcher_{name}_total counter")
+            lines.append(f"jobfit_zero_shot_batcher_{name}_total {value}")
+        return web.Response(text="\n".join(lines) + "\n", content_type="text/plain")
+
+    async def _on_startup(self, app):
+        # Start the pool's workers (and their spaCy load) now rather than on the first request
+        self.batcher.attach(asyncio.get_running_loop())
+        await asyncio.gather(*(self._in_pool(_jd_spans, "warm up") for _ in range(self.workers)))
+        if self.use_models:
+            llm_analyzer.warm_up()
+
+    async def _on_cleanup(self, app):
+        self.pool.shutdown(cancel_futures=True)
+        self.model_requests.shutdown(wait=False, cancel_futures=True)
+
+    def make_app(self):
+        app = web.Application(client_max_size=MAX_RESUME_BYTES + 1024 * 1024)
+        app.add_routes([
+            web.post("/jd/analyze", self.analyze_jd),
+            web.post("/resumes", self.upload_resume),
+            web.post("/score", self.score),
+            web.get("/health", self.health),
+            web.get("/metrics", self.metrics),
+        ])
+        app.on_startup.append(self._on_startup)
+        app.on_cleanup.append(self._on_cleanup)
+        return app
+
+
+async def _json_body(request):
+    try:
+        return await request.json()
+    except ValueError:
+        raise web.HTTPBadRequest(text="Request body must be JSON.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help="Parsing processes (default: CPU count)")
+    parser.add_argument("--batch-window-ms", type=float, default=10, help="How long to collect zero-shot lines")
+    parser.add_argument("--max-batch", type=int, default=64, help="Zero-shot lines that trigger an early flush")
+    parser.add_argument("--no-models", action="store_true", help="Skip the zero-shot/QA models (rules only)")
+    args = parser.parse_args(argv)
+
+    service = ScoringService(args.workers, args.batch_window_ms / 1000, args.max_batch, use_models=not args.no_models)
+    web.run_app(service.make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,405 @@
+import os
+import json
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import skill_extractor
+from model_loader import lazy_resource
+from profiling import profiled
+
+# Fuzzy skill matching: every canonical skill and alias is embedded once into a row of
+# a normalized float32 matrix; candidate n-grams of a document are embedded the same
+# way and matched with one matrix product. Catches "Postgres", "k8s", "ReactJS",
+# "py torch" or "Kubernets" that the exact trie misses.
+
+# "char-ngrams" (default, NumPy only) or a Hugging Face sentence-embedding model name,
+# e.g. "sentence-transformers/all-MiniLM-L6-v2" (needs transformers + torch; runs on CPU)
+SKILL_EMBEDDING_MODEL = os.getenv("SKILL_EMBEDDING_MODEL", "char-ngrams")
+# Cosine similarity a candidate needs to count as a match; defaults to the encoder's own
+SKILL_FUZZY_THRESHOLD = os.getenv("SKILL_FUZZY_THRESHOLD")
+# Embedding matrices are written here once and memory-mapped on later starts
+SKILL_EMBEDDINGS_DIR = os.getenv(
+    "SKILL_EMBEDDINGS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".skill_embeddings")
+)
+SKILL_ALIASES_PATH = "skill_aliases.json"
+# Best match per distinct candidate phrase; n-grams repeat heavily across documents
+PHRASE_CACHE_SIZE = int(os.getenv("SKILL_FUZZY_PHRASE_CACHE", "100000"))
+# Candidate phrases scored per matrix product, to bound the size of the score matrix
+QUERY_CHUNK = 4096
+
+# Tokens allowed inside a candidate phrase but never at its edges ("node . js", "ci / cd")
+_JOINERS = {"-", "/", ".", "+", "#"}
+# Joiners that may also end a phrase
+_SUFFIXES = {"+", "#"}
+# ASCII characters kept by CharNgramEncoder.compact (after lowercasing): letters, digits, "+" and "#"
+_COMPACT_KEEP = np.array([chr(c).isascii() and (chr(c).isalnum() or chr(c) in "+#") for c in range(128)])
+_COMPACT = str.maketrans("", "", "".join(chr(c) for c in range(128) if not _COMPACT_KEEP[c]))
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_FNV_PRIME = np.uint64(0x100000001B3)
+
+
+def load_skill_aliases(filepath=SKILL_ALIASES_PATH):
+    """Loads {canonical skill: [aliases]}; a missing file means no aliases."""
+    if not os.path.exists(filepath):
+        return {}
+    with open(filepath, 'r') as f:
+        return json.load(f)
+
+
+class CharNgramEncoder:
+    """
+    Hashed character n-gram vectors (a fastText-style subword bag) of the compacted,
+    lowercased phrase, so "Node.js", "node js" and "NodeJS" embed identically and
+    near-spellings land close together. Deterministic and dependency-free.
+    """
+
+    # Rejects plurals and near-words ("oracles", "springs" score ~0.77) but keeps
+    # compound spellings, which compact to the same string
+    default_threshold = 0.78
+
+    def __init__(self, dim=512, ngram_sizes=(2, 3, 4)):
+        self.dim = dim
+        self.ngram_sizes = ngram_sizes
+        self.id = f"char-ngrams-fnv-{dim}-{'.'.join(map(str, ngram_sizes))}"
+
+    @staticmethod
+    def compact(phrase):
+        """Lowercase ASCII letters, digits, "+" and "#" only: "Node.js" -> "nodejs"."""
+        return phrase.encode("ascii", "ignore").decode().lower().translate(_COMPACT)
+
+    @staticmethod
+    def compact_text(text):
+        """
+        compact() of a whole document, plus character offsets such that
+        compact(text[start:end]) == compacted[offsets[start]:offsets[end]], so every
+        candidate phrase is compacted with one slice.
+        """
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        keep = (codes < 128) & _COMPACT_KEEP[np.minimum(codes, 127)]
+        offsets = np.concatenate(([0], np.cumsum(keep))).tolist()
+        return codes[keep].astype(np.uint8).tobytes().decode("ascii").lower(), offsets
+
+    def _ngram_count(self, length):
+        return sum(max(0, length + 3 - n) for n in self.ngram_sizes)
+
+    def prefilter(self, labels, threshold):
+        """
+        Returns a cheap test on compacted phrases that rejects those which cannot reach
+        `threshold` against any label, before they are encoded. The cosine of two n-gram
+        bags is at most sqrt(smaller count / larger count), which bounds the phrase
+        length; and real variants keep a label's first two letters ("Postgre SQL",
+        "Kubernets").
+        """
+        compacted = [self.compact(label) for label in labels]
+        counts = [self._ngram_count(len(c)) for c in compacted]
+        low, high = min(counts) * threshold ** 2, max(counts) / threshold ** 2
+        lengths = {length for length in range(1, 256) if low <= self._ngram_count(length) <= high}
+        prefixes = {c[:2] for c in compacted}
+
+        def keep(compacted):
+            return len(compacted) in lengths and compacted[:2] in prefixes
+        return keep
+
+    def encode(self, phrases):
+        return self.encode_compacted([self.compact(phrase) for phrase in phrases])
+
+    def encode_compacted(self, phrases):
+        """
+        encode() of already compacted phrases. Hashes every n-gram of every phrase in a
+        few vectorized passes over one byte buffer; a per-gram Python loop costs ~30 ms
+        for a typical resume.
+        """
+        padded = [f"<{phrase}>" for phrase in phrases]
+        lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+        chars = np.frombuffer("".join(padded).encode("ascii"), dtype=np.uint8).astype(np.uint64)
+        row_of = np.repeat(np.arange(len(padded)), lengths)
+        remaining = np.repeat(np.cumsum(lengths), lengths) - np.arange(len(chars))
+        rows, hashes = [], []
+        for n in self.ngram_sizes:
+            starts = np.flatnonzero(remaining >= n)
+            # FNV-1a over the n bytes, seeded with n so equal strings of different sizes differ
+            h = np.full(len(starts), _FNV_OFFSET ^ n, dtype=np.uint64)
+            for k in range(n):
+                h = (h ^ chars[starts + k]) * _FNV_PRIME
+            rows.append(row_of[starts])
+            hashes.append(h)
+        rows, hashes = np.concatenate(rows), np.concatenate(hashes)
+        columns = (hashes >> np.uint64(1)) % np.uint64(self.dim)
+        # The top hash bit picks the sign, so collisions tend to cancel out
+        signs = np.where(hashes >> np.uint64(63), 1.0, -1.0)
+        matrix = np.bincount(rows * self.dim + columns.astype(np.int64), weights=signs, minlength=len(phrases) * self.dim)
+        return _normalize(matrix.reshape(len(phrases), self.dim).astype(np.float32))
+
+
+class TransformerEncoder:
+    """Mean-pooled sentence embeddings from a Hugging Face model, always on CPU."""
+
+    default_threshold = 0.85
+
+    def __init__(self, model_name, batch_size=64):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.id = model_name
+        self._model = lazy_resource(f"skill_embedding_model:{model_name}", self._load)
+
+    def _load(self):
+        from transformers import AutoTokenizer, AutoModel
+        print(f"Loading skill embedding model {self.model_name} on cpu...")
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        model = AutoModel.from_pretrained(self.model_name)
+        model.eval()
+        return tokenizer, model
+
+    def encode(self, phrases):
+        import torch
+        tokenizer, model = self._model.get()
+        batches = []
+        with torch.no_grad():
+            for i in range(0, len(phrases), self.batch_size):
+                inputs = tokenizer(list(phrases[i:i + self.batch_size]), padding=True, truncation=True, return_tensors="pt")
+                hidden = model(**inputs).last_hidden_state
+                mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                batches.append(((hidden * mask).sum(1) / mask.sum(1).clamp(min=1e-9)).numpy())
+        if not batches:
+            return np.zeros((0, model.config.hidden_size), dtype=np.float32)
+        return _normalize(np.concatenate(batches).astype(np.float32))
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def get_encoder(name=SKILL_EMBEDDING_MODEL):
+    return CharNgramEncoder() if name == "char-ngrams" else TransformerEncoder(name)
+
+
+def _save_atomically(matrix, path):
+    """
+    Writes the matrix under a temporary name and renames it, so a worker process
+    starting at the same time never maps a half-written file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            np.save(f, matrix)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class SkillEmbeddingIndex:
+    """
+    One L2-normalized row per canonical skill and per alias, with `skills[i]` the
+    canonical skill of row i. lookup() scores a batch of phrases against every row
+    with a single matrix product and keeps the best row per phrase. The skill
+    vocabulary is small (hundreds to a few thousand rows), so an exact product is
+    cheaper than building an approximate nearest-neighbour index.
+    """
+
+    def __init__(self, labels, skills, matrix, encoder, threshold=None, max_tokens=3):
+        self.labels = labels
+        self.skills = skills
+        self.matrix = matrix
+        self.encoder = encoder
+        self.threshold = encoder.default_threshold if threshold is None else threshold
+        self.max_tokens = max_tokens
+        # Encoders of compacted text (CharNgramEncoder) get compacted phrases, and can rule
+        # phrases out without encoding them
+        self._compact_text = getattr(encoder, "compact_text", None)
+        self._encode = encoder.encode_compacted if self._compact_text else encoder.encode
+        prefilter = getattr(encoder, "prefilter", None)
+        self._keep = prefilter(labels, self.threshold) if prefilter else None
+        self._phrases = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, skills, aliases=None, encoder=None, cache_dir=SKILL_EMBEDDINGS_DIR, threshold=None):
+        """
+        Embeds the skills and aliases, or memory-maps the matrix a previous build wrote
+        to `cache_dir`. The file name hashes the encoder and the rows, so editing the
+        skills DB or the aliases writes a new file instead of reusing a stale one. If
+        `cache_dir` cannot be written (a read-only install), the matrix stays in memory.
+        """
+        encoder = encoder or get_encoder()
+        labels, canonical = list(skills), list(skills)
+        for skill, names in (aliases or {}).items():
+            if skill not in skills:
+                continue
+            for alias in names:
+                labels.append(alias)
+                canonical.append(skill)
+        key = hashlib.sha256(json.dumps([encoder.id, labels, canonical]).encode()).hexdigest()[:16]
+
+        matrix = None
+        if cache_dir:
+            path = os.path.join(cache_dir, f"{key}.npy")
+            try:
+                if not os.path.exists(path):
+                    matrix = encoder.encode(labels)
+                    _save_atomically(matrix, path)
+                # Read-only mapping: processes on the same machine share the pages
+                matrix = np.asarray(np.load(path, mmap_mode="r"))
+            except OSError as e:
+                print(f"Could not store skill embeddings in {cache_dir} ({e}); keeping them in memory.")
+        if matrix is None:
+            matrix = encoder.encode(labels)
+
+        nlp = skill_extractor.get_nlp()
+        # One extra token so split spellings ("Postgre SQL", "Amazon Web Services Inc") still fit
+        max_tokens = max(len(nlp.make_doc(label)) for label in labels) + 1 if labels else 1
+        return cls(labels, canonical, matrix, encoder, threshold, max_tokens)
+
+    def lookup(self, phrases):
+        """Returns [(canonical skill, matched label, cosine similarity)] for each phrase."""
+        with self._lock:
+            results = {phrase: self._phrases[phrase] for phrase in phrases if phrase in self._phrases}
+        new = [phrase for phrase in dict.fromkeys(phrases) if phrase not in results]
+        for i in range(0, len(new), QUERY_CHUNK):
+            chunk = new[i:i + QUERY_CHUNK]
+            scores = self._encode(chunk) @ self.matrix.T
+            best = scores.argmax(axis=1)
+            best_scores = scores[np.arange(len(chunk)), best]
+            for phrase, row, score in zip(chunk, best.tolist(), best_scores.tolist()):
+                results[phrase] = (self.skills[row], self.labels[row], score)
+        if new:
+            with self._lock:
+                for phrase in new:
+                    self._phrases[phrase] = results[phrase]
+                while len(self._phrases) > PHRASE_CACHE_SIZE:
+                    self._phrases.popitem(last=False)
+        return [results[phrase] for phrase in phrases]
+
+    def clear_cache(self):
+        with self._lock:
+            self._phrases.clear()
+
+    def candidate_phrases(self, doc):
+        """
+        Yields (phrase, start_char, end_char) for every run of up to max_tokens words
+        that stays on one line and does not start or end with a stop word or
+        punctuation, except "#" and "+" which the tokenizer splits off "C#" or "F#".
+        Joiners ("-", "/", ".") inside a phrase do not count as words.
+        The phrase is lowercased, or compacted for encoders that work on compact text.
+        """
+        from spacy.attrs import IDX, LENGTH, IS_STOP, IS_PUNCT, LIKE_NUM, IS_SPACE, ORTH
+        text = doc.text
+        if self._compact_text is not None:
+            compacted, offsets = self._compact_text(text)
+            phrase = lambda start, end: compacted[offsets[start]:offsets[end]]
+        else:
+            phrase = lambda start, end: text[start:end].lower()
+        # Token attributes in one C-level pass; whitespace runs (newlines) are IS_SPACE tokens
+        idx, length, is_stop, is_punct, like_num, is_space, orth = doc.to_array(
+            [IDX, LENGTH, IS_STOP, IS_PUNCT, LIKE_NUM, IS_SPACE, ORTH]
+        ).T.astype(np.int64)
+        joiner = np.isin(orth, [doc.vocab.strings.add(j) for j in _JOINERS])
+        suffix = np.isin(orth, [doc.vocab.strings.add(j) for j in _SUFFIXES])
+        # (start, end, is a word, ends the run, may end a phrase as a suffix) per token
+        tokens = list(zip(
+            idx.tolist(),
+            (idx + length).tolist(),
+            ((is_stop | is_punct | like_num | is_space) == 0).tolist(),
+            ((is_space == 1) | ((is_punct == 1) & ~joiner)).tolist(),
+            suffix.tolist(),
+        ))
+        n = len(tokens)
+        for i, (start, _, word, stop, _) in enumerate(tokens):
+            if not word or stop:
+                continue
+            words = 0
+            for j in range(i, min(i + 2 * self.max_tokens, n)):
+                _, end, word, stop, suffix = tokens[j]
+                if stop:
+                    break
+                if word:
+                    words += 1
+                    if words > self.max_tokens:
+                        break
+                    yield phrase(start, end), start, end
+                elif suffix:
+                    yield phrase(start, end), start, end
+
+    def match_doc(self, doc, exact_spans=(), threshold=None):
+        """
+        Returns fuzzy matches in a tokenized doc as (skill, start_char, end_char, score),
+        ordered by position. Overlapping candidates are resolved by highest score, then
+        longest. A match may only overlap `exact_spans` (trie matches) by containing
+        them entirely: "Git Hub" becomes GitHub instead of Git; see merge_matches.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        exact = sorted({(start, end) for _, start, end in exact_spans})
+        exact_covered = bytearray(doc[-1].idx + len(doc[-1].text_with_ws) if len(doc) else 0)
+        for start, end in exact:
+            exact_covered[start:end] = b"\x01" * (end - start)
+        # Phrases that are exactly a trie match need no second look
+        candidates = [c for c in self.candidate_phrases(doc) if (c[1], c[2]) not in exact]
+        if self._keep is not None and threshold >= self.threshold:
+            candidates = [c for c in candidates if self._keep(c[0])]
+        if not candidates:
+            return []
+        matches = []
+        for (phrase, start, end), (skill, _, score) in zip(candidates, self.lookup([c[0] for c in candidates])):
+            if score >= threshold:
+                matches.append((skill, start, end, score))
+        taken = bytearray(len(exact_covered))
+        accepted = []
+        # Scores are rounded so float noise (1.0000001 vs 0.9999999) cannot beat length
+        for skill, start, end, score in sorted(matches, key=lambda m: (-round(m[3], 4), m[1] - m[2])):
+            if taken.find(1, start, end) != -1:
+                continue
+            if exact_covered.find(1, start, end) != -1 and any(
+                s < end and e > start and (s < start or e > end) for s, e in exact
+            ):
+                continue
+            taken[start:end] = b"\x01" * (end - start)
+            accepted.append((skill, start, end, score))
+        return sorted(accepted, key=lambda m: m[1])
+
+
+def merge_matches(exact_spans, fuzzy_matches):
+    """
+    Exact (skill, start, end) spans plus fuzzy matches as one list of spans, in
+    document order like the exact spans (callers take the first span of a skill as its
+    first occurrence). Exact spans inside a fuzzy match are dropped, as the longer
+    match replaces them.
+    """
+    if not fuzzy_matches:
+        return list(exact_spans)
+    spans = [
+        (skill, start, end) for skill, start, end in exact_spans
+        if not any(f_start <= start and end <= f_end for _, f_start, f_end, _ in fuzzy_matches)
+    ]
+    spans += [(skill, start, end) for skill, start, end, _ in fuzzy_matches]
+    return sorted(spans, key=lambda span: (span[1], span[2]))
+
+
+def _build_default_index():
+    threshold = float(SKILL_FUZZY_THRESHOLD) if SKILL_FUZZY_THRESHOLD else None
+    return SkillEmbeddingIndex.build(skill_extractor.SKILLS_DB, load_skill_aliases(), threshold=threshold)
+
+_index = lazy_resource("skill_embedding_index", _build_default_index)
+
+def get_index():
+    return _index.get()
+
+def warm_up():
+    _index.warm_up()
+
+@functools.lru_cache(maxsize=None)
+def config_version():
+    """Changes whenever the aliases, the embedding model or the threshold change (for cache keys)."""
+    config = json.dumps([load_skill_aliases(), SKILL_EMBEDDING_MODEL, SKILL_FUZZY_THRESHOLD], sort_keys=True)
+    return hashlib.sha256(config.encode()).hexdigest()[:16]
+
+@profiled("fuzzy_skill_matching", input_size=lambda doc, *args, **kwargs: len(doc))
+def fuzzy_match_doc(doc, exact_spans=()):
+    """Fuzzy matches in a doc, given its exact trie matches; combine them with merge_matches."""
+    return get_index().match_doc(doc, exact_spans)
@@ -1,42 +1,142 @@
-import spacy
-from spacy.matcher import Matcher
+import os
 import json
+import taxonomy
+from model_loader import lazy_resource
+from profiling import profiled, size_of_first_arg
 
-# Load the spaCy model
-nlp = spacy.load("en_core_web_sm")
+def _load_nlp():
+    """
+    Loads only the tokenizer of the spaCy model. Skill matching works on lowercased
+    tokens, so the tagger, parser and NER are never needed and are not loaded.
+    """
+    import spacy
+    return spacy.load(
+        "en_core_web_sm",
+        exclude=["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner", "senter"],
+    )
+
+# spaCy is imported and the model loaded on first use, not at import time
+_nlp = lazy_resource("spacy_tokenizer", _load_nlp)
+
+def get_nlp():
+    return _nlp.get()
 
 def load_skills_from_db(filepath="skills_db.json"):
     """Loads skills from the JSON database."""
     with open(filepath, 'r') as f:
         skills_data = json.load(f)
-    
+
     all_skills = []
     for category in skills_data:
         all_skills.extend(skills_data[category])
-    
+
     return all_skills
 
-# Load skills and initialize the Matcher
+# Marks the end of a skill inside the trie; never collides with a token text.
+_SKILLS_KEY = None
+
+def build_skill_trie(skills):
+    """
+    Compiles the skills into a trie keyed on lowercased token text. Each skill is
+    split on whitespace exactly like the old per-skill Matcher patterns were
+    ([{"LOWER": word} for word in skill.split()]), so matches are identical.
+    Extraction itself uses the compiled taxonomy (taxonomy.py); this in-memory trie
+    is for ad-hoc skill lists such as the benchmark vocabularies.
+    """
+    trie = {}
+    for skill in skills:
+        node = trie
+        for word in skill.split():
+            node = node.setdefault(word.lower(), {})
+        node.setdefault(_SKILLS_KEY, []).append(skill)
+    return trie
+
+# Load skills (cheap); the compiled taxonomy is memory-mapped on first use. The version
+# covers skill_aliases.json too, since aliases are matched exactly.
 SKILLS_DB = load_skills_from_db()
-matcher = Matcher(nlp.vocab)
+SKILLS_DB_VERSION = taxonomy.source_hash()
+
+# Optional embedding-based matching of aliases and spelling variants (skill_embeddings.py)
+# on top of the exact trie matches. Off unless FUZZY_SKILL_MATCHING=1 or enable_fuzzy_matching().
+_fuzzy_matching = os.getenv("FUZZY_SKILL_MATCHING", "0") == "1"
+
+def fuzzy_matching_enabled():
+    return _fuzzy_matching
+
+def enable_fuzzy_matching(on=True):
+    global _fuzzy_matching
+    _fuzzy_matching = on
 
-for skill in SKILLS_DB:
-    # Create a pattern for each skill. Case-insensitivity is handled by LOWER.
-    pattern = [{"LOWER": word.lower()} for word in skill.split()]
-    matcher.add(skill, [pattern])
+def extraction_version():
+    """Cache key version for extraction results: the skills DB plus the fuzzy matching setup."""
+    if not _fuzzy_matching:
+        return SKILLS_DB_VERSION
+    import skill_embeddings
+    return f"{SKILLS_DB_VERSION}:fuzzy:{skill_embeddings.config_version()}"
 
+def warm_up():
+    """Loads the tokenizer and maps the skills taxonomy (and fuzzy index, if enabled) in a background thread."""
+    _nlp.warm_up()
+    taxonomy.warm_up()
+    if _fuzzy_matching:
+        import skill_embeddings
+        skill_embeddings.warm_up()
+
+def match_skill_ids_in_doc(doc):
+    """Every skill name or alias in the Doc as (skill_id, start_char, end_char), IDs from the taxonomy."""
+    return taxonomy.get_taxonomy().match_doc(doc)
+
+def match_skills_in_doc(doc, trie=None):
+    """
+    Walks the token stream once, following the trie from every token. The work per
+    token is bounded by the longest skill (in tokens), so the cost is linear in the
+    document length and independent of how many skills are in the database.
+    Yields (skill, start_char, end_char) for every occurrence; aliases yield their
+    canonical skill. Without `trie` the compiled taxonomy's matcher is used.
+    """
+    if trie is None:
+        names = taxonomy.get_taxonomy().names
+        for skill_id, start_char, end_char in match_skill_ids_in_doc(doc):
+            yield names[skill_id], start_char, end_char
+        return
+    words = [token.lower_ for token in doc]
+    n = len(words)
+    for start in range(n):
+        node = trie.get(words[start])
+        end = start
+        while node is not None:
+            end += 1
+            for skill in node.get(_SKILLS_KEY, ()):
+                yield skill, doc[start].idx, doc[end - 1].idx + len(doc[end - 1])
+            node = node.get(words[end]) if end < n else None
+
+def skill_spans_in_doc(doc):
+    """
+    Exact trie matches, plus fuzzy matches (skill_embeddings.py) when fuzzy matching
+    is enabled, as a list of (skill, start_char, end_char).
+    """
+    spans = list(match_skills_in_doc(doc))
+    if _fuzzy_matching:
+        from skill_embeddings import fuzzy_match_doc, merge_matches
+        spans = merge_matches(spans, fuzzy_match_doc(doc, spans))
+    return spans
+
+def find_skill_spans(text):
+    """Returns every skill occurrence in the text as (skill, start_char, end_char)."""
+    return skill_spans_in_doc(get_nlp().make_doc(text))
+
+@profiled("skill_extraction", input_size=size_of_first_arg)
 def extract_skills_from_text(text):
     """
-    Uses spaCy Matcher to extract skills from a given text.
+    Extracts skills from a given text using the tokenizer and the compiled skills taxonomy.
     Returns a set of unique skills found.
     """
-    doc = nlp(text)
-    matches = matcher(doc)
-    
-    found_skills = set()
-    for match_id, start, end in matches:
-        # The 'match_id' is the skill name string itself
-        skill_name = nlp.vocab.strings[match_id]
-        found_skills.add(skill_name)
-        
-    return found_skills
\ No newline at end of file
+    return {skill for skill, _, _ in skill_spans_in_doc(get_nlp().make_doc(text))}
+
+def extract_skills_from_texts(texts, batch_size=64):
+    """
+    Batch version of extract_skills_from_text. Streams the texts through
+    nlp.tokenizer.pipe and yields one set of skills per input text, in order.
+    """
+    for doc in get_nlp().tokenizer.pipe(texts, batch_size=batch_size):
+        yield {skill for skill, _, _ in skill_spans_in_doc(doc)}
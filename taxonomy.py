@@ -0,0 +1,388 @@
+"""
+Compiled skills taxonomy: skills_db.json and skill_aliases.json turned into one
+compact, versioned binary artifact that is memory-mapped instead of parsed.
+
+    python taxonomy.py [--skills-db skills_db.json] [--aliases skill_aliases.json] [--out PATH]
+
+The artifact holds:
+    - an interned skill-ID table: canonical names, IDs 0..S-1 in skills_db.json order
+    - the category of every skill (category IDs plus a category name table)
+    - an alias -> canonical ID table (lowercased names and aliases, hashed and sorted)
+    - the exact matcher: a token trie over canonical names and aliases, stored as
+      sorted (node, token) transition keys plus per-node skill outputs (CSR)
+
+Every array sits at an 8-byte aligned offset, so loading is an mmap plus a few
+np.frombuffer views: nothing is decoded up front, and processes on one machine
+(bulk_screen and service workers) share the same read-only pages. The header
+records a format version and a hash of the source files; load_taxonomy() rebuilds
+the artifact when either no longer matches.
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import time
+
+import numpy as np
+
+from model_loader import lazy_resource
+
+MAGIC = b"JFSKTAX\0"
+FORMAT_VERSION = 1
+SKILLS_DB_PATH = "skills_db.json"
+SKILL_ALIASES_PATH = "skill_aliases.json"
+TAXONOMY_PATH = os.getenv(
+    "SKILLS_TAXONOMY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_taxonomy.bin")
+)
+_HEADER = np.dtype([("magic", "S8"), ("format", "<u4"), ("header_bytes", "<u4")])
+# Bounds SkillTaxonomy.skill_id's memo, which also sees free-typed skill names
+_MAX_MEMOIZED_NAMES = 100_000
+_UNSEEN = object()
+
+
+def source_hash(skills_db=SKILLS_DB_PATH, aliases=SKILL_ALIASES_PATH):
+    """Short content hash of the taxonomy sources; changes whenever either file is edited."""
+    digest = hashlib.sha256()
+    for path in (skills_db, aliases):
+        digest.update(b"\0")
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def key_hash(key):
+    """64-bit hash of a lowercased skill name or alias, for the lookup table."""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _string_table(strings):
+    """(offsets, bytes) arrays for a list of strings; string i is bytes[offsets[i]:offsets[i + 1]]."""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def compile_taxonomy(skills_by_category, aliases=None, version=""):
+    """
+    Compiles {category: [skills]} and {canonical skill: [aliases]} into the binary
+    artifact (bytes). Skills are deduplicated case-insensitively; a skill listed in
+    several categories keeps the first. Aliases of unknown skills are ignored, and an
+    alias that is also another skill's name resolves to that skill.
+    """
+    from spacy.strings import hash_string
+
+    names, categories, skill_category, ids = [], [], [], {}
+    for category, skills in skills_by_category.items():
+        categories.append(category)
+        for skill in skills:
+            if skill.lower() not in ids:
+                ids[skill.lower()] = len(names)
+                names.append(skill)
+                skill_category.append(len(categories) - 1)
+
+    keys = dict(ids)
+    for skill, skill_aliases in (aliases or {}).items():
+        skill_id = ids.get(skill.lower())
+        if skill_id is not None:
+            for alias in skill_aliases:
+                keys.setdefault(alias.lower(), skill_id)
+
+    # Lookup table: lowercased names and aliases sorted by hash, with their canonical IDs
+    entries = sorted(keys.items(), key=lambda item: (key_hash(item[0]), item[0]))
+    key_offsets, key_bytes = _string_table([key for key, _ in entries])
+
+    # Matcher: split on whitespace like the skill patterns always were, tokens identified
+    # by the hash spaCy stores as the LOWER attribute
+    token_ids, edges, outputs = {}, {}, [[]]
+    for key, skill_id in keys.items():
+        node = 0
+        for word in key.split():
+            token = token_ids.setdefault(hash_string(word), len(token_ids))
+            if (node, token) not in edges:
+                edges[node, token] = len(outputs)
+                outputs.append([])
+            node = edges[node, token]
+        if skill_id not in outputs[node]:
+            outputs[node].append(skill_id)
+    # Renumber tokens by hash so a document's LOWER values resolve with one searchsorted
+    token_hashes = np.array(sorted(token_ids), dtype=np.uint64)
+    rank = {token_ids[h]: i for i, h in enumerate(token_hashes.tolist())}
+    edge_keys = np.array([node * len(token_hashes) + rank[token] for node, token in edges], dtype=np.uint64)
+    edge_targets = np.array(list(edges.values()), dtype=np.int32)
+    order = np.argsort(edge_keys)
+    output_offsets = np.zeros(len(outputs) + 1, dtype=np.uint32)
+    np.cumsum([len(o) for o in outputs], out=output_offsets[1:])
+
+    max_depth = max((len(key.split()) for key in keys), default=0)
+    name_offsets, name_bytes = _string_table(names)
+    category_offsets, category_bytes = _string_table(categories)
+    arrays = {
+        "name_offsets": name_offsets,
+        "name_bytes": name_bytes,
+        "skill_category": np.array(skill_category, dtype=np.int32),
+        "category_offsets": category_offsets,
+        "category_bytes": category_bytes,
+        "key_hashes": np.array([key_hash(key) for key, _ in entries], dtype=np.uint64),
+        "key_skills": np.array([skill_id for _, skill_id in entries], dtype=np.int32),
+        "key_offsets": key_offsets,
+        "key_bytes": key_bytes,
+        "token_hashes": token_hashes,
+        "edge_keys": edge_keys[order],
+        "edge_targets": edge_targets[order],
+        "output_offsets": output_offsets,
+        "outputs": np.array([skill_id for o in outputs for skill_id in o], dtype=np.int32),
+    }
+
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        layout[name] = [array.dtype.str, len(array), offset]
+        offset += -(-array.nbytes // 8) * 8
+    header = json.dumps({"version": version, "max_depth": max_depth, "arrays": layout}).encode("utf-8")
+    header += b" " * (-(len(header) + _HEADER.itemsize) % 8)
+    prefix = np.array([(MAGIC, FORMAT_VERSION, len(header))], dtype=_HEADER).tobytes() + header
+
+    out = bytearray(len(prefix) + offset)
+    out[:len(prefix)] = prefix
+    for name, array in arrays.items():
+        start = len(prefix) + layout[name][2]
+        out[start:start + array.nbytes] = array.tobytes()
+    return bytes(out)
+
+
+class SkillTaxonomy:
+    """
+    Read-only view over a compiled taxonomy held in any buffer (an mmap or bytes).
+    Skill IDs are dense ints 0..len-1; skill_id() resolves names and aliases
+    case-insensitively, match_doc() finds every name or alias in a spaCy Doc.
+    """
+
+    def __init__(self, buffer):
+        prefix = np.frombuffer(buffer, dtype=_HEADER, count=1)[0]
+        if prefix["magic"] != MAGIC.rstrip(b"\0"):
+            raise ValueError("Not a compiled skills taxonomy.")
+        if prefix["format"] != FORMAT_VERSION:
+            raise ValueError(f"Taxonomy format {prefix['format']}, expected {FORMAT_VERSION}.")
+        start = _HEADER.itemsize + int(prefix["header_bytes"])
+        header = json.loads(bytes(buffer[_HEADER.itemsize:start]))
+        self.version = header["version"]
+        self.max_depth = header["max_depth"]
+        self._buffer = buffer
+        for name, (dtype, count, offset) in header["arrays"].items():
+            setattr(self, name, np.frombuffer(buffer, dtype=dtype, count=count, offset=start + offset))
+        self.categories = _decode_all(self.category_offsets, self.category_bytes)
+        self._names = None
+        self._lower_names = None
+        self._skill_categories = None
+        self._ids = {}
+
+    @classmethod
+    def open(cls, path=TAXONOMY_PATH):
+        """Memory-maps a compiled taxonomy file."""
+        with open(path, 'rb') as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def from_sources(cls, skills_by_category, aliases=None):
+        """Compiles in memory, without writing an artifact (benchmarks, ad-hoc vocabularies)."""
+        return cls(compile_taxonomy(skills_by_category, aliases))
+
+    def __len__(self):
+        return len(self.skill_category)
+
+    @property
+    def names(self):
+        """Canonical skill names by ID, decoded on first use."""
+        if self._names is None:
+            self._names = _decode_all(self.name_offsets, self.name_bytes)
+        return self._names
+
+    @property
+    def lower_names(self):
+        """Lowercased canonical names by ID, the form analysis results report."""
+        if self._lower_names is None:
+            self._lower_names = [name.lower() for name in self.names]
+        return self._lower_names
+
+    def skill_name(self, skill_id):
+        return self.names[skill_id]
+
+    def category_of(self, skill_id):
+        if self._skill_categories is None:
+            self._skill_categories = [self.categories[i] for i in self.skill_category.tolist()]
+        return self._skill_categories[skill_id]
+
+    def lookup_table(self):
+        """{lowercased name or alias: skill ID}, decoded from the artifact (a new dict per call)."""
+        return dict(zip(_decode_all(self.key_offsets, self.key_bytes), self.key_skills.tolist()))
+
+    def skill_id(self, name):
+        """Canonical ID of a skill name or alias (any case), or None if it is not in the taxonomy."""
+        # Memoized by the name as given, so repeated lookups skip lower() and the hash
+        skill_id = self._ids.get(name, _UNSEEN)
+        if skill_id is not _UNSEEN:
+            return skill_id
+        key = name.lower()
+        h = np.uint64(key_hash(key))
+        skill_id = None
+        encoded = key.encode("utf-8")
+        at = int(np.searchsorted(self.key_hashes, h))
+        # Distinct keys can share a hash; the stored key bytes settle it
+        while at < len(self.key_hashes) and self.key_hashes[at] == h:
+            if self.key_bytes[self.key_offsets[at]:self.key_offsets[at + 1]].tobytes() == encoded:
+                skill_id = int(self.key_skills[at])
+                break
+            at += 1
+        if len(self._ids) >= _MAX_MEMOIZED_NAMES:
+            self._ids.clear()
+        self._ids[name] = skill_id
+        return skill_id
+
+    def match_doc(self, doc):
+        """
+        Every occurrence of a skill name or alias in the Doc, as (skill_id, start_char,
+        end_char) ordered by start then length. The trie is followed from all tokens at
+        once, one level per step, so the Python work is bounded by the longest skill
+        (in tokens) plus the number of matches.
+        """
+        from spacy.attrs import LOWER
+        n, vocab = len(doc), len(self.token_hashes)
+        if not n or not vocab:
+            return []
+        lower = doc.to_array(LOWER)
+        tokens = np.searchsorted(self.token_hashes, lower)
+        np.minimum(tokens, vocab - 1, out=tokens)
+        known = self.token_hashes[tokens] == lower
+
+        starts = np.flatnonzero(known)
+        nodes = np.zeros(len(starts), dtype=np.uint64)
+        found = []
+        for depth in range(self.max_depth):
+            positions = starts + depth
+            alive = positions < n
+            alive[alive] &= known[positions[alive]]
+            starts, positions = starts[alive], positions[alive]
+            keys = nodes[alive] * np.uint64(vocab) + tokens[positions].astype(np.uint64)
+            at = np.searchsorted(self.edge_keys, keys)
+            np.minimum(at, len(self.edge_keys) - 1, out=at)
+            hit = self.edge_keys[at] == keys
+            starts, positions = starts[hit], positions[hit]
+            nodes = self.edge_targets[at[hit]].astype(np.uint64)
+            if not len(starts):
+                break
+            terminal = self.output_offsets[nodes + np.uint64(1)] > self.output_offsets[nodes]
+            found.append((starts[terminal], positions[terminal], nodes[terminal]))
+        if not found:
+            return []
+
+        starts, ends, nodes = (np.concatenate(parts) for parts in zip(*found))
+        outputs, output_offsets = self.outputs, self.output_offsets
+        matches = [
+            (start, end, skill_id)
+            for start, end, node in zip(starts.tolist(), ends.tolist(), nodes.tolist())
+            for skill_id in outputs[output_offsets[node]:output_offsets[node + 1]].tolist()
+        ]
+        # An alias inside a longer name of the same skill ("Rails" in "Ruby on Rails") is
+        # not a separate occurrence: keep only the outermost span per skill
+        reach, kept = {}, []
+        for start, end, skill_id in sorted(matches, key=lambda m: (m[0], -m[1])):
+            if end > reach.get(skill_id, -1):
+                reach[skill_id] = end
+                kept.append((start, end, skill_id))
+        kept.sort(key=lambda m: (m[0], m[1]))
+        return [(skill_id, doc[start].idx, doc[end].idx + len(doc[end])) for start, end, skill_id in kept]
+
+
+def _decode_all(offsets, data):
+    raw = data.tobytes()
+    bounds = offsets.tolist()
+    return [raw[bounds[i]:bounds[i + 1]].decode("utf-8") for i in range(len(bounds) - 1)]
+
+
+def _load_sources(skills_db, aliases):
+    with open(skills_db, 'r') as f:
+        skills_by_category = json.load(f)
+    alias_table = {}
+    if os.path.exists(aliases):
+        with open(aliases, 'r') as f:
+            alias_table = json.load(f)
+    return skills_by_category, alias_table
+
+
+def build_taxonomy(skills_db=SKILLS_DB_PATH, aliases=SKILL_ALIASES_PATH, out=TAXONOMY_PATH):
+    """Compiles the JSON sources and writes the artifact atomically to `out`. Returns its size in bytes."""
+    data = compile_taxonomy(*_load_sources(skills_db, aliases), version=source_hash(skills_db, aliases))
+    _write_atomically(data, out)
+    return len(data)
+
+
+def _write_atomically(data, out):
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    tmp_path = f"{out}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, out)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_taxonomy(path=TAXONOMY_PATH, skills_db=SKILLS_DB_PATH, aliases=SKILL_ALIASES_PATH):
+    """
+    Memory-maps the artifact at `path`, first (re)building it if it is missing, from
+    another format version, or compiled from different source files. If the artifact
+    cannot be read or written (a read-only install, an unwritable SKILLS_TAXONOMY_PATH),
+    the taxonomy is compiled in memory instead.
+    """
+    version = source_hash(skills_db, aliases)
+    try:
+        if os.path.exists(path):
+            taxonomy = SkillTaxonomy.open(path)
+            if taxonomy.version == version:
+                return taxonomy
+    except (OSError, ValueError):
+        pass
+    data = compile_taxonomy(*_load_sources(skills_db, aliases), version=version)
+    try:
+        _write_atomically(data, path)
+        return SkillTaxonomy.open(path)
+    except OSError as e:
+        print(f"Could not write the skills taxonomy to {path} ({e}); using an in-memory copy.")
+        return SkillTaxonomy(data)
+
+
+# Mapped on first use; source_hash() alone never touches the artifact
+_taxonomy = lazy_resource("skills_taxonomy", load_taxonomy)
+
+
+def get_taxonomy():
+    return _taxonomy.get()
+
+
+def warm_up():
+    _taxonomy.warm_up()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skills-db", default=SKILLS_DB_PATH)
+    parser.add_argument("--aliases", default=SKILL_ALIASES_PATH)
+    parser.add_argument("--out", default=TAXONOMY_PATH)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    size = build_taxonomy(args.skills_db, args.aliases, args.out)
+    built = time.perf_counter() - started
+    taxonomy = SkillTaxonomy.open(args.out)
+    print(
+        f"Wrote {args.out} ({size:,} bytes, version {taxonomy.version}) in {built * 1000:.1f} ms: "
+        f"{len(taxonomy)} skills, {len(taxonomy.categories)} categories, {len(taxonomy.key_hashes)} names and aliases, "
+        f"{len(taxonomy.output_offsets) - 1} matcher states"
+    )
+
+
+if __name__ == "__main__":
+    main()